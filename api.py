@@ -0,0 +1,217 @@
+"""Konnect 파이프라인 HTTP 서비스 (FastAPI)
+
+Streamlit UI와 분리해 번역/OCR/학습 연산 계층만 독립적으로 확장하기 위한 비동기 HTTP 서비스.
+core.pipeline을 그대로 노출하며, 블로킹 호출은 스레드 풀에서 실행하고 워커 프로세스 수로 수평 확장한다.
+
+실행:
+    python -m api --host 0.0.0.0 --port 8000 --workers 4
+    # 또는: uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+UI에서 사용:
+    KONNECT_API_URL=http://127.0.0.1:8000 streamlit run app.py
+
+엔드포인트 (stream=true면 text/plain 스트리밍, 처리 정보는 X-Konnect-* 헤더):
+    POST /v1/translate        {text, source, target, style?, stream?}
+    POST /v1/translate/batch  {lines, source, target, style?}
+    POST /v1/style            {text, style, stream?}
+    POST /v1/learning         {kind, original, revised, stream?}
+    POST /v1/learning/card    {original, revised} → {card, model}
+    POST /v1/ocr              {files: [{name, data(base64)}], backend?}
+    GET  /v1/stats            단계별 지연/토큰 요약 (?window=초)
+    GET  /health
+
+주의: 속도 제한기(LLM_RPM_LIMIT/LLM_TPM_LIMIT)와 메모리 캐시는 워커 프로세스마다 따로 동작하므로
+워커 수만큼 나눈 한도를 설정한다. SQLite 디스크 캐시/기록은 워커 간에 공유된다.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import binascii
+import io
+import os
+from typing import Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from fastapi import FastAPI, HTTPException, Request  # noqa: E402
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from core import pipeline  # noqa: E402
+from services import telemetry  # noqa: E402
+from services.resilience import CircuitOpenError, get_circuit_breaker  # noqa: E402
+
+app = FastAPI(title="Konnect pipeline API")
+
+
+class TranslateRequest(BaseModel):
+    text: str
+    source: str
+    target: str
+    style: Optional[str] = None
+    stream: bool = False
+
+
+class BatchRequest(BaseModel):
+    lines: List[str]
+    source: str
+    target: str
+    style: Optional[str] = None
+
+
+class StyleRequest(BaseModel):
+    text: str
+    style: str
+    stream: bool = False
+
+
+class LearningRequest(BaseModel):
+    kind: str
+    original: str
+    revised: str
+    stream: bool = False
+
+
+class LearningCardRequest(BaseModel):
+    original: str
+    revised: str
+
+
+class UploadedImage(BaseModel):
+    name: str
+    data: str  # base64
+
+
+class OCRRequest(BaseModel):
+    files: List[UploadedImage]
+    backend: Optional[str] = None
+
+
+@app.exception_handler(CircuitOpenError)
+async def _circuit_open(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"error": "circuit_open", "detail": str(exc), "retry_in": exc.retry_in},
+        headers={"Retry-After": str(int(exc.retry_in))},
+    )
+
+
+@app.exception_handler(ValueError)
+async def _invalid(request: Request, exc: ValueError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"error": "invalid_request", "detail": str(exc)})
+
+
+@app.exception_handler(RuntimeError)
+async def _failed(request: Request, exc: RuntimeError) -> JSONResponse:
+    return JSONResponse(status_code=502, content={"error": "upstream_error", "detail": str(exc)})
+
+
+def _next_or_none(iterator: Iterator[str]) -> Optional[str]:
+    return next(iterator, None)
+
+
+async def _stream(iterator: Iterator[str], headers: dict | None = None) -> StreamingResponse:
+    """첫 조각까지 미리 실행해, 호출 오류(잘못된 요청/서킷 열림 등)는 상태 코드로 응답한다."""
+    first = await run_in_threadpool(_next_or_none, iterator)
+
+    def chained() -> Iterator[str]:
+        if first is None:
+            return
+        yield first
+        yield from iterator
+
+    return StreamingResponse(chained(), media_type="text/plain; charset=utf-8", headers=headers)
+
+
+@app.post("/v1/translate")
+async def translate(req: TranslateRequest):
+    run = pipeline.start_translation(req.text, req.source, req.target, req.style)
+    headers = {"X-Konnect-Mode": run.mode, "X-Konnect-Model": run.model, "X-Konnect-Style": run.style or ""}
+    if req.stream:
+        return await _stream(run.stream(), headers)
+    output = await run_in_threadpool(run.result)
+    return JSONResponse({"output": output, "mode": run.mode, "model": run.model, "style": run.style}, headers=headers)
+
+
+@app.post("/v1/translate/batch")
+async def translate_batch(req: BatchRequest):
+    run = pipeline.start_batch(req.lines, req.source, req.target, req.style)
+    outputs = [""] * len(run.lines)
+
+    def collect() -> None:
+        for i, output in run:
+            outputs[i] = output
+
+    await run_in_threadpool(collect)
+    return {"outputs": outputs, "model": run.model}
+
+
+@app.post("/v1/style")
+async def style(req: StyleRequest):
+    if req.stream:
+        return await _stream(pipeline.restyle_stream(req.text, req.style))
+    return {"output": await run_in_threadpool(pipeline.restyle, req.text, req.style)}
+
+
+@app.post("/v1/learning")
+async def learning(req: LearningRequest):
+    model = pipeline.learning_model(req.kind, req.original, req.revised)
+    if req.stream:
+        return await _stream(pipeline.learning_stream(req.kind, req.original, req.revised), {"X-Konnect-Model": model})
+    output = await run_in_threadpool(pipeline.learning, req.kind, req.original, req.revised)
+    return {"output": output, "model": model}
+
+
+@app.post("/v1/learning/card")
+async def learning_card(req: LearningCardRequest):
+    card, model = await run_in_threadpool(pipeline.learning_card, req.original, req.revised)
+    return {"card": card, "model": model}
+
+
+@app.post("/v1/ocr")
+async def ocr(req: OCRRequest):
+    uploads = []
+    for item in req.files:
+        try:
+            upload = io.BytesIO(base64.b64decode(item.data, validate=True))
+        except (binascii.Error, ValueError):
+            raise HTTPException(status_code=400, detail=f"base64 형식이 아닙니다: {item.name}")
+        upload.name = item.name
+        uploads.append(upload)
+
+    def collect() -> list:
+        return [
+            {"text": result.text, "stats": result.stats}
+            for _, _, result in pipeline.iter_ocr(uploads, req.backend)
+        ]
+
+    return {"pages": await run_in_threadpool(collect)}
+
+
+@app.get("/v1/stats")
+async def stats(window: Optional[float] = None):
+    recorder = telemetry.get_recorder()
+    return {"spans": recorder.summarize(window), "tokens_by_model": recorder.tokens_by_model(window)}
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "circuit": get_circuit_breaker().state, "pid": os.getpid()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Konnect 파이프라인 HTTP 서비스")
+    parser.add_argument("--host", default=os.getenv("KONNECT_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("KONNECT_API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("KONNECT_API_WORKERS", "2")), help="워커 프로세스 수")
+    args = parser.parse_args(argv)
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""📄기록 페이지 렌더링 벤치마크 (1k / 10k 건)
+
+사용법:
+    python -m benchmarks.history_benchmark --sizes 1000,10000
+
+1) 저장소 조회: 첫 쪽 / 중간 쪽 / 마지막 쪽(OFFSET) / 키셋 커서 / 필터 / 전문 검색 소요 시간
+2) 기존 방식 비교: 전체 리스트 필터(list comprehension) + 전 항목 순회 시간
+3) streamlit 설치 시: AppTest로 app.py의 기록 페이지 스크립트 1회 실행 시간 (OPENAI_API_KEY는 더미 값 사용)
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from services.history import HistoryRepository
+
+LANGS = ["영어", "일본어", "중국어", "베트남어", "한국어"]
+STYLES = [None, "문어체", "구어체", "쉬운문장", "한자어"]
+SENTENCES = [
+    "오늘은 학교에서 한국어 수업을 들었습니다.",
+    "도서관에 가서 책을 빌렸어요.",
+    "주말에 친구와 함께 영화를 봤다.",
+    "선생님께서 숙제를 내 주셨습니다.",
+]
+USER = "bench"
+
+
+def _timeit(fn: Callable[[], object], repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def populate(repo: HistoryRepository, size: int) -> List[dict]:
+    rng = random.Random(size)
+    records = []
+    for i in range(size):
+        entry = {
+            "source_lang": "한국어",
+            "target_lang": rng.choice(LANGS),
+            "input": f"{rng.choice(SENTENCES)} ({i})",
+            "output": f"translated sentence number {i}",
+            "style": rng.choice(STYLES),
+        }
+        repo.add(USER, entry)
+        records.append(entry)
+    return records
+
+
+def bench_repository(repo: HistoryRepository, legacy: List[dict], size: int, page_size: int) -> None:
+    last_offset = max(0, size - page_size)
+    first_page = repo.list(USER, limit=page_size)
+    rows = {
+        "count": lambda: repo.count(USER),
+        "page first": lambda: repo.list(USER, limit=page_size),
+        "page middle": lambda: repo.list(USER, limit=page_size, offset=size // 2),
+        "page last": lambda: repo.list(USER, limit=page_size, offset=last_offset),
+        "keyset next": lambda: repo.list(USER, limit=page_size, cursor=repo.cursor_of(first_page[-1])),
+        "filter lang+style": lambda: repo.list(USER, ["영어"], ["문어체"], limit=page_size),
+        "search (fts)": lambda: repo.list(USER, query="도서관에", limit=page_size),
+        "legacy filter+iterate": lambda: [
+            h["input"][:5] for h in legacy if h["target_lang"] in ["영어"] and h["style"] in ["문어체"]
+        ],
+    }
+    for name, fn in rows.items():
+        print(f"  {name:<24} {_timeit(fn) * 1000:>9.2f} ms")
+
+
+def bench_streamlit(db_path: str) -> Optional[float]:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except Exception:
+        return None
+    os.environ["KONNECT_DB_PATH"] = db_path
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    app = AppTest.from_file("app.py", default_timeout=60)
+    app.session_state["page"] = "📄기록"
+    app.session_state["user_id"] = USER
+    app.run()
+    return _timeit(app.run, repeat=3)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="기록 페이지 조회/렌더링 시간 측정")
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--page-size", type=int, default=int(os.getenv("HISTORY_PAGE_SIZE", "20")))
+    args = parser.parse_args(argv)
+
+    for size in [int(x) for x in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "history.sqlite3")
+            repo = HistoryRepository(db_path)
+            legacy = populate(repo, size)
+            print(f"[{size:,} records]")
+            bench_repository(repo, legacy, size, args.page_size)
+            rerun = bench_streamlit(db_path)
+            if rerun is not None:
+                print(f"  {'streamlit rerun (기록)':<24} {rerun * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""LLM 호출 경로 부하 벤치마크 (지연 p50/p95/p99, 처리량)
+
+사용법:
+    # 모의 서버를 같은 프로세스에 띄워 실행 (API 할당량 사용 없음)
+    python -m benchmarks.llm_benchmark --scenarios translate,style,ocr,learning --concurrency 16 --requests 200 \\
+        --latency-ms 400 --tps 80 --error-429 0.05
+    # 이미 떠 있는 서버(모의 서버 또는 실제 API 호환 서버)를 사용
+    python -m benchmarks.llm_benchmark --base-url http://127.0.0.1:8787/v1
+
+시나리오:
+    translate: services.translation.translate_any (한국어 → 영어)
+    style:     services.style.transform (문어체)
+    ocr:       services.ocr.extract_text_from_image (비전 백엔드)
+    learning:  core.prompts.learning_prompts(diff/meaning/examples) → services.llm.chat
+
+응답 캐시/번역 메모리/OCR 캐시는 기본으로 끄고(--with-cache로 켬) 요청마다 입력을 달리해
+실제 호출 경로(속도 제한 → 재시도 → 서킷 브레이커)만 측정한다.
+"""
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import io
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from benchmarks.mock_server import MockServer, add_config_arguments, config_from_args
+from core.prompts import build_messages, learning_input, learning_prompts, learning_system_roles
+from services import llm
+from services.clients import pool_stats
+from services.ocr import extract_text_from_image
+from services.resilience import get_circuit_breaker, get_rate_limiter
+from services.style import transform
+from services.translation import translate_any
+
+SENTENCES = [
+    "오늘은 학교에서 한국어 수업을 들었습니다.",
+    "도서관에 가서 책을 빌렸어요.",
+    "주말에 친구와 함께 영화를 봤다.",
+    "선생님께서 숙제를 내 주셨습니다.",
+]
+REVISED = [
+    "오늘 학교에서 한국어 수업을 받았습니다.",
+    "도서관에서 책을 대출했습니다.",
+    "주말에 친구와 영화를 관람했다.",
+    "선생님께서 과제를 내주셨습니다.",
+]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _sentence(i: int) -> str:
+    # 요청마다 입력을 달리해 캐시/요청 병합의 영향을 배제
+    return f"{SENTENCES[i % len(SENTENCES)]} ({i})"
+
+
+def _image(i: int) -> bytes:
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (640, 200), "white")
+    draw = ImageDraw.Draw(img)
+    draw.text((20, 80), f"Konnect benchmark image {i}", fill="black")
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _learning(i: int) -> str:
+    keys = ("diff", "meaning", "examples")
+    key = keys[i % len(keys)]
+    original = _sentence(i)
+    revised = f"{REVISED[i % len(REVISED)]} ({i})"
+    messages = build_messages(learning_system_roles[key], learning_prompts[key], learning_input(key, original, revised))
+    return llm.chat(messages, model=llm.route_model(key, len(original) + len(revised)))
+
+
+SCENARIOS: Dict[str, Callable[[int], object]] = {
+    "translate": lambda i: translate_any(_sentence(i), "Korean", "English"),
+    "style": lambda i: transform(_sentence(i), "Formal"),
+    "ocr": lambda i: extract_text_from_image(_image(i)),
+    "learning": _learning,
+}
+
+
+def run_scenario(name: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """시나리오 하나를 concurrency개 동시 실행으로 requests번 호출하고 요약 통계를 반환."""
+    fn = SCENARIOS[name]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    def timed(i: int) -> float:
+        started = time.perf_counter()
+        fn(i)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"bench-{name}") as pool:
+        futures = [pool.submit(timed, i) for i in range(requests)]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                latencies.append(future.result())
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+    wall = time.perf_counter() - started
+
+    summary: Dict[str, float] = {
+        "ok": len(latencies),
+        "errors": sum(errors.values()),
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "wall_s": wall,
+    }
+    if latencies:
+        summary.update({
+            "mean_s": statistics.mean(latencies),
+            "p50_s": _percentile(latencies, 50),
+            "p95_s": _percentile(latencies, 95),
+            "p99_s": _percentile(latencies, 99),
+        })
+    if errors:
+        summary["error_types"] = ", ".join(f"{k}={v}" for k, v in sorted(errors.items()))
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="LLM 호출 경로 지연/처리량 벤치마크")
+    parser.add_argument("--base-url", help="사용할 API 주소 (생략 시 모의 서버를 같은 프로세스에 띄움)")
+    parser.add_argument("--scenarios", default="translate,style,ocr,learning", help="쉼표로 구분한 시나리오")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--requests", type=int, default=100, help="시나리오별 요청 수")
+    parser.add_argument("--with-cache", action="store_true", help="응답 캐시/번역 메모리/OCR 캐시 사용")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if not args.with_cache:
+        for name in ("LLM_CACHE_ENABLED", "TM_ENABLED", "OCR_CACHE_ENABLED"):
+            os.environ[name] = "0"
+    os.environ.setdefault("OCR_BACKEND", "vision")
+
+    server: Optional[MockServer] = None
+    if args.base_url:
+        os.environ["LLM_BASE_URL"] = args.base_url
+    else:
+        server = MockServer(config_from_args(args)).start()
+        os.environ["LLM_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+    print(f"base url: {os.environ['LLM_BASE_URL']} / concurrency={args.concurrency} requests={args.requests}")
+
+    try:
+        print(f"{'scenario':<10} {'ok':>5} {'err':>4} {'req/s':>7} {'mean(s)':>8} {'p50(s)':>8} {'p95(s)':>8} {'p99(s)':>8}")
+        for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+            if name not in SCENARIOS:
+                raise SystemExit(f"알 수 없는 시나리오: {name} (지원: {', '.join(SCENARIOS)})")
+            row = run_scenario(name, args.requests, args.concurrency)
+            print(
+                f"{name:<10} {row['ok']:>5} {row['errors']:>4} {row['throughput']:>7.2f}"
+                f" {row.get('mean_s', float('nan')):>8.3f} {row.get('p50_s', float('nan')):>8.3f}"
+                f" {row.get('p95_s', float('nan')):>8.3f} {row.get('p99_s', float('nan')):>8.3f}"
+            )
+            if "error_types" in row:
+                print(f"{'':<10} errors: {row['error_types']}")
+        print(f"rate limiter: {get_rate_limiter().stats()}")
+        print(f"circuit breaker: {get_circuit_breaker().stats()}")
+        print(f"coalescing: {llm.coalesce_stats()}")
+        print(f"connection pool: {pool_stats()}")
+        if server is not None:
+            print(f"mock server: {server.stats.snapshot()}")
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
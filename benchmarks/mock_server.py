@@ -0,0 +1,409 @@
+"""OpenAI 호환 로컬 모의(mock) 서버 — 실제 API 할당량 없이 부하 테스트용
+
+사용법:
+    python -m benchmarks.mock_server --port 8787 --latency lognormal --latency-ms 400 --tps 80 --error-429 0.05
+    (앱/벤치마크) LLM_BASE_URL=http://127.0.0.1:8787/v1 OPENAI_API_KEY=mock streamlit run app.py
+
+지원 엔드포인트:
+    POST /v1/chat/completions  (stream=true면 SSE 조각 전송, 토큰 처리량에 맞춰 간격 조절)
+    POST /v1/responses         (비전 OCR용 Responses API, output_text 형식)
+    GET  /health
+
+응답 시간 = 첫 토큰 지연(분포에서 추출) + 출력 토큰 수 / 초당 토큰 수(--tps).
+프롬프트 프리픽스 캐시 모의: 이전 요청과 같은 프리픽스가 --cache-min-tokens(기본 1024, OpenAI와 동일) 이상이면
+128토큰 단위로 usage.prompt_tokens_details.cached_tokens에 보고하고, 캐시 비율만큼 첫 토큰 지연을 줄인다(--cache-speedup).
+--error-429 / --error-5xx 비율만큼 429(Retry-After 포함) / 500·503 오류를 무작위로 돌려준다.
+응답 본문은 입력 마지막 user 메시지의 {text} 부분을 "[mock] " 접두어와 함께 되돌려 주는 결정적 문자열이다.
+response_format이 json_schema면 스키마 모양(배열은 항목 1개)의 JSON을 같은 문자열로 채워 돌려준다.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class MockConfig:
+    """모의 서버 동작 설정."""
+
+    latency: str = "lognormal"  # fixed | uniform | normal | lognormal
+    latency_ms: float = 300.0  # 첫 토큰까지 평균(중앙값) 지연
+    latency_sigma: float = 0.5  # normal: 표준편차 비율, lognormal: 로그 표준편차, uniform: ±비율
+    tokens_per_second: float = 100.0  # 0이면 출력 시간 없음
+    error_429: float = 0.0
+    error_5xx: float = 0.0
+    retry_after: float = 1.0
+    max_output_tokens: int = 256
+    cache_min_tokens: int = 1024  # 0이면 프리픽스 캐시 모의 안 함
+    cache_speedup: float = 0.5  # 프롬프트 전체가 캐시됐을 때 줄어드는 첫 토큰 지연 비율
+
+    def first_token_delay(self) -> float:
+        mean = self.latency_ms / 1000.0
+        if self.latency == "fixed":
+            return mean
+        if self.latency == "uniform":
+            return max(0.0, random.uniform(mean * (1 - self.latency_sigma), mean * (1 + self.latency_sigma)))
+        if self.latency == "normal":
+            return max(0.0, random.gauss(mean, mean * self.latency_sigma))
+        return random.lognormvariate(0.0, self.latency_sigma) * mean
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+class PrefixCache:
+    """제공자 측 프롬프트 프리픽스 캐시 모의 (최소 길이 이후 128토큰 단위, 토큰 ≒ UTF-8 3바이트)."""
+
+    BLOCK = 128
+
+    def __init__(self, min_tokens: int, capacity: int = 50_000):
+        self.min_tokens = min_tokens
+        self._seen: "OrderedDict[bytes, None]" = OrderedDict()
+        self._capacity = capacity
+        self._lock = threading.Lock()
+
+    def lookup_and_store(self, prompt: str) -> int:
+        """prompt 앞부분 중 이전에 본 가장 긴 프리픽스의 토큰 수를 반환하고, 이번 프리픽스들을 기록."""
+        if self.min_tokens <= 0:
+            return 0
+        data = prompt.encode("utf-8")
+        total = len(data) // 3
+        digests = [
+            (tokens, hashlib.blake2b(data[:tokens * 3], digest_size=16).digest())
+            for tokens in range(self.min_tokens, total + 1, self.BLOCK)
+        ]
+        cached = 0
+        with self._lock:
+            for tokens, digest in digests:
+                if digest in self._seen:
+                    cached = tokens
+                    self._seen.move_to_end(digest)
+                else:
+                    self._seen[digest] = None
+            while len(self._seen) > self._capacity:
+                self._seen.popitem(last=False)
+        return cached
+
+
+def _last_user_text(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _mock_output(prompt: str, max_tokens: int) -> str:
+    # 프롬프트 템플릿의 [입력]/[INPUT] 이후 한 단락을 본문으로 간주
+    body = prompt
+    for marker in ("[입력]", "[INPUT]"):
+        if marker in prompt:
+            body = prompt.split(marker, 1)[1].strip().split("\n\n", 1)[0]
+            break
+    text = "[mock] " + body
+    limit = max_tokens * 3
+    return text if len(text.encode("utf-8")) <= limit else text.encode("utf-8")[:limit].decode("utf-8", "ignore")
+
+
+def _mock_json(schema: Dict[str, Any], text: str) -> Any:
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _mock_json(sub, text) for name, sub in (schema.get("properties") or {}).items()}
+    if kind == "array":
+        return [_mock_json(schema.get("items") or {"type": "string"}, text)]
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    return text
+
+
+class MockStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "429": 0, "5xx": 0, "streams": 0, "prompt_tokens": 0, "cached_tokens": 0}
+
+    def incr(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def make_handler(config: MockConfig, stats: MockStats):
+    prefix_cache = PrefixCache(config.cache_min_tokens)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - 기본 접근 로그 생략
+            pass
+
+        def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _inject_error(self) -> bool:
+            roll = random.random()
+            if roll < config.error_429:
+                stats.incr("429")
+                self._send_json(
+                    429,
+                    {"error": {"message": "mock rate limit", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                    {"Retry-After": f"{config.retry_after:g}"},
+                )
+                return True
+            if roll < config.error_429 + config.error_5xx:
+                stats.incr("5xx")
+                status = random.choice((500, 503))
+                self._send_json(status, {"error": {"message": "mock server error", "type": "server_error", "code": None}})
+                return True
+            return False
+
+        def do_GET(self) -> None:
+            if self.path.rstrip("/").endswith("/health"):
+                self._send_json(200, {"status": "ok", **stats.snapshot()})
+            else:
+                self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error", "code": None}})
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "invalid json", "type": "invalid_request_error", "code": None}})
+                return
+            stats.incr("requests")
+            if self._inject_error():
+                return
+            path = self.path.rstrip("/")
+            if path.endswith("/chat/completions"):
+                self._chat(body)
+            elif path.endswith("/responses"):
+                self._responses(body)
+            else:
+                self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error", "code": None}})
+
+        def _chat(self, body: Dict[str, Any]) -> None:
+            messages = body.get("messages") or []
+            prompt = "".join(f"{m.get('role', '')}\n{m.get('content', '')}\n" for m in messages)
+            output = _mock_output(_last_user_text(messages), config.max_output_tokens)
+            response_format = body.get("response_format") or {}
+            if response_format.get("type") == "json_schema":
+                schema = (response_format.get("json_schema") or {}).get("schema") or {}
+                output = json.dumps(_mock_json(schema, output), ensure_ascii=False)
+            prompt_tokens = _estimate_tokens(prompt)
+            completion_tokens = _estimate_tokens(output)
+            cached_tokens = min(prefix_cache.lookup_and_store(prompt), prompt_tokens)
+            stats.incr("prompt_tokens", prompt_tokens)
+            stats.incr("cached_tokens", cached_tokens)
+            per_token = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+            model = body.get("model", "mock")
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            created = int(time.time())
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            }
+            time.sleep(config.first_token_delay() * (1 - config.cache_speedup * cached_tokens / prompt_tokens))
+
+            if not body.get("stream"):
+                time.sleep(per_token * completion_tokens)
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": output},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": usage,
+                })
+                return
+
+            stats.incr("streams")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            def send(delta: Dict[str, Any], finish: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> None:
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+                if extra:
+                    chunk.update(extra)
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            send({"role": "assistant", "content": ""})
+            # 글자 4개 단위 조각으로 보내되, 전체 전송 시간은 출력 토큰 수 / --tps에 맞춘다
+            pieces = [output[i:i + 4] for i in range(0, len(output), 4)] or [""]
+            delay = per_token * completion_tokens / len(pieces)
+            for piece in pieces:
+                if delay:
+                    time.sleep(delay)
+                send({"content": piece})
+            send({}, "stop", {"usage": usage} if (body.get("stream_options") or {}).get("include_usage") else None)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def _responses(self, body: Dict[str, Any]) -> None:
+            items = body.get("input") or []
+            if isinstance(items, str):
+                items = [{"role": "user", "content": items}]
+            images = sum(
+                1
+                for item in items if isinstance(item, dict) and isinstance(item.get("content"), list)
+                for part in item["content"] if isinstance(part, dict) and part.get("type") == "input_image"
+            )
+            prompt = _last_user_text(items)
+            output = f"[mock ocr] {images} image(s)"
+            # 이미지 1장 ≒ 765 토큰 (detail=high 기준 근사)
+            prompt_tokens = _estimate_tokens(prompt) + 765 * images
+            completion_tokens = _estimate_tokens(output)
+            per_token = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+            time.sleep(config.first_token_delay() + per_token * completion_tokens)
+            self._send_json(200, {
+                "id": f"resp_{uuid.uuid4().hex[:12]}",
+                "object": "response",
+                "created_at": int(time.time()),
+                "model": body.get("model", "mock"),
+                "status": "completed",
+                "output": [{
+                    "id": f"msg_{uuid.uuid4().hex[:12]}",
+                    "type": "message",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": output, "annotations": []}],
+                }],
+                "usage": {
+                    "input_tokens": prompt_tokens,
+                    "output_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+    return Handler
+
+
+class MockServer:
+    """백그라운드 스레드에서 도는 모의 서버 (벤치마크에서 직접 띄울 때 사용).
+
+    with MockServer(MockConfig(latency_ms=200)) as server:
+        os.environ["LLM_BASE_URL"] = server.base_url
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self._httpd = ThreadingHTTPServer((host, port), make_handler(self.config, self.stats))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 실행 (명령줄 실행용)."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """모의 서버 설정 인자 (benchmarks.llm_benchmark와 공유)."""
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "normal", "lognormal"], help="첫 토큰 지연 분포")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="첫 토큰 지연 평균/중앙값(ms)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="분포 폭 (분포별 의미는 MockConfig 참고)")
+    parser.add_argument("--tps", type=float, default=100.0, help="초당 출력 토큰 수 (0이면 즉시)")
+    parser.add_argument("--error-429", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="500/503 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--cache-min-tokens", type=int, default=1024, help="프리픽스 캐시 최소 토큰 수 (0이면 캐시 모의 안 함)")
+    parser.add_argument("--cache-speedup", type=float, default=0.5, help="전체 캐시 시 첫 토큰 지연 감소 비율 (0~1)")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tps,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        retry_after=args.retry_after,
+        cache_min_tokens=args.cache_min_tokens,
+        cache_speedup=args.cache_speedup,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI 호환 로컬 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockServer(config_from_args(args), args.host, args.port)
+    print(f"mock server listening on {server.base_url} (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"stats: {server.stats.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""OCR 백엔드 비교 벤치마크 (지연 시간 / 정확도)
+
+사용법:
+    python -m benchmarks.ocr_benchmark samples/ --backends vision,tesseract,hybrid
+
+samples/ 안의 이미지(jpg/jpeg/png/webp/tif)마다 같은 이름의 .txt 정답 파일이 있으면
+문자 정확도(1 - 편집거리/정답 길이, 공백 정규화)를 함께 계산한다.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from services.ocr import get_ocr_backend
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def char_accuracy(predicted: str, reference: str) -> float:
+    """1 - (Levenshtein 거리 / 정답 길이). 0 미만은 0으로 자른다."""
+    a, b = _normalize(predicted), _normalize(reference)
+    if not b:
+        return 1.0 if not a else 0.0
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+        prev = cur
+    return max(0.0, 1.0 - prev[-1] / len(b))
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(sample_dir: str, backends: List[str]) -> Dict[str, Dict[str, float]]:
+    images = sorted(
+        os.path.join(sample_dir, name)
+        for name in os.listdir(sample_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if not images:
+        raise SystemExit(f"이미지가 없습니다: {sample_dir}")
+
+    summary: Dict[str, Dict[str, float]] = {}
+    for name in backends:
+        backend = get_ocr_backend(name)
+        latencies: List[float] = []
+        accuracies: List[float] = []
+        escalated = 0
+        for path in images:
+            with open(path, "rb") as f:
+                raw = f.read()
+            started = time.perf_counter()
+            try:
+                result = backend.recognize(raw)
+            except RuntimeError as e:
+                print(f"[{name}] {os.path.basename(path)}: 실패 ({e})", file=sys.stderr)
+                continue
+            latencies.append(time.perf_counter() - started)
+            escalated += bool(result.stats.get("escalated"))
+            reference: Optional[str] = None
+            ref_path = os.path.splitext(path)[0] + ".txt"
+            if os.path.exists(ref_path):
+                with open(ref_path, encoding="utf-8") as f:
+                    reference = f.read()
+                accuracies.append(char_accuracy(result.text, reference))
+        if not latencies:
+            continue
+        summary[name] = {
+            "images": len(latencies),
+            "mean_s": statistics.mean(latencies),
+            "p50_s": _percentile(latencies, 50),
+            "p95_s": _percentile(latencies, 95),
+            "accuracy": statistics.mean(accuracies) if accuracies else float("nan"),
+            "escalated": escalated,
+        }
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="OCR 백엔드 지연 시간/정확도 비교")
+    parser.add_argument("sample_dir", help="이미지(+동일 이름 .txt 정답) 폴더")
+    parser.add_argument("--backends", default="vision,tesseract,hybrid", help="쉼표로 구분한 백엔드 이름")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    summary = run(args.sample_dir, [b.strip() for b in args.backends.split(",") if b.strip()])
+    print(f"{'backend':<10} {'images':>6} {'mean(s)':>8} {'p50(s)':>8} {'p95(s)':>8} {'accuracy':>9} {'escalated':>9}")
+    for name, row in summary.items():
+        print(
+            f"{name:<10} {row['images']:>6} {row['mean_s']:>8.3f} {row['p50_s']:>8.3f} {row['p95_s']:>8.3f}"
+            f" {row['accuracy']:>9.3f} {row['escalated']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""프롬프트 배치 방식별 프리픽스 캐시 적중률/지연 비교
+
+    inline: 이전 템플릿 배치 — system: 역할, user: [입력] 원문 + 지침/출력 형식 (입력이 정적 지시 앞에 옴)
+    prefix: 현재 배치(core.prompts.build_messages) — system: 역할 + 정적 지시, user: 원문
+
+같은 작업을 입력만 바꿔 반복 호출하고 usage.prompt_tokens_details.cached_tokens 합계 / prompt_tokens 합계(캐시 비율)와
+지연 p50/p95를 비교한다. 정적 지시/입력 토큰 수는 services.tokens로 계산한다.
+응답 캐시/번역 메모리를 거치지 않도록 공유 OpenAI 클라이언트로 직접 호출한다.
+
+사용법:
+    # 모의 서버를 같은 프로세스에 띄워 실행 (프리픽스 캐시는 OpenAI처럼 1024토큰 이상부터 적용)
+    python -m benchmarks.prompt_cache_benchmark --requests 50 --latency-ms 400
+    # 현재 지시 길이에서 배치 차이를 보려면 최소 캐시 길이를 낮춘다
+    python -m benchmarks.prompt_cache_benchmark --cache-min-tokens 128
+    # 실제 API (OPENAI_API_KEY 필요, 캐시는 제공자 정책을 따름)
+    python -m benchmarks.prompt_cache_benchmark --base-url https://api.openai.com/v1 --requests 20
+"""
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from benchmarks.llm_benchmark import REVISED, SENTENCES
+from benchmarks.mock_server import MockServer, add_config_arguments, config_from_args
+from core.prompts import (
+    build_messages,
+    learning_input,
+    learning_prompts,
+    learning_system_roles,
+    style_transformation_prompts,
+    translation_prompts,
+    translation_style_prompts,
+)
+from services import llm, tokens
+from services.clients import get_openai_client
+from services.style import STYLE_SYSTEM_ROLE
+from services.translation import FUSED_SYSTEM_ROLE, TRANSLATION_SYSTEM_ROLE
+
+LAYOUTS = ("inline", "prefix")
+
+# 시나리오: (시스템 역할, 정적 지시, i번째 입력)
+SCENARIOS: Dict[str, Tuple[str, str, Callable[[int], str]]] = {
+    "translate": (
+        TRANSLATION_SYSTEM_ROLE, translation_prompts["korean_to_english"],
+        lambda i: f"{SENTENCES[i % len(SENTENCES)]} ({i})",
+    ),
+    "style": (
+        STYLE_SYSTEM_ROLE, style_transformation_prompts["Formal"],
+        lambda i: f"{SENTENCES[i % len(SENTENCES)]} ({i})",
+    ),
+    "fused": (
+        FUSED_SYSTEM_ROLE, translation_style_prompts["english_to_korean"]["Formal"],
+        lambda i: f"I went to the library with my friend and borrowed some books. ({i})",
+    ),
+    "learning": (
+        learning_system_roles["diff"], learning_prompts["diff"],
+        lambda i: learning_input("diff", f"{SENTENCES[i % len(SENTENCES)]} ({i})", f"{REVISED[i % len(REVISED)]} ({i})"),
+    ),
+}
+
+
+def build(layout: str, system_role: str, instructions: str, text: str) -> List[Dict[str, str]]:
+    if layout == "prefix":
+        return build_messages(system_role, instructions, text)
+    return [
+        {"role": "system", "content": system_role},
+        {"role": "user", "content": f"[입력]\n{text}\n\n{instructions}"},
+    ]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(layout: str, scenario: str, requests: int, concurrency: int, model: str, offset: int) -> Dict[str, float]:
+    """한 배치/시나리오를 requests번 호출하고 캐시 비율/지연을 요약. offset으로 배치 간 입력을 분리."""
+    system_role, instructions, make_input = SCENARIOS[scenario]
+    client = get_openai_client()
+    breakdown = tokens.prompt_breakdown(build("prefix", system_role, instructions, make_input(0)), model)
+
+    def call(i: int) -> Tuple[float, int, int]:
+        messages = build(layout, system_role, instructions, make_input(offset + i))
+        started = time.perf_counter()
+        resp = client.chat.completions.create(model=model, messages=messages, max_tokens=64)
+        elapsed = time.perf_counter() - started
+        usage = resp.usage
+        details = getattr(usage, "prompt_tokens_details", None)
+        return elapsed, usage.prompt_tokens, (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+    # 첫 호출로 캐시를 데운 뒤 나머지를 동시에 실행
+    results = [call(0)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"bench-{layout}") as pool:
+        results += list(pool.map(call, range(1, requests)))
+    latencies = [r[0] for r in results]
+    prompt_tokens = sum(r[1] for r in results)
+    cached_tokens = sum(r[2] for r in results)
+    return {
+        "instruction_tokens": breakdown["instruction_tokens"],
+        "content_tokens": breakdown["content_tokens"],
+        "prompt_tokens": prompt_tokens / len(results),
+        "cached_ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+        "mean_s": statistics.mean(latencies),
+        "p50_s": _percentile(latencies, 50),
+        "p95_s": _percentile(latencies, 95),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="프롬프트 배치별 프리픽스 캐시 비율/지연 벤치마크")
+    parser.add_argument("--base-url", help="사용할 API 주소 (생략 시 모의 서버를 같은 프로세스에 띄움)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="쉼표로 구분한 시나리오")
+    parser.add_argument("--requests", type=int, default=50, help="배치/시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--model", help="모델명 (기본: OPENAI_CHAT_MODEL)")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    server: Optional[MockServer] = None
+    if args.base_url:
+        os.environ["LLM_BASE_URL"] = args.base_url
+    else:
+        server = MockServer(config_from_args(args)).start()
+        os.environ["LLM_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+    model = llm.resolve_model(args.model)
+    print(f"base url: {os.environ['LLM_BASE_URL']} / model={model} requests={args.requests} concurrency={args.concurrency}")
+
+    try:
+        print(
+            f"{'scenario':<10} {'layout':<7} {'instr':>6} {'content':>8} {'prompt':>7}"
+            f" {'cached':>7} {'mean(s)':>8} {'p50(s)':>8} {'p95(s)':>8}"
+        )
+        for offset, name in enumerate(s.strip() for s in args.scenarios.split(",") if s.strip()):
+            if name not in SCENARIOS:
+                raise SystemExit(f"알 수 없는 시나리오: {name} (지원: {', '.join(SCENARIOS)})")
+            for layout_index, layout in enumerate(LAYOUTS):
+                row = run(layout, name, args.requests, args.concurrency, model, (2 * offset + layout_index) * args.requests)
+                print(
+                    f"{name:<10} {layout:<7} {row['instruction_tokens']:>6} {row['content_tokens']:>8}"
+                    f" {row['prompt_tokens']:>7.0f} {row['cached_ratio']:>7.1%}"
+                    f" {row['mean_s']:>8.3f} {row['p50_s']:>8.3f} {row['p95_s']:>8.3f}"
+                )
+        if server is not None:
+            print(f"mock server: {server.stats.snapshot()}")
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
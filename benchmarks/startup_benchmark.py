@@ -0,0 +1,89 @@
+"""Streamlit 앱 시작/재실행 시간 벤치마크
+
+사용법:
+    python -m benchmarks.startup_benchmark --pages 🏠홈,🔎번역,📄기록,📝학습 --reruns 5
+
+페이지마다 새 프로세스에서 streamlit.testing(AppTest)으로 app.py를 실행해
+- cold_s:  첫 실행 시간 (모듈 import + 캐시 리소스 생성 포함 = 세션 첫 화면)
+- rerun_s: 이후 재실행 시간의 중앙값 (위젯 조작마다 드는 스크립트 실행 시간)
+- openai / PIL: 해당 페이지를 그린 뒤 모듈이 로드되었는지
+를 출력한다. 기록/캐시 DB는 임시 디렉터리를 사용한다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+PAGES = ["🏠홈", "🔎번역", "📄기록", "📝학습"]
+
+_CHILD = """
+import json, statistics, sys, time
+from streamlit.testing.v1 import AppTest
+
+page, reruns = sys.argv[1], int(sys.argv[2])
+at = AppTest.from_file("app.py", default_timeout=60)
+at.session_state["page"] = page
+started = time.perf_counter()
+at.run()
+cold = time.perf_counter() - started
+times = []
+for _ in range(reruns):
+    started = time.perf_counter()
+    at.run()
+    times.append(time.perf_counter() - started)
+print(json.dumps({
+    "cold_s": cold,
+    "rerun_s": statistics.median(times) if times else float("nan"),
+    "openai": "openai" in sys.modules,
+    "PIL": "PIL" in sys.modules,
+    "exceptions": [e.value for e in at.exception],
+}))
+"""
+
+
+def measure(page: str, reruns: int, workdir: str) -> Dict[str, object]:
+    """새 프로세스에서 페이지 하나의 첫 실행/재실행 시간을 잰다."""
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.update({
+        "KONNECT_DB_PATH": os.path.join(workdir, "history.sqlite3"),
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite3"),
+        "CHUNK_CACHE_PATH": os.path.join(workdir, "chunk_cache.sqlite3"),
+        "OCR_CACHE_PATH": os.path.join(workdir, "ocr_cache.sqlite3"),
+    })
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, page, str(reruns)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Streamlit 앱 시작/재실행 시간 벤치마크")
+    parser.add_argument("--pages", default=",".join(PAGES), help="쉼표로 구분한 페이지 이름")
+    parser.add_argument("--reruns", type=int, default=5, help="페이지별 재실행 횟수")
+    parser.add_argument("--repeat", type=int, default=3, help="페이지별 반복 측정 횟수 (중앙값 사용)")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<8} {'cold(s)':>8} {'rerun(ms)':>10} {'openai':>7} {'PIL':>5}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for page in [p.strip() for p in args.pages.split(",") if p.strip()]:
+            rows = [measure(page, args.reruns, workdir) for _ in range(args.repeat)]
+            last = rows[-1]
+            print(
+                f"{page:<8} {statistics.median(r['cold_s'] for r in rows):>8.3f}"
+                f" {1000 * statistics.median(r['rerun_s'] for r in rows):>10.1f}"
+                f" {str(last['openai']):>7} {str(last['PIL']):>5}"
+            )
+            if last["exceptions"]:
+                print(f"{'':<8} exceptions: {last['exceptions']}")
+
+
+if __name__ == "__main__":
+    main()
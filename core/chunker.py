@@ -0,0 +1,126 @@
+"""긴 문서 분할기 (문단/문장 경계 기준)
+
+원칙:
+1. 문단(빈 줄) > 문장(. ! ? … 。 ！ ？) > 공백 순으로 경계를 고른다.
+2. 분할 결과를 순서대로 이어 붙이면 원문과 완전히 같아야 한다 (줄바꿈/공백 보존).
+   → 각 Chunk는 번역 대상 본문(text)과 그 뒤 공백/줄바꿈(separator)을 따로 가진다.
+3. 한국어·중국어·일본어·라틴 문자 문장부호를 모두 인식하며,
+   CJK 전각 종결부호(。！？) 뒤에는 공백이 없어도 문장 경계로 본다.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+DEFAULT_MAX_CHARS = 1500
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# 종결부호 뒤에 닫는 따옴표/괄호가 올 수 있음
+_SENTENCE_END_RE = re.compile(r"[.!?…。！？][\"'”’」』)\]]*$")
+_CJK_END_RE = re.compile(r"[。！？][\"'”’」』)\]]*(?=\S)")
+
+
+@dataclass
+class Chunk:
+    """분할 단위. leading + (번역된) text + separator 를 이어 붙이면 원문 위치를 복원한다."""
+
+    index: int
+    text: str
+    separator: str = ""
+    leading: str = ""
+
+
+def _sentence_spans(text: str, start: int, end: int) -> List[Tuple[int, int, int]]:
+    """text[start:end]를 문장 단위 (본문 시작, 본문 끝, 구분 공백 끝) 범위로 나눈다."""
+    boundaries: List[Tuple[int, int]] = []
+    for m in _WHITESPACE_RE.finditer(text, start, end):
+        if m.start() == start:
+            continue
+        if "\n" in m.group() or _SENTENCE_END_RE.search(text, max(start, m.start() - 4), m.start()):
+            boundaries.append((m.start(), m.end()))
+    for m in _CJK_END_RE.finditer(text, start, end):
+        boundaries.append((m.end(), m.end()))
+    boundaries.sort()
+
+    spans: List[Tuple[int, int, int]] = []
+    pos = start
+    for body_end, sep_end in boundaries:
+        if body_end <= pos:
+            continue
+        spans.append((pos, body_end, sep_end))
+        pos = sep_end
+    if pos < end:
+        trailing = _WHITESPACE_RE.search(text, pos, end)
+        body_end = trailing.start() if trailing and trailing.end() == end else end
+        spans.append((pos, body_end, end))
+    return spans
+
+
+def _hard_split(text: str, span: Tuple[int, int, int], max_chars: int) -> List[Tuple[int, int, int]]:
+    """max_chars보다 긴 문장을 공백(없으면 글자 수) 기준으로 자른다."""
+    start, body_end, sep_end = span
+    pieces: List[Tuple[int, int, int]] = []
+    while body_end - start > max_chars:
+        limit = start + max_chars
+        cut = None
+        for m in _WHITESPACE_RE.finditer(text, start + 1, limit):
+            cut = m
+        if cut is not None:
+            pieces.append((start, cut.start(), cut.end()))
+            start = cut.end()
+        else:
+            pieces.append((start, limit, limit))
+            start = limit
+    pieces.append((start, body_end, sep_end))
+    return pieces
+
+
+def split_text(text: str, max_chars: int = DEFAULT_MAX_CHARS) -> List[Chunk]:
+    """문서를 max_chars 이하의 Chunk 목록으로 나눈다.
+
+    문장들을 순서대로 채워 넣되, 현재 조각이 절반 이상 찼고 문단이 끝나면 그 자리에서 끊는다.
+    공백뿐인 입력이면 빈 목록을 반환한다.
+    """
+    leading_match = re.match(r"\s*", text)
+    start = leading_match.end()
+    if start == len(text):
+        return []
+
+    spans: List[Tuple[int, int, int]] = []
+    for span in _sentence_spans(text, start, len(text)):
+        spans.extend(_hard_split(text, span, max_chars) if span[1] - span[0] > max_chars else [span])
+
+    chunks: List[Chunk] = []
+    chunk_start = spans[0][0]
+    for i, (span_start, body_end, sep_end) in enumerate(spans):
+        is_last = i == len(spans) - 1
+        size = body_end - chunk_start
+        separator = text[body_end:sep_end]
+        next_too_big = not is_last and spans[i + 1][1] - chunk_start > max_chars
+        paragraph_break = "\n\n" in separator.replace("\r", "") and size >= max_chars // 2
+        if is_last or next_too_big or paragraph_break:
+            chunks.append(Chunk(index=len(chunks), text=text[chunk_start:body_end], separator=separator))
+            if not is_last:
+                chunk_start = spans[i + 1][0]
+    chunks[0].leading = text[:start]
+    return chunks
+
+
+def split_sentences(text: str) -> List[Chunk]:
+    """문서를 문장 단위 Chunk 목록으로 나눈다 (길이 제한 없음, join_chunks로 원문 복원 가능)."""
+    leading_match = re.match(r"\s*", text)
+    start = leading_match.end()
+    if start == len(text):
+        return []
+    chunks = [
+        Chunk(index=i, text=text[span_start:body_end], separator=text[body_end:sep_end])
+        for i, (span_start, body_end, sep_end) in enumerate(_sentence_spans(text, start, len(text)))
+    ]
+    chunks[0].leading = text[:start]
+    return chunks
+
+
+def join_chunks(chunks: Sequence[Chunk], outputs: Sequence[str]) -> str:
+    """Chunk 순서대로 결과를 이어 붙이며 원문의 공백/줄바꿈 구조를 복원한다."""
+    return "".join(chunk.leading + output + chunk.separator for chunk, output in zip(chunks, outputs))
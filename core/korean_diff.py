@@ -0,0 +1,282 @@
+"""교정 전/후 한국어 문장 차이 (로컬, 결정적)
+
+LLM 호출 없이 원문과 수정문의 바뀐 부분을 즉시 계산한다.
+1. 어절(공백 단위)과 문장부호로 나눈 토큰을 difflib으로 정렬한다.
+2. 함께 바뀐 어절 묶음은 띄어쓰기만 달라졌는지 먼저 보고, 아니면 첫 음절(초성+중성)이 같은 어절끼리 짝지은 뒤
+   자모 단위로 공통 어간을 떼어 낸다 (갔다/가셨다 → 가 + ㅆ다/셨다, 간다/갑니다 → 가 + ㄴ다/ㅂ니다).
+3. 남은 꼬리가 조사/어미 목록으로만 이루어져 있으면 조사 변화 / 어미 변화 / 높임 변화(상대 높임 등급, 주체 높임 '-시-')로,
+   높임 어휘 쌍(나→저, 먹다→드시다 등)이면 높임 변화로, 나머지는 어휘 교체로 분류한다.
+형태소 분석기를 쓰지 않는 순수 파이썬 근사이므로 설명(왜 바뀌었는지)은 LLM 학습 카드에 맡긴다.
+"""
+from __future__ import annotations
+
+import difflib
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+CHANGE_LABELS = {
+    "replace": "어휘 교체",
+    "particle": "조사",
+    "ending": "어미",
+    "honorific": "높임",
+    "spacing": "띄어쓰기",
+    "punctuation": "문장부호",
+    "insert": "추가",
+    "delete": "삭제",
+}
+
+_TOKEN_RE = re.compile(r"(\w+|[^\w\s]+)(\s*)")
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+         "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 조사 (복합 조사는 최대 3개까지 이어 붙여 인식: 에서는, 에게도 ...)
+_PARTICLES = frozenset((
+    "이", "가", "은", "는", "을", "를", "에", "에서", "에게", "한테", "께", "께서", "의", "도", "만",
+    "로", "으로", "와", "과", "랑", "이랑", "하고", "부터", "까지", "처럼", "보다", "마다", "밖에",
+    "조차", "뿐", "이나", "나", "이든", "든", "서",
+))
+# 어미(선어말 어미 포함)를 이루는 음절. 어간 뒤 꼬리가 이 음절들로만 되어 있으면 어미 변화로 본다.
+_ENDING_SYLLABLES = frozenset(
+    "다요니까습십시오세셔셨어아여었았였겠고며면서지만데는은을죠네군게자라래냐나던든음기"
+    "해했합한할하야려러도잖구신실심으"
+)
+# 어간 마지막 음절에 받침으로 붙는 어미 (간다, 갑니다, 갈게요, 갔다, 감)
+_ENDING_FINALS = frozenset("ㄴㄹㅂㅆㅁ")
+_HONORIFIC_SI = frozenset("시세셔셨십실신심")
+
+# 높임 어휘 쌍: (예사말 어간, 높임말/겸양말 어간 또는 활용형 앞부분)
+_HONORIFIC_NOUNS = (
+    ("나", ("저",)), ("내", ("제",)), ("우리", ("저희",)), ("밥", ("진지",)), ("집", ("댁",)),
+    ("나이", ("연세",)), ("이름", ("성함",)), ("말", ("말씀",)), ("생일", ("생신",)),
+    ("사람", ("분",)), ("병", ("병환",)), ("아버지", ("아버님",)), ("어머니", ("어머님",)),
+)
+_HONORIFIC_VERBS = (
+    ("먹", ("드시", "드셔", "드셨", "드십", "드세", "드신", "잡수")),
+    ("있", ("계시", "계셔", "계셨", "계십", "계세", "계신")),
+    ("자", ("주무시", "주무셔", "주무셨", "주무십", "주무세", "주무신")),
+    ("주", ("드리", "드려", "드렸", "드립", "드릴", "드린")),
+    ("묻", ("여쭈", "여쭤", "여쭸", "여쭙")),
+    ("보", ("뵈", "봬", "뵙", "뵀", "뵐", "뵌")),
+    ("데리", ("모시", "모셔", "모셨", "모십", "모신")),
+    ("말하", ("말씀하", "말씀드리", "말씀드려", "말씀드렸")),
+    ("아프", ("편찮",)),
+)
+_SPEECH_LEVELS = ("해체/해라체", "해요체", "합쇼체")
+
+
+@dataclass
+class Segment:
+    """표시 단위. op: equal / replace / insert / delete, sep: 뒤에 붙는 공백(어절 안 조각이면 빈 문자열)."""
+
+    op: str
+    before: str = ""
+    after: str = ""
+    sep: str = ""
+
+
+@dataclass
+class Change:
+    """바뀐 부분 하나. kind는 CHANGE_LABELS의 키, detail은 조사/어미/높임 설명."""
+
+    kind: str
+    before: str = ""
+    after: str = ""
+    detail: str = ""
+
+
+@dataclass
+class KoreanDiff:
+    segments: List[Segment] = field(default_factory=list)
+    changes: List[Change] = field(default_factory=list)
+
+
+def _decompose(ch: str) -> Optional[Tuple[str, str, str]]:
+    code = ord(ch)
+    if not _HANGUL_BASE <= code <= _HANGUL_LAST:
+        return None
+    index = code - _HANGUL_BASE
+    return _CHO[index // 588], _JUNG[(index % 588) // 28], _JONG[index % 28]
+
+
+def _compose(cho: str, jung: str, jong: str = "") -> str:
+    return chr(_HANGUL_BASE + (_CHO.index(cho) * 21 + _JUNG.index(jung)) * 28 + _JONG.index(jong))
+
+
+def _jamo(text: str) -> str:
+    return "".join("".join(parts) if (parts := _decompose(ch)) else ch for ch in text)
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """(어절 또는 문장부호, 뒤 공백) 목록."""
+    return [(m.group(1), m.group(2)) for m in _TOKEN_RE.finditer(text.strip())]
+
+
+def _is_particles(tail: str, depth: int = 3) -> bool:
+    if not tail:
+        return True
+    if depth == 0:
+        return False
+    return any(tail.startswith(p) and _is_particles(tail[len(p):], depth - 1) for p in _PARTICLES)
+
+
+def _is_ending(tail: str) -> bool:
+    if tail[:1] in _ENDING_FINALS:
+        tail = tail[1:]
+    return all(ch in _ENDING_SYLLABLES for ch in tail)
+
+
+def _is_grammatical(tail: str) -> bool:
+    return _is_particles(tail) or _is_ending(tail)
+
+
+def _split_stem(a: str, b: str) -> Tuple[str, str, str]:
+    """공통 어간과 각 꼬리. 첫 차이 음절의 초성+중성이 같으면 받침부터 꼬리로 본다 (갔다/가셨다 → 가, ㅆ다, 셨다)."""
+    k = 0
+    while k < len(a) and k < len(b) and a[k] == b[k]:
+        k += 1
+    stem, tail_a, tail_b = a[:k], a[k:], b[k:]
+    if k < len(a) and k < len(b):
+        da, db = _decompose(a[k]), _decompose(b[k])
+        if da and db and da[:2] == db[:2]:
+            stem += _compose(da[0], da[1])
+            tail_a = da[2] + a[k + 1:]
+            tail_b = db[2] + b[k + 1:]
+    return stem, tail_a, tail_b
+
+
+def _speech_level(word: str) -> int:
+    """상대 높임 등급 (0: 해체/해라체, 1: 해요체, 2: 합쇼체)."""
+    if word.endswith(("니다", "니까", "십시오", "십시요")):
+        return 2
+    if word.endswith(("요", "죠")):
+        return 1
+    return 0
+
+
+def _honorific_vocab(a: str, b: str) -> Optional[str]:
+    """높임 어휘 쌍이면 '예사말 → 높임말' 설명 (어느 방향이든)."""
+    for before, after, reverse in ((a, b, False), (b, a, True)):
+        for plain, forms in _HONORIFIC_NOUNS:
+            for form in forms:
+                if (before.startswith(plain) and after.startswith(form)
+                        and _is_particles(before[len(plain):]) and _is_particles(after[len(form):])):
+                    return f"{form} → {plain}" if reverse else f"{plain} → {form}"
+        for plain, forms in _HONORIFIC_VERBS:
+            if _jamo(before).startswith(_jamo(plain)) and after.startswith(forms):
+                return f"{forms[0]}다 → {plain}다" if reverse else f"{plain}다 → {forms[0]}다"
+    return None
+
+
+def _classify(a: str, b: str) -> Change:
+    """짝지은 두 어절(또는 문장부호)의 차이를 분류."""
+    if not (a[:1].isalnum() or b[:1].isalnum()):
+        return Change("punctuation", a, b)
+    stem, tail_a, tail_b = _split_stem(a, b)
+    if stem and _is_grammatical(tail_a) and _is_grammatical(tail_b):
+        shown = f"-{tail_a or '∅'} → -{tail_b or '∅'}"
+        if _is_particles(tail_a) and _is_particles(tail_b):
+            return Change("particle", a, b, shown)
+        details = [shown]
+        level_a, level_b = _speech_level(a), _speech_level(b)
+        si_a = any(ch in _HONORIFIC_SI for ch in tail_a)
+        si_b = any(ch in _HONORIFIC_SI for ch in tail_b)
+        if level_a != level_b:
+            details.append(f"{_SPEECH_LEVELS[level_a]} → {_SPEECH_LEVELS[level_b]}")
+        if si_a != si_b:
+            details.append("주체 높임 '-시-' " + ("추가" if si_b else "삭제"))
+        past_a, past_b = "ㅆ" in _jamo(tail_a), "ㅆ" in _jamo(tail_b)
+        if past_a != past_b:
+            details.append("과거 시제 " + ("추가" if past_b else "삭제"))
+        kind = "honorific" if level_a != level_b or si_a != si_b else "ending"
+        return Change(kind, a, b, ", ".join(details))
+    vocab = _honorific_vocab(a, b)
+    if vocab:
+        return Change("honorific", a, b, f"높임 어휘: {vocab}")
+    return Change("replace", a, b)
+
+
+def _pair_segments(a: str, b: str, sep: str) -> List[Segment]:
+    """바뀐 어절 하나를 공통 앞/뒤 음절과 바뀐 가운데로 나눠 표시."""
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < min(len(a), len(b)) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    segments = []
+    if prefix:
+        segments.append(Segment("equal", a[:prefix], b[:prefix]))
+    segments.append(Segment("replace", a[prefix:len(a) - suffix], b[prefix:len(b) - suffix]))
+    if suffix:
+        segments.append(Segment("equal", a[len(a) - suffix:], b[len(b) - suffix:]))
+    segments[-1].sep = sep
+    return segments
+
+
+def _pair_key(word: str) -> str:
+    # 짝짓기 기준: 첫 음절의 초성+중성 (갔다/가셨다/간다 → ㄱㅏ)
+    parts = _decompose(word[0])
+    return parts[0] + parts[1] if parts else word.lower()
+
+
+def _diff_block(
+    a: Sequence[Tuple[str, str]], b: Sequence[Tuple[str, str]], result: KoreanDiff,
+) -> None:
+    """함께 바뀐 토큰 묶음을 변경 목록과 표시 조각으로 변환."""
+    if "".join(t for t, _ in a) == "".join(t for t, _ in b):
+        before = "".join(t + s for t, s in a[:-1]) + a[-1][0]
+        after = "".join(t + s for t, s in b[:-1]) + b[-1][0]
+        result.changes.append(Change("spacing", before, after))
+        result.segments.append(Segment("replace", before, after, b[-1][1]))
+        return
+    matcher = difflib.SequenceMatcher(None, [_pair_key(t) for t, _ in a], [_pair_key(t) for t, _ in b], autojunk=False)
+    for _, i1, i2, j1, j2 in matcher.get_opcodes():
+        paired = min(i2 - i1, j2 - j1)
+        for offset in range(paired):
+            (text_a, _), (text_b, sep) = a[i1 + offset], b[j1 + offset]
+            result.changes.append(_classify(text_a, text_b))
+            result.segments.extend(_pair_segments(text_a, text_b, sep))
+        for text, sep in a[i1 + paired:i2]:
+            result.changes.append(Change("delete", before=text))
+            result.segments.append(Segment("delete", before=text, sep=sep))
+        for text, sep in b[j1 + paired:j2]:
+            result.changes.append(Change("insert", after=text))
+            result.segments.append(Segment("insert", after=text, sep=sep))
+
+
+def compare(original: str, revised: str) -> KoreanDiff:
+    """원문 → 수정문 차이 (표시 조각 + 변경 목록). 같은 입력이면 항상 같은 결과."""
+    a, b = _tokenize(original), _tokenize(revised)
+    result = KoreanDiff()
+    matcher = difflib.SequenceMatcher(None, [t for t, _ in a], [t for t, _ in b], autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            result.segments.extend(Segment("equal", text, text, sep) for text, sep in b[j1:j2])
+        elif op == "delete":
+            for text, sep in a[i1:i2]:
+                result.changes.append(Change("delete", before=text))
+                result.segments.append(Segment("delete", before=text, sep=sep))
+        elif op == "insert":
+            for text, sep in b[j1:j2]:
+                result.changes.append(Change("insert", after=text))
+                result.segments.append(Segment("insert", after=text, sep=sep))
+        else:
+            _diff_block(a[i1:i2], b[j1:j2], result)
+    return result
+
+
+def describe(change: Change) -> str:
+    """변경 하나를 '원문 → 수정문 (설명)' 한 줄로."""
+    if change.kind == "insert":
+        text = f"+ {change.after}"
+    elif change.kind == "delete":
+        text = f"- {change.before}"
+    else:
+        text = f"{change.before} → {change.after}"
+    return f"{text} ({change.detail})" if change.detail else text
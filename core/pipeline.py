@@ -0,0 +1,266 @@
+"""유즈케이스 오케스트레이션: OCR → 번역 → 문체 변환 → 학습 분석 (UI 비의존)
+
+Streamlit 화면(views/)과 HTTP 서비스(api.py)가 같은 흐름을 공유한다.
+- start_translation() → TranslationRun: 입력 길이/언어/문체로 처리 방식(document/fused/two_step/translate)과 모델을 먼저 정하고,
+  stream()으로 결과 조각을 내보낸다. 끝까지 소비하면 output에 전체 결과가 담긴다.
+- start_batch() → BatchRun: 일괄 번역. 묶음이 끝나는 순서대로 (입력 위치, 결과)를 내보낸다.
+- iter_ocr: 여러 이미지/다중 페이지 문서의 페이지별 OCR
+- learning_stream / iter_learning: 교정 전/후 문장 학습 분석 (diff / meaning / examples)
+- learning_card: 세 분석을 한 번의 구조화 출력(JSON) 호출로 받는 학습 카드
+언어는 영어 이름(Korean, English ...), 문체는 프롬프트 키(Formal, Informal ...)를 쓴다.
+원격 서비스를 쓰는 services.api_client.RemotePipeline도 같은 함수 이름/인자를 제공한다.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from core.prompts import (
+    build_messages,
+    learning_card_prompt,
+    learning_card_schema,
+    learning_card_system_role,
+    learning_input,
+    learning_prompts,
+    learning_system_roles,
+)
+from services import llm, telemetry
+from services.ocr import OCRResult, iter_ocr_pages
+from services.style import transform, transform_stream
+from services.translation import (
+    iter_translate_many,
+    translate_any,
+    translate_any_stream,
+    translate_document,
+    translate_with_style_stream,
+)
+
+logger = logging.getLogger("konnect.pipeline")
+# 한국어 타깃 + 문체 선택 시 처리 방식: "fused"(번역+문체 1회 호출) 또는 "two_step"(번역 → 문체 변환)
+PIPELINE_MODE = os.getenv("KONNECT_PIPELINE_MODE", "fused")
+# 이 길이를 넘는 입력은 문단/문장 단위로 나눠 병렬 번역
+DOCUMENT_CHUNK_CHARS = int(os.getenv("DOCUMENT_CHUNK_CHARS", "1500"))
+
+LEARNING_KINDS = ("diff", "meaning", "examples")
+
+
+class TranslationRun:
+    """번역(+문체 변환) 한 건.
+
+    생성 시 처리 방식(mode), 기록용 모델명(model), 실제 적용 문체(style)가 정해진다.
+    Args:
+        text: 입력 텍스트
+        source / target: 언어 이름
+        style: 타깃이 한국어일 때 적용할 문체 프롬프트 키 (None이면 번역만)
+        on_progress: 긴 문서 번역 시 (완료 조각 수, 전체 조각 수) 콜백
+    """
+
+    def __init__(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        style: str | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+    ):
+        self.text = text
+        self.source = source
+        self.target = target
+        self.style = style if target == "Korean" and style else None
+        self.on_progress = on_progress
+        self.output = ""
+        # 작업/입력 길이별 모델 선택 (기록에 함께 저장)
+        self._model = llm.route_model("translate", len(text))
+        self._style_model = self._model
+        if len(text) > DOCUMENT_CHUNK_CHARS:
+            self.mode = "document"
+        elif self.style and source != "Korean" and PIPELINE_MODE == "fused":
+            self.mode = "fused"
+        elif self.style:
+            self.mode = "two_step"
+            self._style_model = llm.route_model("style", len(text))
+        else:
+            self.mode = "translate"
+
+    @property
+    def model(self) -> str:
+        """기록용 모델명 (두 단계 처리에서 모델이 다르면 "번역모델+문체모델")."""
+        if self.mode != "two_step":
+            return self._model
+        if self.source != "Korean" and self._style_model != self._model:
+            return f"{self._model}+{self._style_model}"
+        return self._style_model
+
+    def stream(self) -> Iterator[str]:
+        """결과 조각을 순서대로 yield (긴 문서는 완성된 결과를 한 번에)."""
+        span = telemetry.start_span(
+            "pipeline.translate", mode=self.mode, src=self.source, tgt=self.target, style=self.style,
+        )
+        return telemetry.traced(span, self._run())
+
+    def result(self) -> str:
+        """끝까지 실행하고 전체 결과를 반환."""
+        for _ in self.stream():
+            pass
+        return self.output
+
+    def _run(self) -> Iterator[str]:
+        started = time.perf_counter()
+        parts: List[str] = []
+        if self.mode == "document":
+            # 긴 문서: 조각 단위 병렬 번역 후 순서대로 재조립
+            output = translate_document(
+                self.text, self.source, self.target,
+                style_type=self.style, model=self._model, on_progress=self.on_progress,
+            )
+            parts.append(output)
+            yield output
+            logger.info("pipeline[document] %s->%s style=%s total=%.3fs", self.source, self.target, self.style, time.perf_counter() - started)
+        elif self.mode == "fused":
+            # 외국어 → 한국어 + 문체: 한 번의 호출로 처리
+            for delta in translate_with_style_stream(self.text, self.source, self.style, model=self._model):
+                parts.append(delta)
+                yield delta
+            logger.info("pipeline[fused] %s->%s style=%s total=%.3fs", self.source, self.target, self.style, time.perf_counter() - started)
+        elif self.mode == "two_step":
+            translation = translate_any(self.text, self.source, self.target, model=self._model)
+            translated_at = time.perf_counter()
+            # 최종 단계만 스트리밍
+            for delta in transform_stream(translation, self.style, model=self._style_model):
+                parts.append(delta)
+                yield delta
+            logger.info(
+                "pipeline[two_step] %s->%s style=%s translate=%.3fs style=%.3fs",
+                self.source, self.target, self.style, translated_at - started, time.perf_counter() - translated_at,
+            )
+        else:
+            for delta in translate_any_stream(self.text, self.source, self.target, model=self._model):
+                parts.append(delta)
+                yield delta
+            logger.info("pipeline[translate] %s->%s total=%.3fs", self.source, self.target, time.perf_counter() - started)
+        self.output = "".join(parts)
+
+
+class BatchRun:
+    """일괄 번역 (문체만 바꾸는 경우 포함). 반복하면 (입력 위치, 결과)를 묶음이 끝나는 순서대로 yield."""
+
+    def __init__(self, lines: Sequence[str], source: str, target: str, style: str | None = None):
+        self.lines = list(lines)
+        self.source = source
+        self.target = target
+        self.style = style
+        task = "style" if style and source == target else "translate"
+        self.model = llm.route_model(task, sum(len(line) for line in self.lines))
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        span = telemetry.start_span("pipeline.batch", lines=len(self.lines), src=self.source, tgt=self.target)
+        return telemetry.traced(
+            span, iter_translate_many(self.lines, self.source, self.target, style_type=self.style, model=self.model),
+        )
+
+
+def start_translation(
+    text: str,
+    source: str,
+    target: str,
+    style: str | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> TranslationRun:
+    """번역(+문체 변환) 한 건을 준비 (실행은 stream()/result())."""
+    return TranslationRun(text, source, target, style, on_progress)
+
+
+def start_batch(lines: Sequence[str], source: str, target: str, style: str | None = None) -> BatchRun:
+    """일괄 번역을 준비 (실행은 반복)."""
+    return BatchRun(lines, source, target, style)
+
+
+def restyle_stream(text: str, style: str) -> Iterator[str]:
+    """한국어 문체 변환 결과 조각을 순서대로 yield."""
+    span = telemetry.start_span("pipeline.style", style=style)
+    return telemetry.traced(span, transform_stream(text, style, model=llm.route_model("style", len(text))))
+
+
+def restyle(text: str, style: str) -> str:
+    """한국어 문체 변환."""
+    with telemetry.span("pipeline.style", style=style):
+        return transform(text, style, model=llm.route_model("style", len(text)))
+
+
+def iter_ocr(uploads: Sequence, backend: str | None = None) -> Iterator[Tuple[int, int, OCRResult]]:
+    """페이지별 OCR. (페이지 번호, 전체 페이지 수, OCRResult)를 페이지 순서대로 yield (services.ocr.iter_ocr_pages)."""
+    span = telemetry.start_span("pipeline.ocr", files=len(uploads))
+    return telemetry.traced(span, iter_ocr_pages(uploads, backend))
+
+
+def learning_messages(kind: str, original: str, revised: str) -> List[Dict[str, str]]:
+    """학습 분석 요청 메시지 (kind: diff / meaning / examples).
+
+    Raises:
+        ValueError: 지원하지 않는 분석 종류
+    """
+    if kind not in LEARNING_KINDS:
+        raise ValueError(f"지원하지 않는 분석: {kind}. 지원 분석: {list(LEARNING_KINDS)}")
+    return build_messages(learning_system_roles[kind], learning_prompts[kind], learning_input(kind, original, revised))
+
+
+def learning_model(kind: str, original: str, revised: str) -> str:
+    """학습 분석 모델: 작업(diff/meaning/examples)과 원문+수정문 길이로 선택."""
+    return llm.route_model(kind, len(original) + len(revised))
+
+
+def learning_stream(kind: str, original: str, revised: str) -> Iterator[str]:
+    """학습 분석 하나를 스트리밍."""
+    messages = learning_messages(kind, original, revised)
+    span = telemetry.start_span(f"learning.{kind}", length=len(original) + len(revised))
+    return telemetry.traced(span, llm.chat_stream(messages, model=learning_model(kind, original, revised)))
+
+
+def learning(kind: str, original: str, revised: str) -> str:
+    """학습 분석 하나 (전체 결과)."""
+    with telemetry.span(f"learning.{kind}", length=len(original) + len(revised)):
+        return llm.chat(learning_messages(kind, original, revised), model=learning_model(kind, original, revised))
+
+
+def iter_learning(
+    kinds: Sequence[str], original: str, revised: str,
+) -> Iterator[Tuple[str, "concurrent.futures.Future[str]"]]:
+    """여러 분석을 동시에 요청하고 (분석 종류, 완료된 Future)를 먼저 끝나는 순서대로 yield.
+
+    대기 시간 = 가장 느린 호출. 개별 실패는 Future.result()에서 예외로 드러난다.
+    """
+    span = telemetry.start_span("learning.all", length=len(original) + len(revised))
+    return telemetry.traced(span, _iter_learning(kinds, original, revised))
+
+
+def _iter_learning(kinds: Sequence[str], original: str, revised: str) -> Iterator[Tuple[str, "concurrent.futures.Future[str]"]]:
+    futures = {
+        llm.submit(llm.achat(learning_messages(kind, original, revised), model=learning_model(kind, original, revised))): kind
+        for kind in kinds
+    }
+    for future in concurrent.futures.as_completed(futures):
+        yield futures[future], future
+
+
+def learning_card_model(original: str, revised: str) -> str:
+    """학습 카드 모델: 원문+수정문 길이로 선택 (OPENAI_MODEL_LEARNING 등)."""
+    return llm.route_model("learning", len(original) + len(revised))
+
+
+def learning_card(original: str, revised: str) -> Tuple[Dict[str, Any], str]:
+    """차이점/수정 표현 의미/예문을 한 번의 구조화 출력 호출로 분석. (카드, 모델명)을 반환.
+
+    카드: {"diff": [요약], "meanings": [{expression, meaning, grammar, synonyms}], "examples": [예문 3개]}
+    Raises:
+        RuntimeError: 응답이 카드 형식이 아님
+    """
+    model = learning_card_model(original, revised)
+    messages = build_messages(learning_card_system_role, learning_card_prompt, learning_input("card", original, revised))
+    with telemetry.span("learning.card", length=len(original) + len(revised)):
+        card = llm.chat_json(messages, learning_card_schema, "learning_card", model=model)
+    if not all(isinstance(card.get(key), list) for key in learning_card_schema["required"]):
+        raise RuntimeError("학습 카드 응답 형식이 올바르지 않습니다.")
+    return card, model
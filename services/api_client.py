@@ -0,0 +1,178 @@
+"""파이프라인 선택: 같은 프로세스(core.pipeline) 또는 원격 HTTP 서비스(api.py)
+
+KONNECT_API_URL이 설정되면 UI는 RemotePipeline을 통해 연산 계층을 호출한다.
+RemotePipeline은 core.pipeline과 같은 함수 이름/인자/반환 형태를 제공하므로 화면 코드는 get_pipeline()만 사용한다.
+
+환경변수:
+    KONNECT_API_URL      서비스 주소 (예: http://127.0.0.1:8000, 없으면 같은 프로세스에서 실행)
+    KONNECT_API_TIMEOUT  응답 대기 시간(초, 기본 300: 긴 문서/일괄 번역 포함)
+"""
+from __future__ import annotations
+
+import base64
+import concurrent.futures
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+_remote: Optional["RemotePipeline"] = None
+_remote_lock = threading.Lock()
+
+
+@dataclass
+class RemoteOCRResult:
+    """services.ocr.OCRResult와 같은 모양의 OCR 결과."""
+    text: str
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def _raise_for_status(resp: httpx.Response) -> None:
+    """서비스 오류 응답을 같은 프로세스에서 실행했을 때와 같은 예외로 바꾼다."""
+    if resp.is_success:
+        return
+    resp.read()
+    try:
+        body = resp.json()
+    except ValueError:
+        body = {"detail": resp.text}
+    detail = body.get("detail") or f"HTTP {resp.status_code}"
+    if body.get("error") == "circuit_open":
+        from services.resilience import CircuitOpenError
+
+        raise CircuitOpenError(float(body.get("retry_in", 30)))
+    if resp.status_code in (400, 422):
+        raise ValueError(detail if isinstance(detail, str) else str(detail))
+    raise RuntimeError(f"번역 서비스 오류: {detail}")
+
+
+class RemoteTranslationRun:
+    """core.pipeline.TranslationRun의 원격 버전. mode/model/style은 응답 헤더를 받은 뒤 채워진다."""
+
+    def __init__(self, client: httpx.Client, text: str, source: str, target: str, style: str | None):
+        self._client = client
+        self._payload = {"text": text, "source": source, "target": target, "style": style, "stream": True}
+        self.mode = ""
+        self.model = ""
+        self.style: Optional[str] = None
+        self.output = ""
+
+    def stream(self) -> Iterator[str]:
+        parts: List[str] = []
+        with self._client.stream("POST", "/v1/translate", json=self._payload) as resp:
+            _raise_for_status(resp)
+            self.mode = resp.headers.get("x-konnect-mode", "")
+            self.model = resp.headers.get("x-konnect-model", "")
+            self.style = resp.headers.get("x-konnect-style") or None
+            for delta in resp.iter_text():
+                parts.append(delta)
+                yield delta
+        self.output = "".join(parts)
+
+    def result(self) -> str:
+        for _ in self.stream():
+            pass
+        return self.output
+
+
+class RemoteBatchRun:
+    """core.pipeline.BatchRun의 원격 버전. model은 응답을 받은 뒤 채워진다."""
+
+    def __init__(self, client: httpx.Client, lines: Sequence[str], source: str, target: str, style: str | None):
+        self._client = client
+        self.lines = list(lines)
+        self._payload = {"lines": self.lines, "source": source, "target": target, "style": style}
+        self.model = ""
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        resp = self._client.post("/v1/translate/batch", json=self._payload)
+        _raise_for_status(resp)
+        body = resp.json()
+        self.model = body["model"]
+        yield from enumerate(body["outputs"])
+
+
+class RemotePipeline:
+    """HTTP 서비스(api.py)를 호출하는 파이프라인. 연결 풀은 모든 세션이 공유한다."""
+
+    def __init__(self, base_url: str, timeout: float = 300.0):
+        self._client = httpx.Client(base_url=base_url.rstrip("/"), timeout=httpx.Timeout(timeout, connect=5.0))
+
+    def start_translation(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        style: str | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> RemoteTranslationRun:
+        # 원격 실행에서는 긴 문서 진행률(on_progress)을 받지 않는다
+        return RemoteTranslationRun(self._client, text, source, target, style)
+
+    def start_batch(self, lines: Sequence[str], source: str, target: str, style: str | None = None) -> RemoteBatchRun:
+        return RemoteBatchRun(self._client, lines, source, target, style)
+
+    def iter_ocr(self, uploads: Sequence, backend: str | None = None) -> Iterator[Tuple[int, int, RemoteOCRResult]]:
+        files = []
+        for i, uploaded in enumerate(uploads):
+            data = uploaded if isinstance(uploaded, (bytes, bytearray)) else uploaded.getvalue()
+            files.append({
+                "name": getattr(uploaded, "name", None) or f"image-{i + 1}",
+                "data": base64.b64encode(data).decode("ascii"),
+            })
+        resp = self._client.post("/v1/ocr", json={"files": files, "backend": backend})
+        _raise_for_status(resp)
+        pages = resp.json()["pages"]
+        for index, page in enumerate(pages):
+            yield index, len(pages), RemoteOCRResult(page["text"], page["stats"])
+
+    def learning_stream(self, kind: str, original: str, revised: str) -> Iterator[str]:
+        payload = {"kind": kind, "original": original, "revised": revised, "stream": True}
+        with self._client.stream("POST", "/v1/learning", json=payload) as resp:
+            _raise_for_status(resp)
+            yield from resp.iter_text()
+
+    def learning(self, kind: str, original: str, revised: str) -> str:
+        resp = self._client.post("/v1/learning", json={"kind": kind, "original": original, "revised": revised})
+        _raise_for_status(resp)
+        return resp.json()["output"]
+
+    def learning_card(self, original: str, revised: str) -> Tuple[Dict[str, Any], str]:
+        resp = self._client.post("/v1/learning/card", json={"original": original, "revised": revised})
+        _raise_for_status(resp)
+        body = resp.json()
+        return body["card"], body["model"]
+
+    def iter_learning(
+        self, kinds: Sequence[str], original: str, revised: str,
+    ) -> Iterator[Tuple[str, "concurrent.futures.Future[str]"]]:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(kinds)), thread_name_prefix="api-learning") as pool:
+            futures = {pool.submit(self.learning, kind, original, revised): kind for kind in kinds}
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future
+
+    def stats(self, window: float | None = None) -> Dict[str, Any]:
+        resp = self._client.get("/v1/stats", params={"window": window} if window else None)
+        _raise_for_status(resp)
+        return resp.json()
+
+
+def api_url() -> Optional[str]:
+    return os.getenv("KONNECT_API_URL") or None
+
+
+def get_pipeline():
+    """KONNECT_API_URL이 있으면 RemotePipeline, 없으면 core.pipeline 모듈 (OpenAI SDK는 이때 처음 불러온다)."""
+    global _remote
+    url = api_url()
+    if not url:
+        from core import pipeline
+
+        return pipeline
+    if _remote is None:
+        with _remote_lock:
+            if _remote is None:
+                _remote = RemotePipeline(url, float(os.getenv("KONNECT_API_TIMEOUT", "300")))
+    return _remote
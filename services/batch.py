@@ -0,0 +1,115 @@
+"""여러 텍스트를 묶어 처리하는 일괄(batch) 실행기
+
+- 입력 여러 개를 <<<번호>>> 구분선으로 묶어 한 번의 프롬프트로 보낸다.
+- 응답을 같은 구분선으로 다시 나누고, 누락된 항목은 개별 호출로 보완한다.
+- 묶음(chunk)들은 제한된 크기의 스레드 풀에서 병렬 실행한다.
+  429/일시 오류 재시도와 속도 제한은 services.llm(services.resilience)이 담당한다.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import re
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from core.prompts import batch_system_prompt, build_messages
+from services import llm
+
+logger = logging.getLogger(__name__)
+
+_DELIMITER_RE = re.compile(r"^[ \t]*<<<(\d+)>>>[ \t]*$", re.MULTILINE)
+
+
+def pack(texts: Sequence[str]) -> str:
+    """여러 텍스트를 1부터 시작하는 <<<번호>>> 구분선으로 묶는다."""
+    return "\n".join(f"<<<{i}>>>\n{text}" for i, text in enumerate(texts, start=1))
+
+
+def unpack(output: str, count: int) -> Dict[int, str]:
+    """pack() 형식의 응답을 {0부터 시작하는 위치: 결과}로 나눈다. 범위 밖/중복 번호는 무시."""
+    results: Dict[int, str] = {}
+    matches = list(_DELIMITER_RE.finditer(output))
+    for pos, match in enumerate(matches):
+        number = int(match.group(1))
+        end = matches[pos + 1].start() if pos + 1 < len(matches) else len(output)
+        body = output[match.end():end].strip()
+        if 1 <= number <= count and (number - 1) not in results and body:
+            results[number - 1] = body
+    return results
+
+
+def chunk_indices(texts: Sequence[str], max_items: int, max_chars: int) -> List[List[int]]:
+    """항목 수/문자 수 한도에 맞춰 입력 위치를 묶음 단위로 나눈다."""
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    size = 0
+    for i, text in enumerate(texts):
+        if current and (len(current) >= max_items or size + len(text) > max_chars):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _build_messages(prompt_template: str, system_role: str, text: str, packed: bool) -> List[Dict[str, str]]:
+    # 묶음 지침은 정적 지시 뒤에 붙여, 단건/묶음 요청이 역할+지시 프리픽스를 공유하도록 한다
+    return build_messages(system_role, prompt_template, text, batch_system_prompt if packed else "")
+
+
+def _run_chunk(
+    texts: Sequence[str],
+    indices: List[int],
+    prompt_template: str,
+    system_role: str,
+    model: str | None,
+) -> List[Tuple[int, str]]:
+    if len(indices) == 1:
+        i = indices[0]
+        return [(i, llm.chat(_build_messages(prompt_template, system_role, texts[i], False), model=model))]
+
+    items = [texts[i] for i in indices]
+    output = llm.chat(_build_messages(prompt_template, system_role, pack(items), True), model=model)
+    parsed = unpack(output, len(items))
+    results: List[Tuple[int, str]] = []
+    for pos, i in enumerate(indices):
+        if pos in parsed:
+            results.append((i, parsed[pos]))
+        else:
+            # 구분선이 깨진 항목만 개별 호출로 보완
+            logger.warning("batch output missing item %d/%d, retrying individually", pos + 1, len(items))
+            results.append((i, llm.chat(_build_messages(prompt_template, system_role, texts[i], False), model=model)))
+    return results
+
+
+def run_batch(
+    texts: Sequence[str],
+    prompt_template: str,
+    system_role: str,
+    model: str | None = None,
+    max_items: int | None = None,
+    max_chars: int | None = None,
+    max_workers: int | None = None,
+) -> Iterator[Tuple[int, str]]:
+    """texts를 묶음 단위로 병렬 처리하고 (입력 위치, 결과)를 완료되는 순서대로 yield 한다.
+
+    Args:
+        texts: 처리할 텍스트 목록
+        prompt_template: 정적 지시 (core.prompts 템플릿, 입력은 user 메시지로 전달)
+        system_role: 시스템 메시지
+        model: 사용할 LLM 모델명 (None이면 기본값)
+        max_items / max_chars: 묶음당 최대 항목 수/문자 수 (기본: BATCH_MAX_ITEMS=20, BATCH_MAX_CHARS=4000)
+        max_workers: 동시에 실행할 묶음 수 (기본: BATCH_MAX_WORKERS=4)
+    """
+    max_items = max_items or int(os.getenv("BATCH_MAX_ITEMS", "20"))
+    max_chars = max_chars or int(os.getenv("BATCH_MAX_CHARS", "4000"))
+    max_workers = max_workers or int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+    chunks = chunk_indices(texts, max_items, max_chars)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as pool:
+        futures = [pool.submit(_run_chunk, texts, indices, prompt_template, system_role, model) for indices in chunks]
+        for future in concurrent.futures.as_completed(futures):
+            yield from future.result()
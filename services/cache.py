@@ -0,0 +1,350 @@
+"""LLM 응답 캐시 (메모리 LRU + SQLite 디스크 2단 구조) 및 OCR 결과 캐시
+
+키: (model, temperature, messages 전체)를 정규화한 JSON의 SHA-256.
+- 1차: 프로세스 메모리 LRU (Streamlit 세션 간 공유)
+- 2차: SQLite 파일 (프로세스 재시작 후에도 유지)
+TTL 만료/최대 항목 수 초과 시 오래 사용되지 않은 항목부터 제거한다.
+OCR 결과는 이미지 내용 해시/지각 해시 기준의 별도 캐시(OCRCache)에 저장한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite3")
+DEFAULT_CHUNK_CACHE_PATH = os.path.join(".cache", "chunk_cache.sqlite3")
+
+
+def make_key(model: str, temperature: float | None, messages: List[Dict[str, str]]) -> str:
+    """요청 파라미터로부터 내용 기반(content-addressed) 캐시 키를 만든다."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """메모리 LRU와 SQLite를 묶은 2단 응답 캐시.
+
+    Args:
+        path: SQLite 파일 경로. None이면 메모리 계층만 사용.
+        max_memory_entries: 메모리 LRU 최대 항목 수
+        max_disk_entries: 디스크 최대 항목 수 (초과 시 최근 사용이 가장 오래된 항목부터 삭제)
+        ttl_seconds: 항목 유효 시간(초). 0 이하이면 만료 없음.
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_CACHE_PATH,
+        max_memory_entries: int = 512,
+        max_disk_entries: int = 20000,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Streamlit은 세션마다 다른 스레드에서 실행되므로 스레드 검사 해제 후 락으로 직렬화
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        """메모리 LRU에 저장 (락 보유 상태에서 호출)."""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시 조회. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                value, created_at = hit
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._counters["evictions"] += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at, now):
+                        self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, value, created_at)
+                        self._counters["disk_hits"] += 1
+                        return value
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._counters["evictions"] += 1
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """캐시에 저장하고 크기 제한을 넘으면 오래된 항목을 제거한다."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._counters["writes"] += 1
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            overflow = count - self.max_disk_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._counters["evictions"] += overflow
+            if self.ttl_seconds > 0:
+                cur = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                self._counters["evictions"] += max(cur.rowcount, 0)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """메모리/디스크 캐시를 모두 비운다."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 카운터와 현재 항목 수를 반환한다."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            if self._conn is not None:
+                (stats["disk_entries"],) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+            return stats
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """환경변수 설정에 따른 프로세스 전역 응답 캐시 싱글턴. 비활성화 시 None.
+
+    환경변수:
+        LLM_CACHE_ENABLED: "0"이면 캐시 비활성화 (기본 "1")
+        LLM_CACHE_PATH: SQLite 파일 경로 (빈 문자열이면 메모리 전용)
+        LLM_CACHE_TTL: 유효 시간(초), 기본 7일
+        LLM_CACHE_MAX_MEMORY / LLM_CACHE_MAX_DISK: 계층별 최대 항목 수
+    """
+    global _response_cache
+    if os.getenv("LLM_CACHE_ENABLED", "1") == "0":
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH) or None,
+                    max_memory_entries=int(os.getenv("LLM_CACHE_MAX_MEMORY", "512")),
+                    max_disk_entries=int(os.getenv("LLM_CACHE_MAX_DISK", "20000")),
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+                )
+    return _response_cache
+
+
+_chunk_cache: Optional[ResponseCache] = None
+
+
+def get_chunk_cache() -> Optional[ResponseCache]:
+    """긴 문서 번역의 조각(chunk)별 결과 캐시 싱글턴. 비활성화 시 None.
+
+    앞 문맥(context)과 무관하게 조각 원문 기준으로 저장하므로, 문서 일부를 고쳐 다시 번역하면
+    바뀐 조각만 새로 호출된다. LLM_CACHE_ENABLED/LLM_CACHE_TTL 설정을 공유하며 경로는 CHUNK_CACHE_PATH.
+    """
+    global _chunk_cache
+    if os.getenv("LLM_CACHE_ENABLED", "1") == "0":
+        return None
+    if _chunk_cache is None:
+        with _response_cache_lock:
+            if _chunk_cache is None:
+                _chunk_cache = ResponseCache(
+                    path=os.getenv("CHUNK_CACHE_PATH", DEFAULT_CHUNK_CACHE_PATH) or None,
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+                )
+    return _chunk_cache
+
+
+DEFAULT_OCR_CACHE_PATH = os.path.join(".cache", "ocr_cache.sqlite3")
+
+
+class OCRCache:
+    """OCR 결과 디스크 캐시 (SQLite).
+
+    1차: 정규화된 픽셀 데이터의 SHA-256 완전 일치
+    2차(선택, 기본 꺼짐): 크기(WxH)가 같은 항목 중 지각 해시(dHash 64bit) 해밍 거리가 max_distance 이하인 가장 가까운 항목.
+        같은 양식의 다른 문서(학습지 등)도 거리가 5 이하로 나올 수 있어 다른 이미지의 결과를 돌려줄 위험이 있다.
+        켜려면 재촬영/재인코딩 정도만 허용하도록 작은 값(예: 2)을 쓴다.
+    최대 항목 수를 넘으면 최근 사용이 가장 오래된 항목부터 제거한다.
+    """
+
+    def __init__(self, path: str | None = DEFAULT_OCR_CACHE_PATH, max_entries: int = 5000, max_distance: int = -1):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "near_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        directory = os.path.dirname(path) if path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS ocr_results (
+                key TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                phash TEXT,
+                text TEXT NOT NULL,
+                stats TEXT NOT NULL,
+                accessed_at REAL NOT NULL,
+                size TEXT,
+                PRIMARY KEY (key, backend)
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(ocr_results)")}
+        if "size" not in columns:
+            # 이전 버전 파일: 크기를 모르는 항목은 유사 일치 후보에서 빠진다
+            self._conn.execute("ALTER TABLE ocr_results ADD COLUMN size TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_size ON ocr_results(backend, size)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_accessed ON ocr_results(accessed_at)")
+        self._conn.commit()
+
+    def get(
+        self, key: str, backend: str, phash: int | None = None, size: str | None = None,
+    ) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """(text, stats, "hit" | "near_hit") 또는 None. 유사 일치는 phash와 size(WxH)가 모두 있을 때만."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, text, stats FROM ocr_results WHERE key = ? AND backend = ?", (key, backend)
+            ).fetchone()
+            status = "hit"
+            if row is None and phash is not None and size and self.max_distance >= 0:
+                best = None
+                for cand_key, cand_phash in self._conn.execute(
+                    "SELECT key, phash FROM ocr_results WHERE backend = ? AND size = ? AND phash IS NOT NULL",
+                    (backend, size),
+                ):
+                    distance = bin(int(cand_phash, 16) ^ phash).count("1")
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, cand_key)
+                if best is not None:
+                    row = self._conn.execute(
+                        "SELECT key, text, stats FROM ocr_results WHERE key = ? AND backend = ?", (best[1], backend)
+                    ).fetchone()
+                    status = "near_hit"
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE ocr_results SET accessed_at = ? WHERE key = ? AND backend = ?", (now, row[0], backend)
+            )
+            self._conn.commit()
+            self._counters["hits" if status == "hit" else "near_hits"] += 1
+            return row[1], json.loads(row[2]), status
+
+    def set(
+        self, key: str, backend: str, text: str, stats: Dict[str, Any], phash: int | None = None, size: str | None = None,
+    ) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_results (key, backend, phash, text, stats, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, backend, f"{phash:016x}" if phash is not None else None, text, json.dumps(stats, default=str), now, size),
+            )
+            self._counters["writes"] += 1
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM ocr_results").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM ocr_results WHERE rowid IN "
+                    "(SELECT rowid FROM ocr_results ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._counters["evictions"] += overflow
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            (stats["entries"],) = self._conn.execute("SELECT COUNT(*) FROM ocr_results").fetchone()
+            return stats
+
+
+_ocr_cache: Optional[OCRCache] = None
+
+
+def get_ocr_cache() -> Optional[OCRCache]:
+    """OCR 결과 캐시 싱글턴. 비활성화 시 None.
+
+    환경변수:
+        OCR_CACHE_ENABLED: "0"이면 비활성화 (기본 "1")
+        OCR_CACHE_PATH: SQLite 파일 경로
+        OCR_CACHE_MAX_ENTRIES: 최대 항목 수 (기본 5000)
+        OCR_PHASH_DISTANCE: 같은 크기의 유사 이미지로 볼 최대 해밍 거리 (기본 -1 = 지각 해시 미사용, 켤 때 권장 2)
+    """
+    global _ocr_cache
+    if os.getenv("OCR_CACHE_ENABLED", "1") == "0":
+        return None
+    if _ocr_cache is None:
+        with _response_cache_lock:
+            if _ocr_cache is None:
+                _ocr_cache = OCRCache(
+                    path=os.getenv("OCR_CACHE_PATH", DEFAULT_OCR_CACHE_PATH) or None,
+                    max_entries=int(os.getenv("OCR_CACHE_MAX_ENTRIES", "5000")),
+                    max_distance=int(os.getenv("OCR_PHASH_DISTANCE", "-1")),
+                )
+    return _ocr_cache
@@ -0,0 +1,218 @@
+"""OpenAI 클라이언트 공유 팩토리 (채팅/비동기/OCR 공통 httpx 연결 풀)
+
+- get_openai_client(): 동기 클라이언트 싱글턴. Streamlit 세션 스레드 전체가 하나의 연결 풀을 공유한다
+  (httpx.Client는 스레드 안전). 매 호출마다 클라이언트를 만들면 TLS/연결 수립 비용을 반복해서 낸다.
+- get_async_openai_client(): 비동기 클라이언트 싱글턴. 연결 풀이 이벤트 루프에 묶이므로
+  services.llm의 공유 이벤트 루프 안에서만 사용한다.
+- pool_stats(): 풀 사용률(진행 중 요청 수, 최대치, 열린/유휴 연결 수) 지표 (관리 패널)
+
+환경변수:
+    LLM_BASE_URL                 API 주소 (없으면 SDK 기본값)
+    OPENAI_MAX_CONNECTIONS       풀 최대 연결 수 (기본 20)
+    OPENAI_MAX_KEEPALIVE         유지할 유휴 연결 수 (기본 = 최대 연결 수)
+    OPENAI_KEEPALIVE_EXPIRY      유휴 연결 유지 시간(초, 기본 30)
+    OPENAI_HTTP2                 HTTP/2 사용 (기본 1, h2 패키지가 없으면 HTTP/1.1)
+    OPENAI_TIMEOUT               읽기/쓰기 타임아웃(초, 기본 60)
+    OPENAI_CONNECT_TIMEOUT       연결 타임아웃(초, 기본 5)
+    OPENAI_POOL_TIMEOUT          풀에서 연결을 기다리는 시간(초, 기본 30)
+"""
+from __future__ import annotations
+
+import importlib.util
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+logger = logging.getLogger(__name__)
+
+_sync_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+_sync_transport: Optional["_MeteredTransport"] = None
+_async_transport: Optional["_MeteredAsyncTransport"] = None
+_lock = threading.Lock()
+
+
+def base_url() -> Optional[str]:
+    """API 주소 (LLM_BASE_URL, 없으면 SDK 기본값: OPENAI_BASE_URL 또는 api.openai.com).
+
+    로컬 부하 테스트 시 benchmarks.mock_server 주소(예: http://127.0.0.1:8787/v1)를 지정한다.
+    """
+    return os.getenv("LLM_BASE_URL") or None
+
+
+def _limits() -> httpx.Limits:
+    max_connections = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", str(max_connections))),
+        keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        float(os.getenv("OPENAI_TIMEOUT", "60")),
+        connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5")),
+        pool=float(os.getenv("OPENAI_POOL_TIMEOUT", "30")),
+    )
+
+
+def _http2() -> bool:
+    if os.getenv("OPENAI_HTTP2", "1") != "1":
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.info("h2 package not installed; using HTTP/1.1 keep-alive")
+        return False
+    return True
+
+
+class _PoolMeter:
+    """전송 계층에서 진행 중 요청 수를 센다. 응답 본문이 닫힐 때(스트리밍 포함) 요청이 끝난 것으로 본다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+
+    def start(self) -> None:
+        with self._lock:
+            self.active += 1
+            self.requests += 1
+            self.peak = max(self.peak, self.active)
+
+    def finish(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, meter: _PoolMeter):
+        self._stream = stream
+        self._meter = meter
+        self._closed = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._meter.finish()
+        self._stream.close()
+
+
+class _MeteredAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, meter: _PoolMeter):
+        self._stream = stream
+        self._meter = meter
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._meter.finish()
+        await self._stream.aclose()
+
+
+class _MeteredTransport(httpx.HTTPTransport):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.meter = _PoolMeter()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.meter.start()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self.meter.finish()
+            raise
+        response.stream = _MeteredStream(response.stream, self.meter)
+        return response
+
+
+class _MeteredAsyncTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.meter = _PoolMeter()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.meter.start()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self.meter.finish()
+            raise
+        response.stream = _MeteredAsyncStream(response.stream, self.meter)
+        return response
+
+
+def get_openai_client() -> OpenAI:
+    """동기 OpenAI 클라이언트 싱글턴. 재시도는 SDK 대신 services.llm._guarded()가 담당(max_retries=0)."""
+    global _sync_client, _sync_transport
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_transport = _MeteredTransport(limits=_limits(), http2=_http2())
+                _sync_client = OpenAI(
+                    base_url=base_url(),
+                    max_retries=0,
+                    timeout=_timeout(),
+                    http_client=DefaultHttpxClient(transport=_sync_transport, timeout=_timeout()),
+                )
+    return _sync_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """비동기 OpenAI 클라이언트 싱글턴 (services.llm의 공유 이벤트 루프 안에서만 사용)."""
+    global _async_client, _async_transport
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_transport = _MeteredAsyncTransport(limits=_limits(), http2=_http2())
+                _async_client = AsyncOpenAI(
+                    base_url=base_url(),
+                    max_retries=0,
+                    timeout=_timeout(),
+                    http_client=DefaultAsyncHttpxClient(transport=_async_transport, timeout=_timeout()),
+                )
+    return _async_client
+
+
+def _connections(transport: Any) -> Dict[str, int]:
+    # httpcore 연결 풀의 연결 목록 (httpx 내부 속성이라 없으면 생략)
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {}
+    return {
+        "connections": len(connections),
+        "idle_connections": sum(1 for c in connections if c.is_idle()),
+    }
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """동기/비동기 풀별 사용률: 진행 중 요청(active)/최대치(peak)/누적 요청 수, 열린 연결/유휴 연결 수."""
+    max_connections = _limits().max_connections
+    stats: Dict[str, Dict[str, Any]] = {}
+    for name, transport in (("sync", _sync_transport), ("async", _async_transport)):
+        if transport is None:
+            continue
+        meter = transport.meter
+        stats[name] = {
+            "active": meter.active,
+            "peak": meter.peak,
+            "requests": meter.requests,
+            "max_connections": max_connections,
+            "utilization": meter.active / max_connections if max_connections else 0.0,
+            **_connections(transport),
+        }
+    return stats
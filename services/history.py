@@ -0,0 +1,344 @@
+"""번역 기록 저장소 (SQLite)
+
+st.session_state 리스트 대신 파일 DB에 사용자별 기록을 저장한다.
+- 인덱스: (user_id, 시각), (user_id, 타깃/원본 언어, 시각), (user_id, 스타일, 시각)
+- 전문 검색: FTS5 가상 테이블(input/output). 한국어 부분 일치를 위해 trigram 토크나이저를 우선 사용
+- 페이지 조회: LIMIT/OFFSET 또는 (created_at, id) 키셋 커서
+
+- 학습 카드: 기록 한 건당 구조화 학습 분석(JSON) 한 개를 learning_cards 테이블에 저장 (기록 삭제 시 함께 삭제)
+
+레코드는 기존 세션 항목과 같은 키(timestamp, source_lang, target_lang, input, output, style)에
+id/created_at/model(결과를 만든 LLM 모델)이 추가된 dict로 반환된다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_DB_PATH = os.path.join("data", "konnect.sqlite3")
+
+_COLUMNS = ("id", "created_at", "timestamp", "source_lang", "target_lang", "input", "output", "style", "model")
+
+Cursor = Tuple[float, int]
+
+
+class HistoryRepository:
+    """사용자별 번역 기록 저장소.
+
+    Args:
+        path: SQLite 파일 경로 (":memory:" 가능)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Streamlit 세션 스레드 간 공유: 스레드 검사 해제 후 락으로 직렬화
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    input TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    style TEXT,
+                    model TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_history_user_time ON history(user_id, created_at DESC, id DESC);
+                CREATE INDEX IF NOT EXISTS idx_history_user_pair ON history(user_id, target_lang, source_lang, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_history_user_style ON history(user_id, style, created_at DESC);
+                CREATE TABLE IF NOT EXISTS learning_cards (
+                    record_id INTEGER PRIMARY KEY,
+                    card TEXT NOT NULL,
+                    model TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE TRIGGER IF NOT EXISTS history_learning_ad AFTER DELETE ON history BEGIN
+                    DELETE FROM learning_cards WHERE record_id = old.id;
+                END;
+                """
+            )
+            # 마이그레이션: model 열이 없던 기존 DB에 추가
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(history)")}
+            if "model" not in columns:
+                self._conn.execute("ALTER TABLE history ADD COLUMN model TEXT")
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'"
+            ).fetchone()
+            if not exists:
+                self._create_fts()
+            (fts_sql,) = self._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'"
+            ).fetchone()
+            self._trigram = "trigram" in fts_sql
+            self._conn.commit()
+
+    def _create_fts(self) -> None:
+        # trigram(SQLite 3.34+)은 공백 없는 한국어 부분 문자열 검색 가능, 없으면 unicode61로 대체
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE history_fts USING fts5("
+                "input, output, content='history', content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE history_fts USING fts5("
+                "input, output, content='history', content_rowid='id')"
+            )
+        self._conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+                INSERT INTO history_fts(rowid, input, output) VALUES (new.id, new.input, new.output);
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+                INSERT INTO history_fts(history_fts, rowid, input, output) VALUES ('delete', old.id, old.input, old.output);
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_au AFTER UPDATE ON history BEGIN
+                INSERT INTO history_fts(history_fts, rowid, input, output) VALUES ('delete', old.id, old.input, old.output);
+                INSERT INTO history_fts(rowid, input, output) VALUES (new.id, new.input, new.output);
+            END;
+            """
+        )
+        self._conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+
+    # -------------------- 쓰기 --------------------
+    def add(self, user_id: str, entry: Dict[str, Any]) -> int:
+        """기록 한 건 저장 후 id 반환. entry 키: source_lang, target_lang, input, output, style/model(선택)."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO history (user_id, created_at, timestamp, source_lang, target_lang, input, output, style, model) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    now,
+                    entry.get("timestamp") or datetime.fromtimestamp(now).strftime("%Y-%m-%d"),
+                    entry["source_lang"],
+                    entry["target_lang"],
+                    entry["input"],
+                    entry["output"],
+                    entry.get("style"),
+                    entry.get("model"),
+                ),
+            )
+            self._conn.commit()
+            return cur.lastrowid
+
+    def delete(self, user_id: str, record_id: int) -> None:
+        self.delete_many(user_id, [record_id])
+
+    def delete_many(self, user_id: str, record_ids: Iterable[int]) -> int:
+        """여러 기록 삭제. 삭제된 건수 반환."""
+        ids = list(record_ids)
+        if not ids:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(
+                f"DELETE FROM history WHERE user_id = ? AND id IN ({','.join('?' * len(ids))})",
+                (user_id, *ids),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def clear(self, user_id: str) -> List[int]:
+        """사용자의 모든 기록 삭제. 삭제한 기록 id 목록 반환 (번역 메모리 정리용)."""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM history WHERE user_id = ?", (user_id,))]
+            self._conn.execute("DELETE FROM history WHERE user_id = ?", (user_id,))
+            self._conn.commit()
+        return ids
+
+    # -------------------- 읽기 --------------------
+    def _where(
+        self,
+        user_id: str,
+        target_langs: Sequence[str] | None,
+        styles: Sequence[str] | None,
+        query: str | None,
+        source_langs: Sequence[str] | None = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses = ["h.user_id = ?"]
+        params: List[Any] = [user_id]
+        if target_langs:
+            clauses.append(f"h.target_lang IN ({','.join('?' * len(target_langs))})")
+            params.extend(target_langs)
+        if source_langs:
+            clauses.append(f"h.source_lang IN ({','.join('?' * len(source_langs))})")
+            params.extend(source_langs)
+        if styles:
+            clauses.append(f"h.style IN ({','.join('?' * len(styles))})")
+            params.extend(styles)
+        query = (query or "").strip()
+        if self._trigram and len(query) < 3:
+            # trigram 색인은 3글자 미만 검색어를 찾지 못하므로 LIKE로 대체 (필터 결과 범위 안에서만 스캔)
+            if query:
+                pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                clauses.append("(h.input LIKE ? ESCAPE '\\' OR h.output LIKE ? ESCAPE '\\')")
+                params.extend([pattern, pattern])
+        elif query:
+            # 사용자 입력을 FTS 구문으로 해석하지 않도록 구절(phrase)로 감싼다
+            clauses.append("h.id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)")
+            params.append('"' + query.replace('"', '""') + '"')
+        return " AND ".join(clauses), params
+
+    def count(
+        self,
+        user_id: str,
+        target_langs: Sequence[str] | None = None,
+        styles: Sequence[str] | None = None,
+        query: str | None = None,
+        source_langs: Sequence[str] | None = None,
+    ) -> int:
+        where, params = self._where(user_id, target_langs, styles, query, source_langs)
+        with self._lock:
+            (count,) = self._conn.execute(f"SELECT COUNT(*) FROM history h WHERE {where}", params).fetchone()
+        return count
+
+    def list(
+        self,
+        user_id: str,
+        target_langs: Sequence[str] | None = None,
+        styles: Sequence[str] | None = None,
+        query: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[Cursor] = None,
+        source_langs: Sequence[str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """최신순 기록 조회.
+
+        cursor((created_at, id))를 주면 그 항목 다음부터 키셋 방식으로, 아니면 offset 방식으로 가져온다.
+        """
+        where, params = self._where(user_id, target_langs, styles, query, source_langs)
+        if cursor is not None:
+            where += " AND (h.created_at < ? OR (h.created_at = ? AND h.id < ?))"
+            params.extend([cursor[0], cursor[0], cursor[1]])
+            offset = 0
+        sql = (
+            f"SELECT {', '.join('h.' + c for c in _COLUMNS)} FROM history h WHERE {where} "
+            "ORDER BY h.created_at DESC, h.id DESC LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, user_id: str, record_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM history WHERE user_id = ? AND id = ?", (user_id, record_id)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_many(self, user_id: str, record_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """여러 기록을 최신순으로 조회 (일괄 내보내기용)."""
+        ids = list(record_ids)
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM history WHERE user_id = ? AND id IN ({','.join('?' * len(ids))}) "
+                "ORDER BY created_at DESC, id DESC",
+                (user_id, *ids),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def iter_since(self, last_id: int, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """id가 last_id보다 큰 모든 사용자의 기록을 id 오름차순으로 순회 (번역 메모리 반영용)."""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM history WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_id = rows[-1]["id"]
+
+    # -------------------- 학습 카드 --------------------
+    def get_learning_card(self, user_id: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """기록의 학습 카드(dict) 조회. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT c.card FROM learning_cards c JOIN history h ON h.id = c.record_id "
+                "WHERE h.user_id = ? AND h.id = ?",
+                (user_id, record_id),
+            ).fetchone()
+        return json.loads(row["card"]) if row else None
+
+    def set_learning_card(self, user_id: str, record_id: int, card: Dict[str, Any], model: str | None = None) -> None:
+        """기록의 학습 카드 저장 (사용자의 기록일 때만, 기존 카드는 교체)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO learning_cards (record_id, card, model, created_at) "
+                "SELECT id, ?, ?, ? FROM history WHERE user_id = ? AND id = ?",
+                (json.dumps(card, ensure_ascii=False), model, time.time(), user_id, record_id),
+            )
+            self._conn.commit()
+
+    def count_without_learning_card(
+        self, user_id: str, source_langs: Sequence[str] | None = None, target_langs: Sequence[str] | None = None,
+    ) -> int:
+        where, params = self._where(user_id, target_langs, None, None, source_langs)
+        with self._lock:
+            (count,) = self._conn.execute(
+                f"SELECT COUNT(*) FROM history h WHERE {where} "
+                "AND NOT EXISTS (SELECT 1 FROM learning_cards c WHERE c.record_id = h.id)",
+                params,
+            ).fetchone()
+        return count
+
+    def list_without_learning_card(
+        self,
+        user_id: str,
+        source_langs: Sequence[str] | None = None,
+        target_langs: Sequence[str] | None = None,
+        limit: int = -1,
+    ) -> List[Dict[str, Any]]:
+        """학습 카드가 없는 기록을 최신순으로 조회 (limit=-1이면 전체)."""
+        where, params = self._where(user_id, target_langs, None, None, source_langs)
+        sql = (
+            f"SELECT {', '.join('h.' + c for c in _COLUMNS)} FROM history h "
+            f"WHERE {where} AND NOT EXISTS (SELECT 1 FROM learning_cards c WHERE c.record_id = h.id) "
+            "ORDER BY h.created_at DESC, h.id DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def cursor_of(record: Dict[str, Any]) -> Cursor:
+        """다음 페이지 조회용 키셋 커서."""
+        return record["created_at"], record["id"]
+
+
+_repository: Optional[HistoryRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_history_repository() -> HistoryRepository:
+    """프로세스 전역 기록 저장소 싱글턴 (경로: KONNECT_DB_PATH, 기본 data/konnect.sqlite3)."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = HistoryRepository(os.getenv("KONNECT_DB_PATH", DEFAULT_DB_PATH))
+    return _repository
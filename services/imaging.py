@@ -0,0 +1,220 @@
+"""OCR 전 이미지 전처리
+
+업로드 원본(수 MB의 휴대폰 사진)을 그대로 base64로 보내지 않고,
+비전 모델이 실제로 보는 해상도에 맞춰 줄인 뒤 목표 용량 이하로 재인코딩한다.
+
+단계: EXIF 회전 보정 → 축소 → (선택) 흑백/대비 정규화 → JPEG/WebP 재인코딩
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+try:
+    from PIL import Image, ImageOps, ImageSequence
+except Exception:
+    Image = None
+    ImageOps = None
+    ImageSequence = None
+
+try:
+    import pypdfium2 as pdfium
+except Exception:
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# OpenAI 비전 모델(detail=high)은 2048x2048 안에 맞춘 뒤 짧은 변을 768px로 줄여 처리한다.
+VISION_MAX_SIDE = 2048
+VISION_SHORT_SIDE = 768
+_QUALITY_STEPS = (85, 75, 65, 55, 45)
+
+
+@dataclass
+class PreprocessedImage:
+    """전처리 결과와 절감 통계."""
+
+    data: bytes
+    mime: str
+    width: int
+    height: int
+    original_bytes: int
+    elapsed: float
+
+    @property
+    def processed_bytes(self) -> int:
+        return len(self.data)
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.processed_bytes
+
+    @property
+    def data_uri(self) -> str:
+        import base64
+
+        return f"data:{self.mime};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+
+def _target_size(width: int, height: int, max_side: int, short_side: int) -> tuple[int, int]:
+    scale = min(1.0, max_side / max(width, height), short_side / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _encode(img: "Image.Image", fmt: str, target_bytes: int) -> bytes:
+    """품질을 낮춰 가며 target_bytes 이하가 되는 첫 결과를 반환 (끝까지 넘으면 최저 품질 결과)."""
+    data = b""
+    for quality in _QUALITY_STEPS:
+        buf = io.BytesIO()
+        img.save(buf, format=fmt, quality=quality, optimize=True)
+        data = buf.getvalue()
+        if len(data) <= target_bytes:
+            break
+    return data
+
+
+def preprocess_image(
+    raw: bytes,
+    max_side: int | None = None,
+    short_side: int | None = None,
+    grayscale: bool | None = None,
+    target_bytes: int | None = None,
+    fmt: str | None = None,
+) -> PreprocessedImage:
+    """OCR용으로 이미지를 정규화하고 재인코딩합니다.
+
+    Args:
+        raw: 원본 이미지 바이트
+        max_side / short_side: 축소 기준 (기본: OCR_MAX_SIDE=2048, OCR_SHORT_SIDE=768)
+        grayscale: 흑백+자동 대비 적용 여부 (기본: OCR_GRAYSCALE=1)
+        target_bytes: 재인코딩 목표 용량 (기본: OCR_TARGET_BYTES=400000)
+        fmt: "jpeg" 또는 "webp" (기본: OCR_IMAGE_FORMAT=jpeg)
+    Returns:
+        PreprocessedImage (재인코딩 결과가 원본보다 크면 원본을 그대로 담는다)
+    Raises:
+        RuntimeError: Pillow가 없거나 이미지를 열 수 없는 경우
+    """
+    if Image is None:
+        raise RuntimeError("이미지 처리를 위해 Pillow가 필요합니다. 'pip install Pillow'로 설치하세요.")
+
+    max_side = max_side or int(os.getenv("OCR_MAX_SIDE", str(VISION_MAX_SIDE)))
+    short_side = short_side or int(os.getenv("OCR_SHORT_SIDE", str(VISION_SHORT_SIDE)))
+    if grayscale is None:
+        grayscale = os.getenv("OCR_GRAYSCALE", "1") == "1"
+    target_bytes = target_bytes or int(os.getenv("OCR_TARGET_BYTES", "400000"))
+    fmt = (fmt or os.getenv("OCR_IMAGE_FORMAT", "jpeg")).lower()
+    pil_format = "WEBP" if fmt == "webp" else "JPEG"
+
+    started = time.perf_counter()
+    try:
+        img = Image.open(io.BytesIO(raw))
+        original_format = (img.format or "png").lower()
+        # 휴대폰 사진의 EXIF 회전 정보를 픽셀에 반영
+        img = ImageOps.exif_transpose(img)
+    except Exception as e:
+        raise RuntimeError(f"OCR을 위해 이미지를 열지 못했습니다: {e}")
+
+    size = _target_size(img.width, img.height, max_side, short_side)
+    if size != img.size:
+        img = img.resize(size, Image.LANCZOS)
+
+    if grayscale:
+        img = ImageOps.autocontrast(ImageOps.grayscale(img), cutoff=1)
+    elif img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    data = _encode(img, pil_format, target_bytes)
+    mime = f"image/{fmt}"
+    if len(data) >= len(raw):
+        data, mime = raw, f"image/{original_format}"
+
+    result = PreprocessedImage(
+        data=data,
+        mime=mime,
+        width=img.width,
+        height=img.height,
+        original_bytes=len(raw),
+        elapsed=time.perf_counter() - started,
+    )
+    logger.info(
+        "image preprocess: %d -> %d bytes (saved %.0f%%), %dx%d, %.3fs",
+        result.original_bytes,
+        result.processed_bytes,
+        100.0 * result.saved_bytes / max(result.original_bytes, 1),
+        result.width,
+        result.height,
+        result.elapsed,
+    )
+    return result
+
+
+def split_pages(raw: bytes, pdf_scale: float | None = None) -> List[bytes]:
+    """여러 페이지 문서를 페이지별 이미지 바이트 목록으로 나눕니다.
+
+    - PDF: 각 페이지를 PNG로 렌더링 (pypdfium2 필요, 배율 PDF_RENDER_SCALE=2.0 ≒ 144dpi)
+    - 다중 프레임 TIFF 등: 프레임별 PNG
+    - 그 외 단일 이미지: 원본 바이트 그대로 (1개짜리 목록)
+    Raises:
+        RuntimeError: PDF인데 pypdfium2가 없거나 이미지를 열 수 없는 경우
+    """
+    if raw[:5] == b"%PDF-":
+        if pdfium is None:
+            raise RuntimeError("PDF OCR을 위해 pypdfium2가 필요합니다. 'pip install pypdfium2'로 설치하세요.")
+        scale = pdf_scale or float(os.getenv("PDF_RENDER_SCALE", "2.0"))
+        pages: List[bytes] = []
+        pdf = pdfium.PdfDocument(raw)
+        try:
+            for page in pdf:
+                buf = io.BytesIO()
+                page.render(scale=scale).to_pil().save(buf, format="PNG")
+                pages.append(buf.getvalue())
+        finally:
+            pdf.close()
+        return pages
+
+    if Image is None:
+        raise RuntimeError("이미지 처리를 위해 Pillow가 필요합니다. 'pip install Pillow'로 설치하세요.")
+    try:
+        img = Image.open(io.BytesIO(raw))
+        if getattr(img, "n_frames", 1) <= 1:
+            return [raw]
+        pages = []
+        for frame in ImageSequence.Iterator(img):
+            buf = io.BytesIO()
+            frame.convert("RGB").save(buf, format="PNG")
+            pages.append(buf.getvalue())
+        return pages
+    except Exception as e:
+        raise RuntimeError(f"OCR을 위해 이미지를 열지 못했습니다: {e}")
+
+
+def image_fingerprint(raw: bytes) -> Tuple[str, int, str]:
+    """OCR 캐시용 이미지 지문 (내용 해시, 지각 해시, 크기 "WxH")을 계산합니다.
+
+    - 내용 해시: EXIF 회전 보정 후 RGB 픽셀 데이터의 SHA-256 (파일 포맷/메타데이터가 달라도 같은 그림이면 같음)
+    - 지각 해시: 9x8 흑백 축소본의 가로 밝기 차이로 만든 64bit dHash (재촬영한 유사 이미지는 해밍 거리가 작음)
+      같은 양식의 다른 문서도 거리가 작을 수 있으므로 캐시는 크기가 같은 이미지끼리만 비교한다.
+    """
+    if Image is None:
+        raise RuntimeError("이미지 처리를 위해 Pillow가 필요합니다. 'pip install Pillow'로 설치하세요.")
+    try:
+        img = ImageOps.exif_transpose(Image.open(io.BytesIO(raw))).convert("RGB")
+    except Exception as e:
+        raise RuntimeError(f"OCR을 위해 이미지를 열지 못했습니다: {e}")
+
+    digest = hashlib.sha256(f"{img.width}x{img.height}:".encode("ascii"))
+    digest.update(img.tobytes())
+
+    small = ImageOps.grayscale(img).resize((9, 8), Image.LANCZOS)
+    pixels = list(small.getdata())
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            dhash = (dhash << 1) | (left > right)
+    return digest.hexdigest(), dhash, f"{img.width}x{img.height}"
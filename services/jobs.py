@@ -0,0 +1,254 @@
+"""백그라운드 작업 큐 (스레드 풀 + SQLite 상태 저장)
+
+OCR/긴 문서 번역처럼 오래 걸리는 작업을 Streamlit 스크립트 스레드 밖에서 실행한다.
+- submit(): 작업을 등록하고 즉시 작업 id를 반환. 화면을 떠나도 작업은 계속되고 결과는 DB에 남는다.
+- 작업 함수는 JobContext로 진행률을 보고하고(progress), 그때마다 취소 요청을 확인한다.
+- 상태: queued → running → done / failed / cancelled
+- 작업마다 실행 프로세스(owner)를 기록하고, 프로세스는 실행 중인 자기 작업의 heartbeat_at을 주기적으로 갱신한다.
+  같은 DB를 여러 프로세스(Streamlit/복제본)가 공유하므로, heartbeat가 JOB_HEARTBEAT_TIMEOUT초 넘게 끊긴 남의 작업만
+  failed(중단됨)로 표시한다 (시작 시 + 주기적으로). 작업 함수는 저장하지 않으므로 재개하지 않는다.
+LLM/OCR 호출은 대부분 네트워크 대기라 프로세스 풀 대신 스레드 풀을 쓴다.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from services.history import DEFAULT_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+# 실행 중인 작업의 생존 신호 갱신 주기 / 이 시간보다 오래 갱신이 없으면 중단된 작업으로 본다
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_HEARTBEAT_TIMEOUT = float(os.getenv("JOB_HEARTBEAT_TIMEOUT", "60"))
+
+_COLUMNS = ("id", "user_id", "kind", "title", "status", "progress", "message", "result", "error", "created_at", "updated_at")
+
+
+class JobCancelled(Exception):
+    """취소 요청된 작업에서 JobContext.progress()/check()가 던지는 예외."""
+
+
+class JobContext:
+    """작업 함수에 전달되는 진행률 보고/취소 확인 핸들."""
+
+    def __init__(self, queue: "JobQueue", job_id: str):
+        self._queue = queue
+        self.job_id = job_id
+
+    @property
+    def cancelled(self) -> bool:
+        return self._queue._is_cancel_requested(self.job_id)
+
+    def check(self) -> None:
+        """취소 요청이 있으면 JobCancelled."""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, fraction: float, message: str = "") -> None:
+        """진행률(0~1)과 안내 문구를 기록하고 취소 요청을 확인."""
+        self.check()
+        self._queue._update(self.job_id, progress=max(0.0, min(1.0, fraction)), message=message)
+
+
+class JobQueue:
+    """SQLite에 상태를 저장하는 작업 큐.
+
+    Args:
+        path: SQLite 파일 경로 (":memory:" 가능, 기록 DB와 같은 파일 사용)
+        max_workers: 동시에 실행할 작업 수
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, max_workers: int = 2):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._cancel_requested: set[str] = set()
+        # 이 큐 인스턴스의 작업 표시 (호스트:pid:토큰 - 재시작하면 새 토큰)
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._init_schema()
+        threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True).start()
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT NOT NULL DEFAULT '',
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_user_time ON jobs(user_id, created_at DESC);
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            if "heartbeat_at" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            self._conn.commit()
+        self._fail_stale()
+
+    def _fail_stale(self) -> None:
+        """heartbeat가 끊긴 다른 프로세스의 미완료 작업을 중단 처리 (실행 중인 다른 프로세스의 작업은 건드리지 않음)."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = '서버 재시작으로 중단되었습니다.', updated_at = ? "
+                "WHERE status IN ('queued', 'running') AND COALESCE(owner, '') != ? "
+                "AND COALESCE(heartbeat_at, updated_at) < ?",
+                (now, self._owner, now - JOB_HEARTBEAT_TIMEOUT),
+            )
+            self._conn.commit()
+        if cur.rowcount:
+            logger.warning("marked %d stale jobs as failed", cur.rowcount)
+
+    def _heartbeat_loop(self) -> None:
+        while True:
+            time.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                with self._lock:
+                    self._conn.execute(
+                        "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                        (time.time(), self._owner),
+                    )
+                    self._conn.commit()
+                self._fail_stale()
+            except sqlite3.Error as e:
+                logger.warning("job heartbeat failed: %s", e)
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def _is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancel_requested
+
+    # -------------------- 등록/취소 --------------------
+    def submit(self, user_id: str, kind: str, title: str, fn: Callable[[JobContext], Any]) -> str:
+        """작업을 등록하고 id를 반환. fn(ctx)의 반환값(JSON 직렬화 가능)이 결과로 저장된다."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, user_id, kind, title, status, created_at, updated_at, owner, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, user_id, kind, title, now, now, self._owner, now),
+            )
+            self._conn.commit()
+            self._futures[job_id] = self._pool.submit(self._run, job_id, fn)
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[[JobContext], Any]) -> None:
+        ctx = JobContext(self, job_id)
+        started = time.perf_counter()
+        try:
+            ctx.check()
+            self._update(job_id, status="running")
+            result = fn(ctx)
+        except JobCancelled:
+            self._update(job_id, status="cancelled", message="취소됨")
+        except Exception as e:
+            logger.exception("job %s failed", job_id)
+            self._update(job_id, status="failed", error=str(e) or type(e).__name__)
+        else:
+            self._update(job_id, status="done", progress=1.0, result=json.dumps(result, ensure_ascii=False))
+            logger.info("job %s done in %.3fs", job_id, time.perf_counter() - started)
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+                self._cancel_requested.discard(job_id)
+
+    def cancel(self, job_id: str) -> None:
+        """취소 요청. 대기 중이면 바로 취소되고, 실행 중이면 다음 진행률 보고 시점에 멈춘다."""
+        with self._lock:
+            future = self._futures.get(job_id)
+            if future is None:
+                return
+            self._cancel_requested.add(job_id)
+        if future.cancel():
+            self._update(job_id, status="cancelled", message="취소됨")
+            with self._lock:
+                self._futures.pop(job_id, None)
+                self._cancel_requested.discard(job_id)
+        else:
+            self._update(job_id, message="취소 중...")
+
+    # -------------------- 조회 --------------------
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = {name: row[name] for name in _COLUMNS}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, user_id: str, limit: int = 10, kinds: Sequence[str] | None = None) -> List[Dict[str, Any]]:
+        """사용자의 최근 작업 (최신순, kinds를 주면 해당 종류만)."""
+        where = "user_id = ?"
+        params: List[Any] = [user_id]
+        if kinds:
+            where += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE {where} ORDER BY created_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def delete(self, user_id: str, job_id: str) -> None:
+        """끝난 작업 기록 삭제 (진행 중인 작업은 남긴다)."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE id = ? AND user_id = ? AND status NOT IN ('queued', 'running')",
+                (job_id, user_id),
+            )
+            self._conn.commit()
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """프로세스 전역 작업 큐 (KONNECT_DB_PATH, JOB_MAX_WORKERS=2)."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(
+                    os.getenv("KONNECT_DB_PATH", DEFAULT_DB_PATH),
+                    max_workers=int(os.getenv("JOB_MAX_WORKERS", "2")),
+                )
+    return _queue
@@ -1,18 +1,224 @@
-from typing import Dict, List, Optional
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional, Tuple
 import os
-import base64
-from openai import OpenAI
-from openai import BadRequestError
+import asyncio
+import logging
+import time
+import threading
+import concurrent.futures
+import json
+from openai import OpenAI, AsyncOpenAI
+from openai import APIStatusError, BadRequestError, RateLimitError
 
-_client: Optional[OpenAI] = None
+from services import telemetry, tokens
+from services.cache import get_response_cache, make_key
+from services.clients import get_async_openai_client, get_openai_client
+from services.resilience import RETRYABLE_ERRORS, backoff_delay, get_circuit_breaker, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+
+# 단일 비행(single-flight): 같은 요청 키로 진행 중인 호출을 프로세스 전체에서 공유
+_inflight: Dict[str, "concurrent.futures.Future[str]"] = {}
+_inflight_lock = threading.Lock()
+_coalesce_counters = {"leaders": 0, "coalesced": 0, "abandoned": 0}
+
+
+class _Abandoned(Exception):
+    """선행 스트리밍 호출이 끝까지 소비되지 않아 결과가 없음 (대기자는 직접 호출)."""
 
 
 def get_client() -> OpenAI:
-    """OpenAI 클라이언트 싱글턴 반환."""
-    global _client
-    if _client is None:
-        _client = OpenAI()
-    return _client
+    """공유 OpenAI 클라이언트(services.clients) 반환. 재시도는 SDK 대신 _guarded()가 속도 제한/서킷 브레이커와 함께 담당."""
+    return get_openai_client()
+
+
+def resolve_model(model: str | None = None) -> str:
+    """모델명이 없으면 OPENAI_CHAT_MODEL 환경변수(기본 gpt-4o-mini)를 사용."""
+    return model or os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+
+
+ROUTED_TASKS = ("translate", "style", "diff", "meaning", "examples", "learning", "ocr")
+_TASK_DEFAULTS = {"ocr": "gpt-4o-mini"}
+
+
+def route_model(task: str, length: int = 0) -> str:
+    """작업 종류와 입력 길이로 모델을 고른다.
+
+    입력 길이 구간: LLM_ROUTE_SHORT_CHARS(기본 200) 이하 SHORT, LLM_ROUTE_LONG_CHARS(기본 3000) 이상 LONG.
+    다음 환경변수 중 먼저 설정된 값을 사용한다 (TASK/TIER는 대문자):
+        OPENAI_MODEL_{TASK}_{TIER} → OPENAI_MODEL_{TASK} → OPENAI_MODEL_{TIER} → 작업 기본값(ocr: gpt-4o-mini) → resolve_model()
+    예) OPENAI_MODEL_SHORT=gpt-4.1-nano, OPENAI_MODEL_TRANSLATE_LONG=gpt-4.1
+    Raises:
+        ValueError: ROUTED_TASKS에 없는 작업
+    """
+    if task not in ROUTED_TASKS:
+        raise ValueError(f"지원하지 않는 작업: {task}. 지원 작업: {list(ROUTED_TASKS)}")
+    tier = None
+    if length and length <= int(os.getenv("LLM_ROUTE_SHORT_CHARS", "200")):
+        tier = "SHORT"
+    elif length >= int(os.getenv("LLM_ROUTE_LONG_CHARS", "3000")):
+        tier = "LONG"
+    names = [f"OPENAI_MODEL_{task.upper()}"]
+    if tier:
+        names = [f"OPENAI_MODEL_{task.upper()}_{tier}", names[0], f"OPENAI_MODEL_{tier}"]
+    for name in names:
+        value = os.getenv(name)
+        if value:
+            return value
+    return _TASK_DEFAULTS.get(task) or resolve_model(None)
+
+
+def _coalescing_enabled() -> bool:
+    return os.getenv("LLM_COALESCE_ENABLED", "1") == "1"
+
+
+def _claim(key: str) -> Tuple["concurrent.futures.Future[str]", bool]:
+    """요청 키의 진행 중 Future를 반환. 없으면 새로 등록하고 (Future, True: 직접 호출 담당)를 반환."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            _coalesce_counters["coalesced"] += 1
+            return future, False
+        future = concurrent.futures.Future()
+        _inflight[key] = future
+        _coalesce_counters["leaders"] += 1
+        return future, True
+
+
+def _release(key: str, future: "concurrent.futures.Future[str]") -> None:
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def _single_flight(key: str, fn: Callable[[], str]) -> str:
+    """같은 key의 동시 호출을 하나로 합친다. 선행 호출의 결과(또는 예외)를 모든 대기자가 공유."""
+    if not _coalescing_enabled():
+        return fn()
+    while True:
+        future, leader = _claim(key)
+        telemetry.annotate(cache="miss" if leader else "coalesced")
+        if not leader:
+            try:
+                return future.result()
+            except _Abandoned:
+                continue
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            _release(key, future)
+
+
+def coalesce_stats() -> Dict[str, int]:
+    """요청 병합 통계: 실제 호출 수(leaders), 병합되어 생략된 호출 수(coalesced), 현재 진행 중 키 수."""
+    with _inflight_lock:
+        stats = dict(_coalesce_counters)
+        stats["inflight"] = len(_inflight)
+    total = stats["leaders"] + stats["coalesced"]
+    stats["coalesce_rate"] = stats["coalesced"] / total if total else 0.0
+    return stats
+
+
+def _request_tokens(messages: List[Dict[str, str]]) -> int:
+    """TPM 예약용 토큰 추정치: 프롬프트 + 비슷한 길이의 응답."""
+    return 2 * sum(tokens.estimate_tokens(m["content"]) for m in messages)
+
+
+def _max_retries() -> int:
+    return int(os.getenv("LLM_MAX_RETRIES", "5"))
+
+
+def _on_error(error: Exception, attempt: int) -> float:
+    """재시도 가능한 오류 처리 후 대기 시간 반환. 429는 속도 제한기를 멈추고 시험 호출을 풀며, 그 외는 서킷 브레이커 실패로 센다."""
+    delay = backoff_delay(error, attempt)
+    telemetry.annotate(last_error=type(error).__name__)
+    span = telemetry.current()
+    if span is not None:
+        span.incr("retries")
+    if isinstance(error, RateLimitError):
+        # 429는 장애가 아니므로 실패로 세지 않되, 시험 호출이었다면 다음 호출이 다시 시험할 수 있게 풀어 준다
+        get_rate_limiter().penalize(delay)
+        get_circuit_breaker().abort()
+    else:
+        get_circuit_breaker().record_failure()
+    logger.warning("llm call failed (%s), retry %d/%d in %.1fs", type(error).__name__, attempt + 1, _max_retries(), delay)
+    return delay
+
+
+def _settle(resp: Any, tokens: int) -> None:
+    """성공 처리: 브레이커 닫기, 실제 사용량(resp.usage)을 현재 span에 기록하고 TPM 예약 보정."""
+    get_circuit_breaker().record_success()
+    usage = getattr(resp, "usage", None)
+    telemetry.annotate_usage(usage)
+    if usage is not None and getattr(usage, "total_tokens", None):
+        get_rate_limiter().adjust(usage.total_tokens - tokens)
+
+
+def _guarded(create: Callable[[], Any], tokens: int) -> Any:
+    """API 호출 한 건을 서킷 브레이커 → 속도 제한 → 재시도(지터 지수 백오프, Retry-After 우선)로 감싼다."""
+    breaker = get_circuit_breaker()
+    max_retries = _max_retries()
+    for attempt in range(max_retries + 1):
+        breaker.before_call()
+        wait = get_rate_limiter().reserve(tokens)
+        if wait > 0:
+            telemetry.annotate(rate_limit_wait_s=wait)
+            time.sleep(wait)
+        try:
+            resp = create()
+        except RETRYABLE_ERRORS as e:
+            delay = _on_error(e, attempt)
+            if attempt == max_retries:
+                raise
+            time.sleep(delay)
+        except APIStatusError:
+            # 4xx: API는 응답하고 있으므로 장애로 보지 않음
+            breaker.record_success()
+            raise
+        except BaseException:
+            breaker.abort()
+            raise
+        else:
+            _settle(resp, tokens)
+            return resp
+    raise AssertionError("unreachable")
+
+
+async def _aguarded(create: Callable[[], Coroutine[Any, Any, Any]], tokens: int) -> Any:
+    """_guarded()의 asyncio 버전 (대기는 asyncio.sleep)."""
+    breaker = get_circuit_breaker()
+    max_retries = _max_retries()
+    for attempt in range(max_retries + 1):
+        breaker.before_call()
+        wait = get_rate_limiter().reserve(tokens)
+        if wait > 0:
+            telemetry.annotate(rate_limit_wait_s=wait)
+            await asyncio.sleep(wait)
+        try:
+            resp = await create()
+        except RETRYABLE_ERRORS as e:
+            delay = _on_error(e, attempt)
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(delay)
+        except APIStatusError:
+            breaker.record_success()
+            raise
+        except BaseException:
+            breaker.abort()
+            raise
+        else:
+            _settle(resp, tokens)
+            return resp
+    raise AssertionError("unreachable")
 
 
 def chat(messages: List[Dict[str, str]], model: str | None = None, temperature: float = 0.7) -> str:
@@ -20,26 +226,341 @@ def chat(messages: List[Dict[str, str]], model: str | None = None, temperature:
 
     일부 경량 모델은 temperature 파라미터 미지원(400 unsupported_value) 오류를 발생시킬 수 있으므로
     1차 시도 실패 시 temperature 제거 후 재시도한다.
+    (model, temperature, messages)가 같은 요청은 응답 캐시(services.cache)에서 즉시 반환하고,
+    같은 요청이 이미 진행 중이면 새로 호출하지 않고 그 결과를 기다린다 (LLM_COALESCE_ENABLED=0이면 비활성).
     """
-    if model is None:
-        model = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+    model = resolve_model(model)
+
+    with telemetry.span("llm.chat", kind="llm", model=model, **tokens.prompt_breakdown(messages, model)):
+        cache = get_response_cache()
+        cache_key = make_key(model, temperature, messages)
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                telemetry.annotate(cache="hit")
+                return cached
+
+        def call() -> str:
+            content = _create_completion(messages, model, temperature)
+            if cache is not None:
+                cache.set(cache_key, content)
+            return content
+
+        return _single_flight(cache_key, call)
+
+
+def chat_json(
+    messages: List[Dict[str, str]],
+    schema: Dict[str, Any],
+    name: str,
+    model: str | None = None,
+    temperature: float = 0.3,
+) -> Dict[str, Any]:
+    """구조화 출력(JSON Schema, strict) 호출. 스키마에 맞는 JSON 객체를 dict로 반환.
+
+    응답 캐시/요청 병합은 chat()과 같고 캐시 키에 스키마가 포함된다. 올바른 JSON 객체인 응답만 캐시한다.
+    Raises:
+        RuntimeError: 응답이 JSON 객체가 아님
+    """
+    model = resolve_model(model)
+    response_format = {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+    with telemetry.span("llm.chat_json", kind="llm", model=model, schema=name, **tokens.prompt_breakdown(messages, model)):
+        cache = get_response_cache()
+        cache_key = make_key(model, temperature, [
+            *messages, {"role": "response_format", "content": json.dumps(response_format, sort_keys=True)},
+        ])
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                telemetry.annotate(cache="hit")
+                return json.loads(cached)
+
+        def call() -> str:
+            content = _create_completion(messages, model, temperature, response_format)
+            _parse_json_object(content)
+            if cache is not None:
+                cache.set(cache_key, content)
+            return content
+
+        return _parse_json_object(_single_flight(cache_key, call))
+
+
+def _parse_json_object(content: str) -> Dict[str, Any]:
+    try:
+        value = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"구조화 응답이 JSON 형식이 아닙니다: {e}") from e
+    if not isinstance(value, dict):
+        raise RuntimeError("구조화 응답이 JSON 객체가 아닙니다.")
+    return value
+
+
+def _create_completion(
+    messages: List[Dict[str, str]], model: str, temperature: float, response_format: Dict[str, Any] | None = None
+) -> str:
+    """캐시를 거치지 않는 실제 API 호출 (속도 제한/재시도/서킷 브레이커 적용)."""
     client = get_client()
+    tokens = _request_tokens(messages)
+    extra = {"response_format": response_format} if response_format else {}
 
     # 1차 시도: 제공된 temperature 사용
     try:
-        resp = client.chat.completions.create(
+        resp = _guarded(lambda: client.chat.completions.create(
             model=model,
             messages=messages,
             temperature=temperature,
-        )
+            **extra,
+        ), tokens)
         return resp.choices[0].message.content.strip()
     except BadRequestError as e:
         msg = str(e).lower()
         # temperature 관련 미지원이면 파라미터 제거 후 재시도
         if 'temperature' in msg and 'unsupported' in msg:
-            resp = client.chat.completions.create(
+            resp = _guarded(lambda: client.chat.completions.create(
                 model=model,
                 messages=messages,
-            )
+                **extra,
+            ), tokens)
             return resp.choices[0].message.content.strip()
-        raise
\ No newline at end of file
+        raise
+
+
+def chat_stream(messages: List[Dict[str, str]], model: str | None = None, temperature: float = 0.7) -> Iterator[str]:
+    """Chat Completions 스트리밍 호출. 생성되는 텍스트 조각(delta)을 순서대로 yield 한다.
+
+    chat()과 동일하게 temperature 미지원 오류 시 파라미터를 제거해 재시도하며,
+    캐시 히트 시에는 저장된 전체 응답을 한 번에 yield 한다. 스트림이 끝까지 소비되면 결과를 캐시에 저장한다.
+    같은 요청이 이미 진행 중이면 그 결과를 기다렸다가 한 번에 yield 한다.
+    """
+    model = resolve_model(model)
+    # 제너레이터는 호출자와 컨텍스트를 공유하므로 span을 활성화하지 않고 명시적으로 넘긴다
+    span = telemetry.start_span("llm.chat_stream", kind="llm", model=model, **tokens.prompt_breakdown(messages, model))
+    error: Optional[BaseException] = None
+    try:
+        yield from _chat_stream(messages, model, temperature, span)
+    except GeneratorExit:
+        span.set(abandoned=True)
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        span.finish(error)
+
+
+def _chat_stream(
+    messages: List[Dict[str, str]], model: str, temperature: float, span: "telemetry.Span"
+) -> Iterator[str]:
+    cache = get_response_cache()
+    cache_key = make_key(model, temperature, messages)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            span.set(cache="hit")
+            yield cached
+            return
+
+    if not _coalescing_enabled():
+        yield from _stream_completion(messages, model, temperature, cache, cache_key, span)
+        return
+    while True:
+        future, leader = _claim(cache_key)
+        span.set(cache="miss" if leader else "coalesced")
+        if leader:
+            break
+        try:
+            yield future.result()
+            return
+        except _Abandoned:
+            continue
+
+    parts: List[str] = []
+    try:
+        for delta in _stream_completion(messages, model, temperature, cache, cache_key, span):
+            parts.append(delta)
+            yield delta
+    except GeneratorExit:
+        # 화면 이동 등으로 스트림이 중간에 닫힘: 대기자는 직접 호출하도록 알림
+        with _inflight_lock:
+            _coalesce_counters["abandoned"] += 1
+        future.set_exception(_Abandoned())
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result("".join(parts).strip())
+    finally:
+        _release(cache_key, future)
+
+
+def _stream_completion(
+    messages: List[Dict[str, str]],
+    model: str,
+    temperature: float,
+    cache: Any,
+    cache_key: str,
+    span: "telemetry.Span",
+) -> Iterator[str]:
+    """캐시/병합을 거치지 않는 실제 스트리밍 호출. 끝까지 소비되면 결과를 캐시에 저장."""
+    client = get_client()
+    tokens = _request_tokens(messages)
+    # 오류는 첫 응답 전에 create() 단계에서 발생하므로 재시도는 스트림 생성 시점에만 적용
+    # include_usage: 마지막 조각(choices 비어 있음)에 토큰 사용량이 담겨 온다
+    with telemetry.activate(span):
+        try:
+            stream = _guarded(lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            ), tokens)
+        except BadRequestError as e:
+            msg = str(e).lower()
+            if 'temperature' in msg and 'unsupported' in msg:
+                stream = _guarded(lambda: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ), tokens)
+            else:
+                raise
+
+    parts: List[str] = []
+    for chunk in stream:
+        if getattr(chunk, "usage", None) is not None:
+            telemetry.annotate_usage(chunk.usage, span)
+            get_rate_limiter().adjust(chunk.usage.total_tokens - tokens)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            if not parts:
+                span.set(ttft_s=span.elapsed())
+            parts.append(delta)
+            yield delta
+
+    if cache is not None:
+        cache.set(cache_key, "".join(parts).strip())
+
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """비동기 클라이언트 전용 이벤트 루프(데몬 스레드) 반환.
+
+    httpx 연결 풀은 생성된 이벤트 루프에 묶이므로, Streamlit 재실행마다 asyncio.run()으로
+    새 루프를 만들면 풀을 재사용할 수 없다. 프로세스당 하나의 루프를 띄워 모든 세션이 공유한다.
+    """
+    global _async_loop
+    if _async_loop is None:
+        with _async_loop_lock:
+            if _async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-async-loop", daemon=True).start()
+                _async_loop = loop
+    return _async_loop
+
+
+def get_async_client() -> AsyncOpenAI:
+    """공유 AsyncOpenAI 클라이언트(services.clients) 반환 (공유 이벤트 루프 안에서만 사용)."""
+    return get_async_openai_client()
+
+
+def submit(coro: Coroutine[Any, Any, Any]) -> "concurrent.futures.Future[Any]":
+    """코루틴을 공유 이벤트 루프에 예약하고 concurrent.futures.Future를 반환한다.
+
+    동기 코드(Streamlit 스크립트 스레드)에서 여러 achat()을 동시에 실행할 때 사용:
+        futures = [submit(achat(m)) for m in batch]
+        for f in concurrent.futures.as_completed(futures): ...
+
+    호출 시점의 현재 span을 코루틴 안에서도 부모 span으로 유지한다.
+    """
+    parent = telemetry.current()
+    if parent is not None:
+        coro = _under_span(coro, parent)
+    return asyncio.run_coroutine_threadsafe(coro, _get_async_loop())
+
+
+async def _under_span(coro: Coroutine[Any, Any, Any], parent: "telemetry.Span") -> Any:
+    with telemetry.activate(parent):
+        return await coro
+
+
+async def achat(messages: List[Dict[str, str]], model: str | None = None, temperature: float = 0.7) -> str:
+    """chat()의 asyncio 버전. 캐시/요청 병합/temperature 재시도 동작은 동일하다.
+
+    어느 이벤트 루프에서 await 하더라도 실제 호출은 공유 루프에서 실행되어 연결 풀을 재사용한다.
+    """
+    loop = _get_async_loop()
+    if asyncio.get_running_loop() is not loop:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(achat(messages, model, temperature), loop))
+
+    model = resolve_model(model)
+    with telemetry.span("llm.achat", kind="llm", model=model, **tokens.prompt_breakdown(messages, model)):
+        return await _achat(messages, model, temperature)
+
+
+async def _achat(messages: List[Dict[str, str]], model: str, temperature: float) -> str:
+    cache = get_response_cache()
+    cache_key = make_key(model, temperature, messages)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            telemetry.annotate(cache="hit")
+            return cached
+
+    if not _coalescing_enabled():
+        return await _acreate_completion(messages, model, temperature, cache, cache_key)
+    while True:
+        future, leader = _claim(cache_key)
+        telemetry.annotate(cache="miss" if leader else "coalesced")
+        if leader:
+            break
+        try:
+            # 동기 chat()이 선행 호출이어도 같은 Future를 공유 (대기자 취소가 공유 Future로 전파되지 않도록 shield)
+            return await asyncio.shield(asyncio.wrap_future(future))
+        except _Abandoned:
+            continue
+    try:
+        content = await _acreate_completion(messages, model, temperature, cache, cache_key)
+    except asyncio.CancelledError:
+        future.set_exception(_Abandoned())
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(content)
+        return content
+    finally:
+        _release(cache_key, future)
+
+
+async def _acreate_completion(
+    messages: List[Dict[str, str]], model: str, temperature: float, cache: Any, cache_key: str
+) -> str:
+    """캐시/병합을 거치지 않는 실제 비동기 호출. 결과를 캐시에 저장."""
+    client = get_async_client()
+    tokens = _request_tokens(messages)
+    try:
+        resp = await _aguarded(lambda: client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+        ), tokens)
+    except BadRequestError as e:
+        msg = str(e).lower()
+        if 'temperature' in msg and 'unsupported' in msg:
+            resp = await _aguarded(lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+            ), tokens)
+        else:
+            raise
+
+    content = resp.choices[0].message.content.strip()
+    if cache is not None:
+        cache.set(cache_key, content)
+    return content
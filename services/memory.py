@@ -0,0 +1,333 @@
+"""번역 메모리 (Translation Memory)
+
+지난 번역 기록을 (원문 → 번역문) 세그먼트로 저장해 두고, LLM 호출 전에 조회한다.
+- 완전 일치: 정규화(공백 축약)한 원문이 입력 전체로 저장된 원문과 같으면 저장된 번역을 즉시 반환
+- 유사 일치: 문자 3-gram 색인으로 후보를 고르고 difflib 유사도로 순위를 매겨 few-shot 예시로 제공
+  원문/번역문의 문장 수가 같을 때 위치로 짝지은 문장쌍도 저장하지만, 번역에서 문장 순서가 바뀌면 짝이
+  어긋날 수 있으므로 완전 일치로는 쓰지 않고 유사 일치 예시로만 쓴다 (whole = 0).
+
+세그먼트는 (원본 언어, 타깃 언어, 스타일 키)별로 구분되며 모든 사용자가 공유한다(교과서 문장 재사용 목적).
+tm_sources에 세그먼트의 현재 번역을 만든 기록 id를 남기고, 기록이 삭제되면 forget()으로 출처가 모두 사라진
+세그먼트를 지운다 (삭제한 번역이 다른 사용자에게 예시로 나가지 않도록).
+"""
+from __future__ import annotations
+
+import difflib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.chunker import split_sentences
+from services.history import DEFAULT_DB_PATH
+from services.tokens import estimate_tokens
+
+FUZZY_MAX_CHARS = 500
+_MAX_GRAMS = 200
+
+
+def normalize(text: str) -> str:
+    """비교용 정규화: 앞뒤 공백 제거, 연속 공백을 하나로."""
+    return " ".join(text.split())
+
+
+def _ngrams(text: str, n: int = 3) -> List[str]:
+    compact = normalize(text).lower()
+    if len(compact) < n:
+        return [compact] if compact else []
+    grams = list(dict.fromkeys(compact[i:i + n] for i in range(len(compact) - n + 1)))
+    return grams[:_MAX_GRAMS]
+
+
+class TranslationMemory:
+    """SQLite 기반 번역 메모리.
+
+    Args:
+        path: SQLite 파일 경로 (기록 저장소와 같은 파일을 써도 된다)
+        fuzzy_threshold: 유사 일치로 인정할 최소 유사도 (0~1)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, fuzzy_threshold: float = 0.75):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.fuzzy_threshold = fuzzy_threshold
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._counters = {"exact_hits": 0, "fuzzy_hits": 0, "misses": 0, "saved_tokens": 0}
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tm_segments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    style TEXT NOT NULL DEFAULT '',
+                    source_norm TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    target_text TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    whole INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_tm_lookup ON tm_segments(source_lang, target_lang, style, source_norm);
+                CREATE TABLE IF NOT EXISTS tm_ngrams (
+                    gram TEXT NOT NULL,
+                    segment_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_tm_ngrams ON tm_ngrams(gram);
+                CREATE INDEX IF NOT EXISTS idx_tm_ngrams_segment ON tm_ngrams(segment_id);
+                CREATE TABLE IF NOT EXISTS tm_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tm_segments)")}
+            if "whole" not in columns:
+                # 이전 버전 파일: 전체/문장 구분이 없으므로 모두 유사 일치 전용으로 둔다
+                self._conn.execute("ALTER TABLE tm_segments ADD COLUMN whole INTEGER NOT NULL DEFAULT 0")
+            has_sources = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tm_sources'"
+            ).fetchone()
+            if not has_sources:
+                # 이전 버전 파일: 세그먼트의 출처 기록을 알 수 없으므로 비우고 기록 저장소에서 다시 반영(sync_from_history)
+                self._conn.executescript(
+                    """
+                    DELETE FROM tm_segments;
+                    DELETE FROM tm_ngrams;
+                    DELETE FROM tm_meta WHERE key = 'last_history_id';
+                    CREATE TABLE tm_sources (
+                        segment_id INTEGER NOT NULL,
+                        record_id INTEGER NOT NULL,
+                        PRIMARY KEY (segment_id, record_id)
+                    );
+                    CREATE INDEX idx_tm_sources_record ON tm_sources(record_id);
+                    """
+                )
+            self._conn.commit()
+
+    # -------------------- 쓰기 --------------------
+    def _add_segment(
+        self, source_lang: str, target_lang: str, style: str, source: str, target: str, whole: bool,
+        record_id: int | None = None,
+    ) -> None:
+        """세그먼트 한 건 저장 (락 보유 상태에서 호출).
+
+        whole: 입력 전체의 번역이면 True (완전 일치 대상). 같은 원문이 있으면 최신 번역으로 교체하되,
+        위치로 짝지은 문장쌍(whole=False)은 입력 전체로 저장된 번역을 덮어쓰지 않는다.
+        record_id: 번역을 만든 기록 id. 번역이 바뀌거나 문장쌍이 전체 번역으로 승격되면 이전 출처를 교체한다.
+        """
+        source_norm = normalize(source)
+        if not source_norm or not target.strip():
+            return
+        row = self._conn.execute(
+            "SELECT id, whole, target_text FROM tm_segments "
+            "WHERE source_lang = ? AND target_lang = ? AND style = ? AND source_norm = ?",
+            (source_lang, target_lang, style, source_norm),
+        ).fetchone()
+        if row is not None:
+            if row[1] and not whole:
+                return
+            segment_id = row[0]
+            if row[2] != target.strip() or whole and not row[1]:
+                self._conn.execute("DELETE FROM tm_sources WHERE segment_id = ?", (segment_id,))
+            self._conn.execute(
+                "UPDATE tm_segments SET target_text = ?, source_text = ?, updated_at = ?, whole = ? WHERE id = ?",
+                (target.strip(), source.strip(), time.time(), int(whole), segment_id),
+            )
+        else:
+            cur = self._conn.execute(
+                "INSERT INTO tm_segments (source_lang, target_lang, style, source_norm, source_text, target_text, updated_at, whole) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (source_lang, target_lang, style, source_norm, source.strip(), target.strip(), time.time(), int(whole)),
+            )
+            segment_id = cur.lastrowid
+            if len(source_norm) <= FUZZY_MAX_CHARS:
+                self._conn.executemany(
+                    "INSERT INTO tm_ngrams (gram, segment_id) VALUES (?, ?)",
+                    [(gram, segment_id) for gram in _ngrams(source_norm)],
+                )
+        if record_id is not None:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO tm_sources (segment_id, record_id) VALUES (?, ?)", (segment_id, record_id)
+            )
+
+    def add(
+        self, source_lang: str, target_lang: str, source: str, target: str, style: str | None = None,
+        record_id: int | None = None,
+    ) -> None:
+        """번역 결과 한 건을 메모리에 추가.
+
+        전체 문장쌍과 함께, 원문/번역문의 문장 수가 같으면 위치로 짝지은 문장별 쌍도 유사 일치 전용 세그먼트로 저장한다.
+        record_id를 주면 기록 삭제 시 forget()으로 함께 지울 수 있다.
+        """
+        style = style or ""
+        with self._lock:
+            self._add_segment(source_lang, target_lang, style, source, target, whole=True, record_id=record_id)
+            source_sentences = split_sentences(source)
+            target_sentences = split_sentences(target)
+            if len(source_sentences) > 1 and len(source_sentences) == len(target_sentences):
+                for src_chunk, tgt_chunk in zip(source_sentences, target_sentences):
+                    self._add_segment(
+                        source_lang, target_lang, style, src_chunk.text, tgt_chunk.text, whole=False, record_id=record_id,
+                    )
+            self._conn.commit()
+
+    def forget(self, record_ids: Iterable[int]) -> int:
+        """삭제된 기록에서 나온 세그먼트를 지운다 (다른 기록도 같은 번역을 만든 세그먼트는 유지). 지운 세그먼트 수 반환."""
+        ids = list(record_ids)
+        if not ids:
+            return 0
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            segment_ids = [
+                row[0] for row in self._conn.execute(
+                    f"SELECT DISTINCT segment_id FROM tm_sources WHERE record_id IN ({placeholders})", ids
+                )
+            ]
+            self._conn.execute(f"DELETE FROM tm_sources WHERE record_id IN ({placeholders})", ids)
+            orphans = [
+                (segment_id,) for segment_id in segment_ids
+                if self._conn.execute("SELECT 1 FROM tm_sources WHERE segment_id = ? LIMIT 1", (segment_id,)).fetchone() is None
+            ]
+            self._conn.executemany("DELETE FROM tm_segments WHERE id = ?", orphans)
+            self._conn.executemany("DELETE FROM tm_ngrams WHERE segment_id = ?", orphans)
+            self._conn.commit()
+        return len(orphans)
+
+    def sync_from_history(
+        self,
+        records: Iterable[Dict[str, Any]],
+        convert: Callable[[Dict[str, Any]], Optional[Tuple[str, str, str | None]]],
+    ) -> int:
+        """기록 저장소의 항목을 메모리에 반영 (마지막으로 반영한 기록 id 이후만).
+
+        Args:
+            records: id 오름차순 기록 dict 목록 (HistoryRepository.iter_since)
+            convert: 기록 → (source_lang, target_lang, style) 변환 함수. None을 반환하면 건너뜀.
+        Returns:
+            반영한 기록 수
+        """
+        imported = 0
+        last_id = self.last_synced_id()
+        for record in records:
+            converted = convert(record)
+            if converted is not None:
+                source_lang, target_lang, style = converted
+                self.add(source_lang, target_lang, record["input"], record["output"], style=style, record_id=record["id"])
+                imported += 1
+            last_id = max(last_id, record["id"])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tm_meta (key, value) VALUES ('last_history_id', ?)", (str(last_id),)
+            )
+            self._conn.commit()
+        return imported
+
+    def last_synced_id(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM tm_meta WHERE key = 'last_history_id'").fetchone()
+        return int(row[0]) if row else 0
+
+    # -------------------- 조회 --------------------
+    def _exact(self, source_lang: str, target_lang: str, style: str, text: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT id, target_text FROM tm_segments "
+            "WHERE source_lang = ? AND target_lang = ? AND style = ? AND source_norm = ? AND whole = 1",
+            (source_lang, target_lang, style, normalize(text)),
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE tm_segments SET hits = hits + 1 WHERE id = ?", (row[0],))
+        return row[1]
+
+    def lookup(self, source_lang: str, target_lang: str, text: str, style: str | None = None) -> Optional[str]:
+        """입력 전체로 저장된 번역과 완전 일치하면 그 번역을 반환. 없으면 None."""
+        style = style or ""
+        with self._lock:
+            found = self._exact(source_lang, target_lang, style, text)
+            if found is not None:
+                self._counters["exact_hits"] += 1
+                # 절약한 토큰: 원문(프롬프트 본문) + 번역문(생성) 근사
+                self._counters["saved_tokens"] += estimate_tokens(text) + estimate_tokens(found)
+            self._conn.commit()
+            return found
+
+    def fuzzy(
+        self,
+        source_lang: str,
+        target_lang: str,
+        text: str,
+        style: str | None = None,
+        limit: int = 3,
+    ) -> List[Tuple[float, str, str]]:
+        """유사 세그먼트 목록 [(유사도, 원문, 번역문)]을 유사도 내림차순으로 반환."""
+        style = style or ""
+        source_norm = normalize(text)
+        grams = _ngrams(source_norm)
+        if not grams or len(source_norm) > FUZZY_MAX_CHARS:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                # 언어쌍/스타일 조건을 후보 선정 전에 적용 (다른 쌍의 세그먼트가 상위 50개를 차지하지 않도록)
+                f"""SELECT s.source_norm, s.source_text, s.target_text
+                    FROM (SELECT n.segment_id, COUNT(*) AS shared FROM tm_ngrams n
+                          JOIN tm_segments c ON c.id = n.segment_id
+                          WHERE n.gram IN ({','.join('?' * len(grams))})
+                            AND c.source_lang = ? AND c.target_lang = ? AND c.style = ?
+                          GROUP BY n.segment_id ORDER BY shared DESC LIMIT 50) g
+                    JOIN tm_segments s ON s.id = g.segment_id""",
+                (*grams, source_lang, target_lang, style),
+            ).fetchall()
+        scored = []
+        for cand_norm, cand_source, cand_target in rows:
+            ratio = difflib.SequenceMatcher(None, source_norm, cand_norm).ratio()
+            # 원문이 같은 문장쌍(whole=0)도 예시로는 쓴다 (입력 전체 일치는 lookup에서 이미 처리)
+            if ratio >= self.fuzzy_threshold:
+                scored.append((ratio, cand_source, cand_target))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:limit]
+
+    def record_fuzzy(self, matched: bool) -> None:
+        """유사 일치 사용 여부 집계 (완전 일치가 없을 때 호출)."""
+        with self._lock:
+            self._counters["fuzzy_hits" if matched else "misses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률/절약 토큰 통계."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            (stats["segments"],) = self._conn.execute("SELECT COUNT(*) FROM tm_segments").fetchone()
+        lookups = stats["exact_hits"] + stats["fuzzy_hits"] + stats["misses"]
+        stats["lookups"] = lookups
+        stats["exact_hit_rate"] = stats["exact_hits"] / lookups if lookups else 0.0
+        stats["fuzzy_hit_rate"] = stats["fuzzy_hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """번역 메모리 싱글턴. TM_ENABLED=0이면 None.
+
+    환경변수:
+        TM_ENABLED: "0"이면 비활성화 (기본 "1")
+        TM_FUZZY_THRESHOLD: 유사 일치 최소 유사도 (기본 0.75)
+        KONNECT_DB_PATH: 저장 파일 (기록 저장소와 공유)
+    """
+    global _memory
+    if os.getenv("TM_ENABLED", "1") == "0":
+        return None
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = TranslationMemory(
+                    os.getenv("KONNECT_DB_PATH", DEFAULT_DB_PATH),
+                    fuzzy_threshold=float(os.getenv("TM_FUZZY_THRESHOLD", "0.75")),
+                )
+    return _memory
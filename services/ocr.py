@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import base64
+import concurrent.futures
+import contextvars
+import functools
 import io
+import logging
 import os
-from typing import Union
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from services import telemetry
+from services.cache import get_ocr_cache
+from services.imaging import image_fingerprint, preprocess_image, split_pages
+
+logger = logging.getLogger(__name__)
+
+# 비전 호출 한 건의 TPM 예약 추정치: 이미지 1장(detail=high 기준 약 765토큰) + 비슷한 길이의 응답
+VISION_RESERVE_TOKENS = 2 * 765
 
 try:
-	from PIL import Image
+	from PIL import Image, ImageOps
 except Exception: 
 	Image = None
+	ImageOps = None
 
 try:
-	import openai
+	import pytesseract
 except Exception:
-	openai = None
+	pytesseract = None
+
 try:
-	from openai import OpenAI as OpenAIClient
+	import openai
 except Exception:
-	OpenAIClient = None
+	openai = None
 
 
 def _read_image_bytes(uploaded: Union[bytes, "io.BufferedReader", str]) -> bytes:
@@ -42,66 +60,45 @@ def _read_image_bytes(uploaded: Union[bytes, "io.BufferedReader", str]) -> bytes
 	raise TypeError("OCR에 지원되지 않는 업로드 타입입니다: 파일유사객체, bytes, 또는 경로 문자열이어야 합니다")
 
 
-def extract_text_from_image(uploaded: Union[bytes, "io.BufferedReader", str]) -> str:
-	"""이미지에서 텍스트를 추출하고(선택적으로) OpenAI로 후처리합니다.
-	Args:
-		uploaded: Streamlit 업로드 파일(읽기 가능), 바이트, 또는 파일 경로.
-	Returns:
-		이미지에서 추출된 텍스트(후처리된 텍스트). 텍스트가 없으면 빈 문자열을 반환할 수 있습니다.
-	Raises:
-		RuntimeError: 이미지 처리에 필요한 라이브러리나 OCR 백엔드가 없는 경우 발생합니다.
-	"""
-	raw = _read_image_bytes(uploaded)
+@dataclass
+class OCRResult:
+	"""OCR 결과 텍스트와 처리 통계(전송 바이트, 단계별 소요 시간 등)."""
+	text: str
+	stats: Dict[str, Any] = field(default_factory=dict)
 
-	if Image is None:
-		raise RuntimeError("이미지 처리를 위해 Pillow가 필요합니다. 'pip install Pillow'로 설치하세요.")
-
-	# 이미지 열기
-	try:
-		img = Image.open(io.BytesIO(raw))
-		# 일부 포맷에서 문제를 피하기 위해 RGB로 변환
-		if img.mode in ("RGBA", "P"):
-			img = img.convert("RGB")
-	except Exception as e:
-		raise RuntimeError(f"OCR을 위해 이미지를 열지 못했습니다: {e}")
 
-	# GPT API 전용으로 OCR 수행
+def _vision_ocr(data_uri: str) -> str:
+	"""이미지 데이터 URI를 GPT 비전(Responses API)으로 보내 정리된 텍스트를 받습니다."""
 	if openai is None or not os.environ.get("OPENAI_API_KEY"):
 		raise RuntimeError(
 			"OpenAI API 키가 설정되어 있지 않거나 openai 패키지가 없습니다. GPT 기반 OCR을 사용하려면 'openai' 패키지를 설치하고 OPENAI_API_KEY를 설정하세요."
 		)
 
-	# 이미지 바이트를 base64로 인코딩하여 데이터 URI 형태로 모델에 전달
-	try:
-		import base64
-
-		img_format = getattr(img, "format", None) or "png"
-		b64 = base64.b64encode(raw).decode("ascii")
-		data_uri = f"data:image/{img_format.lower()};base64,{b64}"
-	except Exception as e:
-		raise RuntimeError(f"이미지 인코딩 중 오류 발생: {e}")
+	from services.resilience import CircuitOpenError
 
 	cleaned = ""
 	try:
-		if OpenAIClient is None:
-			raise RuntimeError("openai.OpenAI client가 설치되어 있지 않습니다. 'pip install openai'로 설치하세요.")
-
-		if not os.environ.get("OPENAI_API_KEY"):
-			raise RuntimeError("환경변수 OPENAI_API_KEY가 설정되어 있지 않습니다.")
-
-		client = OpenAIClient()
-
-		# 한 번의 Responses API 호출로 이미지에서 텍스트 추출 및 정리 수행
-		response = client.responses.create(
-			model="gpt-4o-mini",
-			input=[{
-				"role": "user",
-				"content": [
-					{"type": "input_text", "text": "이미지에서 텍스트를 추출하고, OCR 오류를 정리하여 정리된 텍스트만 반환하세요."},
-					{"type": "input_image", "image_url": data_uri},
-				],
-			}],
-		)
+		from services import llm
+		from services.clients import get_openai_client
+
+		# 채팅 호출과 같은 연결 풀을 재사용 (매 호출 TLS/연결 수립 비용 제거)
+		client = get_openai_client()
+
+		# 한 번의 Responses API 호출로 이미지에서 텍스트 추출 및 정리 수행 (모델: OPENAI_MODEL_OCR, 기본 gpt-4o-mini)
+		model = llm.route_model("ocr")
+		with telemetry.span("llm.vision", kind="llm", model=model):
+			# 공유 클라이언트는 SDK 재시도를 끄므로 채팅 호출과 같이 브레이커/속도 제한/백오프 재시도로 감싼다
+			# (사용량 기록과 TPM 예약 보정도 _guarded가 처리)
+			response = llm._guarded(lambda: client.responses.create(
+				model=model,
+				input=[{
+					"role": "user",
+					"content": [
+						{"type": "input_text", "text": "이미지에서 텍스트를 추출하고, OCR 오류를 정리하여 정리된 텍스트만 반환하세요."},
+						{"type": "input_image", "image_url": data_uri},
+					],
+				}],
+			), VISION_RESERVE_TOKENS)
 
 		# Responses API의 편리한 속성(output_text)을 우선 사용
 		cleaned = getattr(response, "output_text", None) or ""
@@ -115,7 +112,347 @@ def extract_text_from_image(uploaded: Union[bytes, "io.BufferedReader", str]) ->
 						parts.append(c.get("text", ""))
 			cleaned = "\n".join(parts).strip()
 
+	except CircuitOpenError:
+		raise
 	except Exception as e:
 		raise RuntimeError(f"OpenAI OCR 처리 중 오류 발생: {e}")
 
 	return cleaned
+
+
+@functools.lru_cache(maxsize=1)
+def _tesseract_available() -> bool:
+	if pytesseract is None or Image is None:
+		return False
+	try:
+		pytesseract.get_tesseract_version()
+		return True
+	except Exception:
+		return False
+
+
+class OCRBackend:
+	"""OCR 엔진 공통 인터페이스. recognize(raw)는 원본 이미지 바이트를 받아 OCRResult를 반환한다."""
+	name = "base"
+
+	def recognize(self, raw: bytes) -> OCRResult:
+		raise NotImplementedError
+
+
+class VisionOCRBackend(OCRBackend):
+	"""GPT 비전(Responses API) OCR. 전처리(축소·재인코딩) 후 한 번 호출한다."""
+	name = "vision"
+
+	def __init__(self, preprocess: bool | None = None):
+		if preprocess is None:
+			preprocess = os.getenv("OCR_PREPROCESS", "1") == "1"
+		self.preprocess = preprocess
+
+	def recognize(self, raw: bytes) -> OCRResult:
+		if Image is None:
+			raise RuntimeError("이미지 처리를 위해 Pillow가 필요합니다. 'pip install Pillow'로 설치하세요.")
+
+		stats: Dict[str, Any] = {"backend": self.name, "original_bytes": len(raw)}
+		if self.preprocess:
+			# 비전 모델 유효 해상도로 축소 후 목표 용량 이하로 재인코딩
+			prepared = preprocess_image(raw)
+			data_uri = prepared.data_uri
+			stats.update(
+				processed_bytes=prepared.processed_bytes,
+				saved_bytes=prepared.saved_bytes,
+				size=f"{prepared.width}x{prepared.height}",
+				preprocess_seconds=prepared.elapsed,
+			)
+		else:
+			# 이미지 바이트를 base64로 인코딩하여 데이터 URI 형태로 모델에 전달
+			try:
+				img = Image.open(io.BytesIO(raw))
+				img_format = getattr(img, "format", None) or "png"
+				b64 = base64.b64encode(raw).decode("ascii")
+				data_uri = f"data:image/{img_format.lower()};base64,{b64}"
+			except Exception as e:
+				raise RuntimeError(f"OCR을 위해 이미지를 열지 못했습니다: {e}")
+			stats.update(processed_bytes=len(raw), saved_bytes=0)
+
+		# base64 데이터 URI 길이 = 실제 요청 본문에 실리는 이미지 크기
+		stats["payload_bytes"] = len(data_uri)
+		stats["original_payload_bytes"] = 4 * ((len(raw) + 2) // 3)
+
+		started = time.perf_counter()
+		text = _vision_ocr(data_uri)
+		stats["ocr_seconds"] = time.perf_counter() - started
+		logger.info(
+			"ocr[vision]: payload %d -> %d bytes, preprocess=%.3fs, vision=%.3fs",
+			stats["original_payload_bytes"], stats["payload_bytes"], stats.get("preprocess_seconds", 0.0), stats["ocr_seconds"],
+		)
+		return OCRResult(text=text, stats=stats)
+
+
+class TesseractOCRBackend(OCRBackend):
+	"""로컬 pytesseract OCR. 네트워크/토큰 비용 없이 단어별 신뢰도(conf)를 함께 제공한다."""
+	name = "tesseract"
+
+	def __init__(self, lang: str | None = None):
+		self.lang = lang or os.getenv("OCR_TESSERACT_LANG", "kor+eng+jpn+chi_sim+vie")
+
+	@staticmethod
+	def available() -> bool:
+		"""pytesseract 패키지와 tesseract 실행 파일이 모두 있는지 확인."""
+		return _tesseract_available()
+
+	def read_lines(self, img: "Image.Image") -> List[Dict[str, Any]]:
+		"""이미지를 줄 단위로 인식. 각 줄: text, conf(단어 평균), box(left, top, right, bottom), block."""
+		data = pytesseract.image_to_data(img, lang=self.lang, output_type=pytesseract.Output.DICT)
+		lines: Dict[tuple, Dict[str, Any]] = {}
+		for i, word in enumerate(data["text"]):
+			conf = float(data["conf"][i])
+			if conf < 0 or not word.strip():
+				continue
+			key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+			left, top = data["left"][i], data["top"][i]
+			right, bottom = left + data["width"][i], top + data["height"][i]
+			line = lines.setdefault(key, {"words": [], "confs": [], "box": [left, top, right, bottom], "block": key[0]})
+			line["words"].append(word)
+			line["confs"].append(conf)
+			box = line["box"]
+			line["box"] = [min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom)]
+		return [
+			{"text": " ".join(line["words"]), "conf": sum(line["confs"]) / len(line["confs"]), "box": tuple(line["box"]), "block": line["block"]}
+			for _, line in sorted(lines.items())
+		]
+
+	@staticmethod
+	def join_lines(lines: List[Dict[str, Any]]) -> str:
+		"""줄바꿈 유지, 블록이 바뀌면 빈 줄로 구분."""
+		parts: List[str] = []
+		prev_block = None
+		for line in lines:
+			if prev_block is not None and line["block"] != prev_block:
+				parts.append("")
+			parts.append(line["text"])
+			prev_block = line["block"]
+		return "\n".join(parts).strip()
+
+	@staticmethod
+	def open_image(raw: bytes) -> "Image.Image":
+		"""tesseract 입력용: 회전 보정 + 흑백 (해상도는 줄이지 않음)."""
+		try:
+			img = ImageOps.exif_transpose(Image.open(io.BytesIO(raw)))
+			return ImageOps.grayscale(img)
+		except Exception as e:
+			raise RuntimeError(f"OCR을 위해 이미지를 열지 못했습니다: {e}")
+
+	def recognize(self, raw: bytes) -> OCRResult:
+		if not self.available():
+			raise RuntimeError("pytesseract 또는 tesseract 실행 파일이 없습니다. tesseract와 언어 데이터를 설치하세요.")
+		started = time.perf_counter()
+		try:
+			lines = self.read_lines(self.open_image(raw))
+		except pytesseract.TesseractError as e:
+			raise RuntimeError(f"tesseract OCR 실패 (언어 데이터 {self.lang} 설치 여부를 확인하세요): {e}")
+		confs = [line["conf"] for line in lines]
+		stats = {
+			"backend": self.name,
+			"original_bytes": len(raw),
+			"mean_confidence": sum(confs) / len(confs) if confs else 0.0,
+			"ocr_seconds": time.perf_counter() - started,
+		}
+		return OCRResult(text=self.join_lines(lines), stats=stats)
+
+
+class HybridOCRBackend(OCRBackend):
+	"""tesseract를 먼저 쓰고 신뢰도가 낮은 경우에만 GPT 비전으로 넘기는 OCR.
+
+	- 인식된 줄이 없거나 전체 평균 신뢰도/저신뢰 줄 비율이 기준을 넘으면 이미지 전체를 비전으로 처리.
+	- 그 외에는 신뢰도가 낮은 줄 영역만 잘라 비전으로 다시 읽어 해당 줄을 교체.
+	- tesseract가 설치되어 있지 않거나 인식 중 오류(언어 데이터 누락 등)가 나면 비전으로 처리.
+	"""
+	name = "hybrid"
+
+	def __init__(self, min_confidence: float | None = None, max_low_ratio: float | None = None):
+		self.min_confidence = min_confidence if min_confidence is not None else float(os.getenv("OCR_MIN_CONFIDENCE", "70"))
+		self.max_low_ratio = max_low_ratio if max_low_ratio is not None else float(os.getenv("OCR_MAX_LOW_RATIO", "0.3"))
+		self.tesseract = TesseractOCRBackend()
+		self.vision = VisionOCRBackend()
+
+	def _escalate(self, raw: bytes, reason: str, stats: Dict[str, Any]) -> OCRResult:
+		result = self.vision.recognize(raw)
+		result.stats.update(stats, backend=self.name, escalated=reason)
+		result.stats["ocr_seconds"] = stats.get("tesseract_seconds", 0.0) + result.stats.get("ocr_seconds", 0.0)
+		return result
+
+	def recognize(self, raw: bytes) -> OCRResult:
+		if not self.tesseract.available():
+			return self._escalate(raw, "tesseract_unavailable", {})
+
+		started = time.perf_counter()
+		img = self.tesseract.open_image(raw)
+		try:
+			lines = self.tesseract.read_lines(img)
+		except (pytesseract.TesseractError, RuntimeError) as e:
+			# 실행 파일은 있어도 언어 데이터(kor/jpn/chi_sim/vie 등)가 없으면 인식 단계에서 실패한다
+			logger.warning("tesseract failed (%s), falling back to vision", e)
+			return self._escalate(raw, "tesseract_error", {"tesseract_seconds": time.perf_counter() - started})
+		stats: Dict[str, Any] = {"tesseract_seconds": time.perf_counter() - started, "lines": len(lines)}
+		if not lines:
+			return self._escalate(raw, "no_text", stats)
+
+		mean_conf = sum(line["conf"] for line in lines) / len(lines)
+		low = [line for line in lines if line["conf"] < self.min_confidence]
+		stats.update(mean_confidence=mean_conf, low_confidence_lines=len(low))
+		if mean_conf < self.min_confidence or len(low) / len(lines) > self.max_low_ratio:
+			return self._escalate(raw, "low_confidence_image", stats)
+
+		# 저신뢰 줄만 잘라서 비전으로 재인식
+		vision_seconds = 0.0
+		for line in low:
+			left, top, right, bottom = line["box"]
+			pad = max(4, (bottom - top) // 2)
+			crop = img.crop((max(0, left - pad), max(0, top - pad), min(img.width, right + pad), min(img.height, bottom + pad)))
+			buf = io.BytesIO()
+			crop.save(buf, format="PNG")
+			region_started = time.perf_counter()
+			text = _vision_ocr(f"data:image/png;base64,{base64.b64encode(buf.getvalue()).decode('ascii')}")
+			vision_seconds += time.perf_counter() - region_started
+			if text:
+				line["text"] = " ".join(text.split())
+
+		stats.update(
+			backend=self.name,
+			original_bytes=len(raw),
+			escalated="regions" if low else None,
+			vision_seconds=vision_seconds,
+			ocr_seconds=time.perf_counter() - started,
+		)
+		logger.info(
+			"ocr[hybrid]: %d lines, mean conf %.1f, %d regions escalated, %.3fs",
+			len(lines), mean_conf, len(low), stats["ocr_seconds"],
+		)
+		return OCRResult(text=self.tesseract.join_lines(lines), stats=stats)
+
+
+OCR_BACKENDS = {
+	"vision": VisionOCRBackend,
+	"tesseract": TesseractOCRBackend,
+	"hybrid": HybridOCRBackend,
+}
+
+
+def _recognize_cached(backend: OCRBackend, raw: bytes) -> OCRResult:
+	"""OCR 캐시(내용 해시 → 지각 해시 순)를 먼저 조회하고, 없을 때만 backend로 인식한다.
+
+	stats["cache"]에 "hit" / "near_hit" / "miss" / "off"를 기록한다.
+	"""
+	with telemetry.span("ocr.recognize", kind="ocr", backend=backend.name) as span:
+		result = _lookup_or_recognize(backend, raw)
+		span.set(cache=result.stats.get("cache"), escalated=result.stats.get("escalated"))
+		return result
+
+
+def _lookup_or_recognize(backend: OCRBackend, raw: bytes) -> OCRResult:
+	cache = get_ocr_cache()
+	if cache is None:
+		result = backend.recognize(raw)
+		result.stats["cache"] = "off"
+		return result
+
+	started = time.perf_counter()
+	key, phash, size = image_fingerprint(raw)
+	cached = cache.get(key, backend.name, phash, size)
+	if cached is not None:
+		text, stats, status = cached
+		stats.update(cache=status, ocr_seconds=time.perf_counter() - started)
+		return OCRResult(text=text, stats=stats)
+
+	result = backend.recognize(raw)
+	cache.set(key, backend.name, result.text, result.stats, phash, size)
+	result.stats["cache"] = "miss"
+	return result
+
+
+def get_ocr_backend(name: str | None = None) -> OCRBackend:
+	"""OCR 백엔드 생성. name이 없으면 OCR_BACKEND 환경변수(기본 "hybrid")를 사용합니다.
+
+	Raises:
+		ValueError: 알 수 없는 백엔드 이름인 경우
+	"""
+	name = (name or os.getenv("OCR_BACKEND", "hybrid")).lower()
+	if name not in OCR_BACKENDS:
+		raise ValueError(f"지원하지 않는 OCR 백엔드: {name}. 지원: {list(OCR_BACKENDS)}")
+	return OCR_BACKENDS[name]()
+
+
+def ocr_image(uploaded: Union[bytes, "io.BufferedReader", str], backend: Optional[OCRBackend | str] = None) -> OCRResult:
+	"""이미지에서 텍스트를 추출하고 처리 통계를 함께 반환합니다.
+	Args:
+		uploaded: Streamlit 업로드 파일(읽기 가능), 바이트, 또는 파일 경로.
+		backend: OCRBackend 인스턴스 또는 이름("vision" / "tesseract" / "hybrid"). None이면 OCR_BACKEND 설정.
+	Returns:
+		OCRResult(text, stats). stats에는 사용한 백엔드, 전송 바이트, 단계별 소요 시간 등이 들어 있습니다.
+	Raises:
+		RuntimeError: 이미지 처리에 필요한 라이브러리나 OCR 백엔드가 없는 경우 발생합니다.
+	"""
+	raw = _read_image_bytes(uploaded)
+
+	if Image is None:
+		raise RuntimeError("이미지 처리를 위해 Pillow가 필요합니다. 'pip install Pillow'로 설치하세요.")
+
+	if not isinstance(backend, OCRBackend):
+		backend = get_ocr_backend(backend)
+	return _recognize_cached(backend, raw)
+
+
+def iter_ocr_pages(
+	uploads: Sequence[Union[bytes, "io.BufferedReader", str]],
+	backend: Optional[OCRBackend | str] = None,
+	max_workers: int | None = None,
+) -> Iterator[Tuple[int, int, OCRResult]]:
+	"""여러 이미지/다중 페이지 문서(PDF, TIFF)를 페이지 단위로 병렬 OCR 합니다.
+	Args:
+		uploads: 업로드 파일(들), 바이트, 또는 파일 경로 목록.
+		backend: ocr_image와 동일.
+		max_workers: 동시에 처리할 페이지 수 (기본: OCR_MAX_WORKERS=4)
+	Yields:
+		(페이지 번호(0부터), 전체 페이지 수, OCRResult)를 페이지 순서대로.
+		앞 페이지가 끝나는 즉시 yield 하므로 뒤 페이지를 기다리지 않고 다음 단계를 시작할 수 있다.
+		stats["source"]에 원본 파일 이름(알 수 있는 경우), stats["source_page"]에 파일 내 페이지 번호(1부터)가 담긴다.
+	Raises:
+		RuntimeError: 이미지 처리에 필요한 라이브러리나 OCR 백엔드가 없는 경우 발생합니다.
+	"""
+	if not isinstance(backend, OCRBackend):
+		backend = get_ocr_backend(backend)
+	max_workers = max_workers or int(os.getenv("OCR_MAX_WORKERS", "4"))
+
+	pages: List[Tuple[bytes, str, int]] = []
+	for i, uploaded in enumerate(uploads):
+		source = getattr(uploaded, "name", None) or (uploaded if isinstance(uploaded, str) else f"image-{i + 1}")
+		for page_no, page in enumerate(split_pages(_read_image_bytes(uploaded)), start=1):
+			pages.append((page, source, page_no))
+
+	with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ocr") as pool:
+		# 페이지 span이 호출자의 span 아래에 기록되도록 컨텍스트를 복사해 실행
+		futures = [
+			pool.submit(contextvars.copy_context().run, _recognize_cached, backend, page)
+			for page, _, _ in pages
+		]
+		try:
+			for index, future in enumerate(futures):
+				result = future.result()
+				result.stats.update(source=pages[index][1], source_page=pages[index][2])
+				yield index, len(pages), result
+		finally:
+			# 소비가 중단되면 아직 시작하지 않은 페이지는 취소
+			for future in futures:
+				future.cancel()
+
+
+def extract_text_from_image(uploaded: Union[bytes, "io.BufferedReader", str]) -> str:
+	"""이미지에서 텍스트를 추출하고(선택적으로) OpenAI로 후처리합니다.
+	Args:
+		uploaded: Streamlit 업로드 파일(읽기 가능), 바이트, 또는 파일 경로.
+	Returns:
+		이미지에서 추출된 텍스트(후처리된 텍스트). 텍스트가 없으면 빈 문자열을 반환할 수 있습니다.
+	Raises:
+		RuntimeError: 이미지 처리에 필요한 라이브러리나 OCR 백엔드가 없는 경우 발생합니다.
+	"""
+	return ocr_image(uploaded).text
@@ -0,0 +1,239 @@
+"""LLM 호출 보호 장치: 속도 제한, 재시도 백오프, 서킷 브레이커
+
+- RateLimiter: 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷. 프로세스 안의 모든 세션이 공유한다.
+  reserve()는 용량을 먼저 예약하고 기다려야 할 시간만 돌려주므로 동기/비동기 호출 모두에서 쓸 수 있다.
+- backoff_delay: 429/타임아웃/5xx 재시도 대기 시간. 지터를 섞은 지수 백오프, Retry-After가 있으면 우선하되 max_delay로 제한
+  (재시도 루프는 services.llm._guarded/_aguarded가 속도 제한기·브레이커와 함께 돈다)
+- CircuitBreaker: 연속 실패가 임계치를 넘으면 일정 시간 호출을 즉시 거절하고,
+  이후 한 건의 시험 호출(half-open)이 성공하면 다시 연다.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상: 속도 제한, 타임아웃/연결 오류, 5xx
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 있어 호출을 보내지 않음."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"LLM API 장애로 요청을 잠시 중단했습니다. {retry_in:.0f}초 후 다시 시도하세요.")
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """분당 capacity만큼 채워지는 토큰 버킷. 잔량이 음수가 될 수 있다(대기열 순서 = 예약 순서)."""
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.rate = capacity / 60.0
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """amount를 예약하고 잔량이 0 이상이 될 때까지 기다려야 할 시간(초)을 반환."""
+        self._refill(now)
+        self._tokens -= min(amount, self.capacity)
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def adjust(self, amount: float, now: float) -> None:
+        """예약량 보정 (양수: 추가 차감, 음수: 환급)."""
+        self._refill(now)
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class RateLimiter:
+    """RPM/TPM 토큰 버킷 묶음.
+
+    Args:
+        rpm: 분당 요청 수 한도 (0이면 제한 없음)
+        tpm: 분당 토큰 수 한도 (0이면 제한 없음)
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self._requests = TokenBucket(rpm) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._counters = {"requests": 0, "delayed": 0, "waited_seconds": 0.0, "penalties": 0}
+
+    def reserve(self, tokens: int) -> float:
+        """요청 1건과 tokens만큼을 예약하고 대기 시간(초)을 반환."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            self._counters["requests"] += 1
+            if wait > 0:
+                self._counters["delayed"] += 1
+                self._counters["waited_seconds"] += wait
+            return wait
+
+    def acquire(self, tokens: int) -> None:
+        """동기 호출용: 예약 후 필요한 만큼 대기."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def adjust(self, delta_tokens: int) -> None:
+        """응답의 실제 사용량(resp.usage)으로 예약 추정치를 보정."""
+        if self._tokens is None or not delta_tokens:
+            return
+        with self._lock:
+            self._tokens.adjust(delta_tokens, time.monotonic())
+
+    def penalize(self, seconds: float) -> None:
+        """429 응답을 받으면 Retry-After 동안 모든 호출을 멈춘다."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._counters["penalties"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters)
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (closed → open → half_open → closed/open).
+
+    Args:
+        failure_threshold: 열림 전환까지의 연속 실패 수
+        reset_timeout: 열린 뒤 시험 호출을 허용하기까지의 시간(초)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._counters = {"rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """호출 허용 여부 확인. 열려 있으면 CircuitOpenError. half-open 상태에서는 한 건만 통과."""
+        with self._lock:
+            if self._state == "closed":
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == "open" and remaining <= 0:
+                self._state = "half_open"
+            if self._state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info("circuit half-open: sending probe request")
+                return
+            self._counters["rejected"] += 1
+            raise CircuitOpenError(max(remaining, 1.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != "closed":
+                logger.info("circuit closed: probe succeeded")
+            self._state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self._counters["opened"] += 1
+                    logger.warning("circuit opened after %d consecutive failures", self._failures)
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def abort(self) -> None:
+        """결과 없이 끝난 호출(취소 등)이 시험 호출이었다면 다음 호출이 다시 시험할 수 있게 한다."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures, **self._counters}
+
+
+def retry_after(error: Exception) -> float | None:
+    """오류 응답의 Retry-After 헤더(초)를 읽는다. 없으면 None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(error: Exception, attempt: int, base_delay: float = 1.0, max_delay: float = 30.0) -> float:
+    """재시도 대기 시간: Retry-After가 있으면 그 값, 없으면 지터(50~100%)를 섞은 지수 백오프. 최대 max_delay초."""
+    delay = retry_after(error)
+    if delay is None:
+        delay = min(max_delay, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+    # 잘못되었거나 과도한 Retry-After 헤더로 호출 스레드가 오래 멈추지 않도록 제한
+    return max(0.0, min(delay, max_delay))
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_circuit_breaker: Optional[CircuitBreaker] = None
+_singleton_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """프로세스 전역 속도 제한기.
+
+    환경변수:
+        LLM_RPM_LIMIT: 분당 요청 수 (기본 500, 0이면 제한 없음)
+        LLM_TPM_LIMIT: 분당 토큰 수 (기본 200000, 0이면 제한 없음)
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _singleton_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(
+                    int(os.getenv("LLM_RPM_LIMIT", "500")),
+                    int(os.getenv("LLM_TPM_LIMIT", "200000")),
+                )
+    return _rate_limiter
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """프로세스 전역 서킷 브레이커 (LLM_BREAKER_THRESHOLD=5회 연속 실패 시 LLM_BREAKER_RESET=30초 차단)."""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        with _singleton_lock:
+            if _circuit_breaker is None:
+                _circuit_breaker = CircuitBreaker(
+                    int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+                    float(os.getenv("LLM_BREAKER_RESET", "30")),
+                )
+    return _circuit_breaker
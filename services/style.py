@@ -1,17 +1,14 @@
-from core.prompts import style_transformation_prompts
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from core.prompts import build_messages, style_transformation_prompts
 from services import llm
+from services.batch import run_batch
+
+STYLE_SYSTEM_ROLE = "당신은 의미 왜곡 없이 문체만 조정하는 한국어 문체 전문가입니다."
+
+def resolve_style_key(style_type: str) -> str:
+    """스타일 라벨(또는 STYLE_MAP 항목 dict)을 프롬프트 키로 변환합니다.
 
-def transform(text: str, style_type: str, model: str | None = None) -> str:
-    """한국어 텍스트의 문체를 변환합니다.
-    
-    Args:
-        text: 변환할 한국어 텍스트
-        style_type: 변환할 문체 ('Formal', 'Informal', 'Basic Vocabulary', 'Hanja')
-        model: 사용할 LLM 모델명 (None이면 기본값)
-    
-    Returns:
-        문체가 변환된 텍스트
-    
     Raises:
         ValueError: 지원하지 않는 스타일 타입일 경우
     """
@@ -40,13 +37,53 @@ def transform(text: str, style_type: str, model: str | None = None) -> str:
     prompt_key = mapping.get(norm)
     if not prompt_key:
         raise ValueError(f"지원하지 않는 스타일: {style_label}. 지원 스타일: {list(mapping.keys())}")
+    return prompt_key
+
+def transform(text: str, style_type: str, model: str | None = None) -> str:
+    """한국어 텍스트의 문체를 변환합니다.
+    
+    Args:
+        text: 변환할 한국어 텍스트
+        style_type: 변환할 문체 ('Formal', 'Informal', 'Basic Vocabulary', 'Hanja')
+        model: 사용할 LLM 모델명 (None이면 기본값)
+    
+    Returns:
+        문체가 변환된 텍스트
+    
+    Raises:
+        ValueError: 지원하지 않는 스타일 타입일 경우
+    """
+    return llm.chat(_build_style_messages(text, style_type), model=model or llm.route_model("style", len(text)))
 
-    prompt = style_transformation_prompts[prompt_key].format(text=text)
-    messages = [
-        {"role": "system", "content": "당신은 의미 왜곡 없이 문체만 조정하는 한국어 문체 전문가입니다."},
-        {"role": "user", "content": prompt},
-    ]
-    return llm.chat(messages, model=model)
+def transform_stream(text: str, style_type: str, model: str | None = None) -> Iterator[str]:
+    """transform의 스트리밍 버전. 변환 결과 조각을 생성되는 대로 yield 한다."""
+    yield from llm.chat_stream(_build_style_messages(text, style_type), model=model or llm.route_model("style", len(text)))
+
+def _build_style_messages(text: str, style_type: str) -> List[Dict[str, str]]:
+    prompt_key = resolve_style_key(style_type)
+    return build_messages(STYLE_SYSTEM_ROLE, style_transformation_prompts[prompt_key], text)
+
+def iter_transform_many(texts: Sequence[str], style_type: str, model: str | None = None) -> Iterator[Tuple[int, str]]:
+    """여러 텍스트의 문체를 묶음 단위로 변환하고 (입력 위치, 결과)를 완료 순서대로 yield 합니다."""
+    prompt_key = resolve_style_key(style_type)
+    model = model or llm.route_model("style", sum(len(text) for text in texts))
+    yield from run_batch(texts, style_transformation_prompts[prompt_key], STYLE_SYSTEM_ROLE, model=model)
+
+def transform_many(texts: Sequence[str], style_type: str, model: str | None = None) -> List[str]:
+    """여러 한국어 텍스트의 문체를 일괄 변환합니다.
+
+    Args:
+        texts: 변환할 한국어 텍스트 목록
+        style_type: 변환할 문체 (transform과 동일)
+        model: 사용할 LLM 모델명 (None이면 기본값)
+
+    Returns:
+        입력과 같은 순서의 변환 결과 목록
+    """
+    results = [""] * len(texts)
+    for i, output in iter_transform_many(texts, style_type, model=model):
+        results[i] = output
+    return results
 
 # 하위 호환성을 위한 별칭 (app.py에서 사용 중)
 transform_style = transform
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""단계별/LLM 호출별 추적(span) 계측
+
+- span(name, kind, **attrs): with 블록 하나를 span으로 기록한다. 중첩되면 부모 span을 기억한다(contextvars).
+  LLM 호출 span에는 model / prompt_tokens / completion_tokens / cached_tokens(제공자 프리픽스 캐시) /
+  instruction_tokens·content_tokens(정적 지시/입력 토큰, services.tokens) / cache / retries 등을 속성으로 남긴다.
+- 완료된 span은 프로세스 메모리의 링 버퍼(TELEMETRY_BUFFER=5000건)에 쌓이고,
+  summarize()로 최근 N초 구간의 이름별 p50/p95/p99 지연과 토큰 합계를 계산한다 (Streamlit 관리 패널).
+- 선택 내보내기:
+    TELEMETRY_OTEL=1                 → opentelemetry-api가 있으면 같은 span을 OpenTelemetry tracer로도 기록
+    TELEMETRY_PROMETHEUS_PORT=9464   → prometheus_client가 있으면 지연 히스토그램/토큰 카운터를 해당 포트로 노출
+      포트는 프로세스마다 따로 열리므로 처음 연 프로세스만 노출한다. 여러 프로세스(api.py 워커 여러 개 + Streamlit)로
+      실행하면 나머지 프로세스는 경고를 남기고 내보내기 없이 링 버퍼에만 기록한다 (프로세스별로 다른 포트를 지정할 것).
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+try:
+    from opentelemetry import trace as otel_trace
+except Exception:
+    otel_trace = None
+
+try:
+    import prometheus_client
+except Exception:
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    """측정 구간 하나. duration은 finish() 이후에 채워진다."""
+
+    name: str
+    kind: str = "stage"  # stage | llm | ocr
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    parent_id: Optional[int] = None
+    span_id: int = field(default_factory=lambda: next(_ids))
+    started_at: float = field(default_factory=time.time)
+    duration: Optional[float] = None
+    status: str = "ok"
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def incr(self, key: str, amount: int = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def elapsed(self) -> float:
+        """시작 후 지난 시간(초). 첫 토큰 지연 등 중간 시점 기록용."""
+        return time.perf_counter() - self._started
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.status = "error"
+            self.attrs.setdefault("error", type(error).__name__)
+        get_recorder().record(self)
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("konnect_span", default=None)
+
+
+def current() -> Optional[Span]:
+    """현재 활성 span (없으면 None)."""
+    return _current.get()
+
+
+def start_span(name: str, kind: str = "stage", **attrs: Any) -> Span:
+    """활성화하지 않은 span을 시작 (제너레이터처럼 with 블록으로 감싸기 어려운 경우). 끝나면 finish() 호출."""
+    parent = _current.get()
+    return Span(name=name, kind=kind, attrs=attrs, parent_id=parent.span_id if parent else None)
+
+
+@contextlib.contextmanager
+def activate(span: Span) -> Iterator[Span]:
+    """이미 시작된 span을 잠시 현재 span으로 지정 (내부 호출이 속성을 남길 수 있도록)."""
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def span(name: str, kind: str = "stage", **attrs: Any) -> Iterator[Span]:
+    """with 블록 하나를 span으로 기록. 예외가 나면 status=error로 남기고 그대로 다시 던진다."""
+    s = start_span(name, kind, **attrs)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.finish(e)
+        raise
+    finally:
+        _current.reset(token)
+        s.finish()
+
+
+def traced(s: Span, iterable: Iterable[T]) -> Iterator[T]:
+    """iterable을 소비하는 동안 span s를 기록 (스트리밍 응답용).
+
+    항목을 꺼내는 동안에만 s를 현재 span으로 지정하므로, yield 사이에 다른 스레드/컨텍스트에서
+    소비되더라도(Starlette StreamingResponse 등) 안전하다. 소비가 끝나거나 중단되면 s를 마친다.
+    """
+    it = iter(iterable)
+    error: Optional[BaseException] = None
+    try:
+        while True:
+            with activate(s):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+    except GeneratorExit:
+        s.set(abandoned=True)
+        close = getattr(it, "close", None)
+        if close is not None:
+            with activate(s):
+                close()
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        s.finish(error)
+
+
+def annotate(**attrs: Any) -> None:
+    """현재 span에 속성 추가 (활성 span이 없으면 무시)."""
+    s = _current.get()
+    if s is not None:
+        s.set(**attrs)
+
+
+def annotate_usage(usage: Any, s: Optional[Span] = None) -> None:
+    """OpenAI 응답의 usage(prompt/completion 또는 input/output 토큰)를 span(기본: 현재 span)에 기록."""
+    s = s or _current.get()
+    if s is None or usage is None:
+        return
+    prompt = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None) or 0
+    completion = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None) or 0
+    s.incr("prompt_tokens", prompt)
+    s.incr("completion_tokens", completion)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached:
+        s.incr("cached_tokens", cached)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Recorder:
+    """완료된 span 링 버퍼 + 선택 내보내기(OpenTelemetry / Prometheus)."""
+
+    def __init__(self, capacity: int = 5000):
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._tracer = None
+        self._latency = None
+        self._tokens = None
+        if otel_trace is not None and os.getenv("TELEMETRY_OTEL", "0") == "1":
+            self._tracer = otel_trace.get_tracer("konnect")
+        port = os.getenv("TELEMETRY_PROMETHEUS_PORT")
+        if prometheus_client is not None and port:
+            self._latency = prometheus_client.Histogram(
+                "konnect_span_seconds", "Span latency", ["name", "kind", "model", "cache", "status"],
+                buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+            )
+            self._tokens = prometheus_client.Counter(
+                "konnect_llm_tokens", "LLM tokens", ["model", "type"],
+            )
+            try:
+                prometheus_client.start_http_server(int(port))
+                logger.info("prometheus metrics on :%s", port)
+            except OSError as e:
+                # 같은 포트를 다른 프로세스(uvicorn 워커, Streamlit)가 이미 사용 중: 내보내기만 끄고 기록은 계속
+                logger.warning("prometheus exporter disabled, port %s unavailable (%s)", port, e)
+                self._latency = None
+                self._tokens = None
+
+    def record(self, s: Span) -> None:
+        with self._lock:
+            self._spans.append(s)
+        logger.debug("span %s %.3fs %s", s.name, s.duration, s.attrs)
+        if self._tracer is not None:
+            start_ns = int(s.started_at * 1e9)
+            otel_span = self._tracer.start_span(s.name, start_time=start_ns, attributes={
+                "konnect.kind": s.kind,
+                **{f"konnect.{k}": v for k, v in s.attrs.items() if isinstance(v, (str, bool, int, float))},
+            })
+            if s.status == "error":
+                otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+            otel_span.end(end_time=start_ns + int(s.duration * 1e9))
+        if self._latency is not None:
+            model = str(s.attrs.get("model", ""))
+            self._latency.labels(s.name, s.kind, model, str(s.attrs.get("cache", "")), s.status).observe(s.duration)
+            for kind in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+                if s.attrs.get(kind):
+                    self._tokens.labels(model, kind).inc(s.attrs[kind])
+
+    def spans(self, window_seconds: Optional[float] = None) -> List[Span]:
+        """최근 window_seconds초 안에 시작한 span 목록 (None이면 버퍼 전체)."""
+        with self._lock:
+            spans = list(self._spans)
+        if window_seconds is None:
+            return spans
+        since = time.time() - window_seconds
+        return [s for s in spans if s.started_at >= since]
+
+    def summarize(self, window_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+        """이름별 호출 수/오류 수/지연 백분위(p50/p95/p99)/토큰 합계/캐시 적중 수."""
+        groups: Dict[str, List[Span]] = {}
+        for s in self.spans(window_seconds):
+            groups.setdefault(s.name, []).append(s)
+        rows = []
+        for name, spans in sorted(groups.items()):
+            durations = sorted(s.duration for s in spans)
+            rows.append({
+                "name": name,
+                "kind": spans[0].kind,
+                "count": len(spans),
+                "errors": sum(s.status == "error" for s in spans),
+                "p50_ms": 1000 * _percentile(durations, 50),
+                "p95_ms": 1000 * _percentile(durations, 95),
+                "p99_ms": 1000 * _percentile(durations, 99),
+                "prompt_tokens": sum(s.attrs.get("prompt_tokens", 0) for s in spans),
+                "completion_tokens": sum(s.attrs.get("completion_tokens", 0) for s in spans),
+                "cached_tokens": sum(s.attrs.get("cached_tokens", 0) for s in spans),
+                "instruction_tokens": sum(s.attrs.get("instruction_tokens", 0) for s in spans),
+                "content_tokens": sum(s.attrs.get("content_tokens", 0) for s in spans),
+                "cache_hits": sum(s.attrs.get("cache") in ("hit", "near_hit", "coalesced", "memory") for s in spans),
+                "retries": sum(s.attrs.get("retries", 0) for s in spans),
+            })
+        return rows
+
+    def tokens_by_model(self, window_seconds: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        totals: Dict[str, Dict[str, int]] = {}
+        for s in self.spans(window_seconds):
+            if s.kind != "llm":
+                continue
+            row = totals.setdefault(
+                str(s.attrs.get("model", "")),
+                {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0},
+            )
+            row["calls"] += 1
+            for key in ("prompt_tokens", "cached_tokens", "completion_tokens"):
+                row[key] += s.attrs.get(key, 0)
+        return totals
+
+
+_recorder: Optional[Recorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Recorder:
+    """프로세스 전역 span 기록기 (TELEMETRY_BUFFER: 보관 span 수, 기본 5000)."""
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = Recorder(int(os.getenv("TELEMETRY_BUFFER", "5000")))
+    return _recorder
@@ -0,0 +1,72 @@
+"""프롬프트 토큰 계산: 정적 지시(캐시 가능한 프리픽스) vs 입력 내용
+
+- count(text, model): tiktoken이 설치되어 있으면 모델 인코딩으로, 없으면 estimate_tokens 근사치.
+- prompt_breakdown(messages, model): core.prompts.build_messages() 구조 기준으로
+    instruction_tokens = 첫 system 메시지(역할 + 정적 지시, 같은 작업이면 매번 동일 → 프리픽스 캐시 대상)
+    content_tokens     = 나머지 메시지(번역 메모리 예시/앞 문맥 등 참고 정보 + 입력)
+  메시지 구분용 토큰은 포함하지 않는다. services.llm이 LLM 호출 span에 기록한다.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (UTF-8 3바이트 ≒ 1토큰)."""
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+@functools.lru_cache(maxsize=16)
+def _encoding(model: str) -> Optional["tiktoken.Encoding"]:
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # 호환 서버/신규 모델명: 최신 OpenAI 모델 인코딩으로 근사
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # 인코딩 파일을 받을 수 없는 환경 등
+        logger.warning("tiktoken encoding unavailable for %s (%s), using estimate", model, e)
+        return None
+
+
+def count(text: str, model: str = "") -> int:
+    """text의 토큰 수 (tiktoken이 없으면 근사치)."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@functools.lru_cache(maxsize=512)
+def _static_count(text: str, model: str) -> int:
+    # 정적 지시는 같은 문자열이 반복되므로 한 번만 계산
+    return count(text, model)
+
+
+def prompt_breakdown(messages: List[Dict[str, str]], model: str = "") -> Dict[str, int]:
+    """{instruction_tokens, content_tokens}: 첫 system 메시지와 나머지 메시지의 토큰 수."""
+    instruction = 0
+    content = 0
+    for i, message in enumerate(messages):
+        text = message.get("content")
+        if not isinstance(text, str):
+            continue
+        if i == 0 and message.get("role") == "system":
+            instruction = _static_count(text, model)
+        else:
+            content += count(text, model)
+    return {"instruction_tokens": instruction, "content_tokens": content}
@@ -1,5 +1,21 @@
-from core.prompts import translation_prompts
+import concurrent.futures
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.chunker import DEFAULT_MAX_CHARS, split_text, join_chunks
+from core.prompts import build_messages, translation_prompts, translation_style_prompts
 from services import llm
+from services.batch import run_batch
+from services.cache import get_chunk_cache, make_key
+from services.memory import get_translation_memory
+from services.style import iter_transform_many, resolve_style_key, transform, transform_stream
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_SYSTEM_ROLE = "당신은 의미를 정확히 유지하며 자연스럽게 번역하는 전문가입니다."
+FUSED_SYSTEM_ROLE = "당신은 의미를 정확히 유지하며 번역하고 요청된 한국어 문체로 다듬는 전문가입니다."
 
 SUPPORTED_LANGS = ["Korean", "English", "Vietnamese", "Chinese", "Japanese"]
 
@@ -7,6 +23,42 @@ def _build_key(src: str, tgt: str) -> str:
     """번역 프롬프트 키 생성 (소문자_to_소문자 형식)"""
     return f"{src.lower()}_to_{tgt.lower()}"
 
+def _build_translation_messages(text: str, source_language: str, target_language: str) -> Optional[List[Dict[str, str]]]:
+    """번역 요청 messages 구성. 동일 언어면 None (번역 불필요)."""
+    if source_language == target_language:
+        return None
+
+    if source_language not in SUPPORTED_LANGS or target_language not in SUPPORTED_LANGS:
+        raise ValueError(f"지원하지 않는 언어: {source_language} -> {target_language}")
+
+    key = _build_key(source_language, target_language)
+    if key not in translation_prompts:
+        raise ValueError(f"프롬프트 미구현 언어쌍: {source_language} -> {target_language}")
+
+    return build_messages(TRANSLATION_SYSTEM_ROLE, translation_prompts[key], text)
+
+def _recall(
+    messages: List[Dict[str, str]], text: str, source_language: str, target_language: str, style_key: str | None = None
+) -> Optional[str]:
+    """번역 메모리 조회. 완전 일치면 저장된 번역을 반환하고,
+    유사 일치면 few-shot 예시를 messages에 시스템 메시지로 끼워 넣은 뒤 None을 반환."""
+    memory = get_translation_memory()
+    if memory is None:
+        return None
+    found = memory.lookup(source_language, target_language, text, style=style_key)
+    if found is not None:
+        logger.info("translation memory hit %s->%s[%s]", source_language, target_language, style_key or "")
+        return found
+    matches = memory.fuzzy(source_language, target_language, text, style=style_key)
+    memory.record_fuzzy(bool(matches))
+    if matches:
+        examples = "\n\n".join(f"원문: {source}\n번역: {target}" for _, source, target in matches)
+        messages.insert(1, {
+            "role": "system",
+            "content": f"[유사 문장의 기존 번역 - 용어/표현을 일관되게 참고, 그대로 복사 금지]\n{examples}",
+        })
+    return None
+
 def translate_any(text: str, source_language: str, target_language: str, model: str | None = None) -> str:
     """지정된 소스/타깃 언어 쌍에 대해 번역 수행.
     Args:
@@ -21,24 +73,244 @@ def translate_any(text: str, source_language: str, target_language: str, model:
     Note:
         현재 프롬프트는 한국어가 반드시 source 또는 target에 포함된 경우만 지원.
         동일 언어면 원문 그대로 반환.
+        번역 메모리(services.memory)에 완전 일치 항목이 있으면 LLM을 호출하지 않는다.
     """
-    if source_language == target_language:
+    messages = _build_translation_messages(text, source_language, target_language)
+    if messages is None:
         return text
-        
-    if source_language not in SUPPORTED_LANGS or target_language not in SUPPORTED_LANGS:
-        raise ValueError(f"지원하지 않는 언어: {source_language} -> {target_language}")
-        
-    key = _build_key(source_language, target_language)
-    if key not in translation_prompts:
-        raise ValueError(f"프롬프트 미구현 언어쌍: {source_language} -> {target_language}")
-        
-    prompt = translation_prompts[key].format(text=text)
-    system_role = "당신은 의미를 정확히 유지하며 자연스럽게 번역하는 전문가입니다."
-    messages = [
-        {"role": "system", "content": system_role},
-        {"role": "user", "content": prompt},
-    ]
-    return llm.chat(messages, model=model)
+    found = _recall(messages, text, source_language, target_language)
+    if found is not None:
+        return found
+    return llm.chat(messages, model=model or llm.route_model("translate", len(text)))
+
+def translate_any_stream(text: str, source_language: str, target_language: str, model: str | None = None) -> Iterator[str]:
+    """translate_any의 스트리밍 버전. 번역문 조각을 생성되는 대로 yield 한다."""
+    messages = _build_translation_messages(text, source_language, target_language)
+    if messages is None:
+        yield text
+        return
+    found = _recall(messages, text, source_language, target_language)
+    if found is not None:
+        yield found
+        return
+    yield from llm.chat_stream(messages, model=model or llm.route_model("translate", len(text)))
+
+def translate_with_style(text: str, source_language: str, style_type: str, model: str | None = None) -> str:
+    """외국어 → 한국어 번역과 문체 변환을 한 번의 LLM 호출로 수행 (fused 파이프라인).
+    Args:
+        text: 번역할 텍스트
+        source_language: 원본 언어 ("English", "Vietnamese", "Chinese", "Japanese", "Korean")
+        style_type: 적용할 한국어 문체 (services.style.transform과 동일한 라벨)
+        model: 사용할 LLM 모델명 (None이면 기본값)
+    Returns:
+        문체가 적용된 한국어 번역문
+    Raises:
+        ValueError: 지원하지 않는 언어/스타일일 경우
+    Note:
+        원문이 이미 한국어이거나 통합 프롬프트가 없는 언어쌍이면 translate_any → transform 2단계로 처리.
+    """
+    prompt_key = resolve_style_key(style_type)
+    started = time.perf_counter()
+    fused = _fused_prompt(source_language, prompt_key)
+    if fused is None:
+        translated = translate_any(text, source_language, "Korean", model=model)
+        translated_at = time.perf_counter()
+        output = transform(translated, prompt_key, model=model)
+        logger.info(
+            "two-step %s->Korean[%s]: translate=%.3fs style=%.3fs",
+            source_language, prompt_key, translated_at - started, time.perf_counter() - translated_at,
+        )
+        return output
+
+    messages = _build_fused_messages(fused, text)
+    found = _recall(messages, text, source_language, "Korean", prompt_key)
+    if found is not None:
+        return found
+    output = llm.chat(messages, model=model or llm.route_model("translate", len(text)))
+    logger.info("fused %s->Korean[%s]: translate+style=%.3fs", source_language, prompt_key, time.perf_counter() - started)
+    return output
+
+def translate_with_style_stream(text: str, source_language: str, style_type: str, model: str | None = None) -> Iterator[str]:
+    """translate_with_style의 스트리밍 버전.
+
+    2단계 처리 시 번역은 일괄 호출하고 최종 문체 변환 결과만 스트리밍한다.
+    """
+    prompt_key = resolve_style_key(style_type)
+    fused = _fused_prompt(source_language, prompt_key)
+    if fused is None:
+        translated = translate_any(text, source_language, "Korean", model=model)
+        yield from transform_stream(translated, prompt_key, model=model)
+        return
+    messages = _build_fused_messages(fused, text)
+    found = _recall(messages, text, source_language, "Korean", prompt_key)
+    if found is not None:
+        yield found
+        return
+    yield from llm.chat_stream(messages, model=model or llm.route_model("translate", len(text)))
+
+def _fused_prompt(source_language: str, prompt_key: str) -> Optional[str]:
+    """번역+문체 통합 프롬프트 조회. 원문이 한국어이거나 미구현 언어쌍이면 None."""
+    return translation_style_prompts.get(_build_key(source_language, "Korean"), {}).get(prompt_key)
+
+def _build_fused_messages(fused_prompt: str, text: str) -> List[Dict[str, str]]:
+    return build_messages(FUSED_SYSTEM_ROLE, fused_prompt, text)
+
+def iter_translate_many(
+    texts: Sequence[str],
+    source_language: str,
+    target_language: str,
+    style_type: str | None = None,
+    model: str | None = None,
+) -> Iterator[Tuple[int, str]]:
+    """translate_many의 점진 버전. (입력 위치, 결과)를 묶음이 끝나는 순서대로 yield 한다."""
+    model = model or llm.route_model("translate", sum(len(text) for text in texts))
+    if style_type is not None and target_language == "Korean":
+        prompt_key = resolve_style_key(style_type)
+        fused = _fused_prompt(source_language, prompt_key)
+        if fused is not None:
+            yield from run_batch(texts, fused, FUSED_SYSTEM_ROLE, model=model)
+            return
+        # 원문이 한국어인 경우 등: 번역(필요 시) 후 문체 일괄 변환
+        translated = translate_many(texts, source_language, "Korean", model=model)
+        yield from iter_transform_many(translated, prompt_key, model=model)
+        return
+
+    if _build_translation_messages("", source_language, target_language) is None:
+        yield from enumerate(texts)
+        return
+    prompt = translation_prompts[_build_key(source_language, target_language)]
+    yield from run_batch(texts, prompt, TRANSLATION_SYSTEM_ROLE, model=model)
+
+def translate_many(
+    texts: Sequence[str],
+    source_language: str,
+    target_language: str,
+    style_type: str | None = None,
+    model: str | None = None,
+) -> List[str]:
+    """여러 텍스트를 묶음 단위 프롬프트로 일괄 번역.
+    Args:
+        texts: 번역할 텍스트 목록
+        source_language / target_language: translate_any와 동일
+        style_type: 타깃이 한국어일 때 함께 적용할 문체 (None이면 번역만)
+        model: 사용할 LLM 모델명 (None이면 기본값)
+    Returns:
+        입력과 같은 순서의 번역 결과 목록
+    Raises:
+        ValueError: 지원하지 않는 언어/스타일일 경우
+    """
+    results = [""] * len(texts)
+    for i, output in iter_translate_many(texts, source_language, target_language, style_type=style_type, model=model):
+        results[i] = output
+    return results
+
+def _translate_chunk(
+    text: str,
+    context: str,
+    source_language: str,
+    target_language: str,
+    prompt_key: str | None,
+    model: str | None,
+) -> str:
+    """긴 문서의 조각 하나를 번역(+문체). 앞 문맥은 참고용 시스템 메시지로만 전달."""
+    fused = _fused_prompt(source_language, prompt_key) if prompt_key and target_language == "Korean" else None
+    if fused is not None:
+        messages = _build_fused_messages(fused, text)
+    else:
+        messages = _build_translation_messages(text, source_language, target_language)
+    if messages is not None:
+        if context:
+            messages.insert(1, {
+                "role": "system",
+                "content": f"[앞 문맥 - 참고용, 번역/출력 금지]\n{context}",
+            })
+        text = llm.chat(messages, model=model)
+    if prompt_key and target_language == "Korean" and fused is None:
+        text = transform(text, prompt_key, model=model)
+    return text
+
+def translate_document(
+    text: str,
+    source_language: str,
+    target_language: str,
+    style_type: str | None = None,
+    model: str | None = None,
+    max_chars: int | None = None,
+    context_chars: int | None = None,
+    max_workers: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> str:
+    """긴 문서를 문단/문장 단위로 나눠 병렬 번역한 뒤 원래 순서·줄바꿈대로 재조립.
+    Args:
+        text: 번역할 문서
+        source_language / target_language: translate_any와 동일
+        style_type: 타깃이 한국어일 때 함께 적용할 문체 (None이면 번역만)
+        model: 사용할 LLM 모델명 (None이면 기본값)
+        max_chars: 조각 최대 문자 수 (기본: DOCUMENT_CHUNK_CHARS=1500)
+        context_chars: 앞 조각 원문 끝부분을 참고 문맥으로 넘길 길이 (기본: DOCUMENT_CONTEXT_CHARS=200, 0이면 미사용)
+        max_workers: 동시 번역 조각 수 (기본: BATCH_MAX_WORKERS=4)
+        on_progress: (완료 조각 수, 전체 조각 수) 콜백 (예외를 던지면 남은 조각을 취소하고 중단)
+    Returns:
+        재조립된 번역문
+    Raises:
+        ValueError: 지원하지 않는 언어/스타일일 경우
+    Note:
+        조각 결과는 앞 문맥과 무관하게 조각 원문 기준으로 캐시되므로, 수정된 문서를 다시 번역하면
+        바뀐 조각만 새로 호출된다.
+    """
+    prompt_key = resolve_style_key(style_type) if style_type is not None else None
+    # 언어쌍 검증을 먼저 수행해 병렬 작업 중 ValueError가 흩어지지 않도록 함
+    _build_translation_messages("", source_language, target_language)
+
+    max_chars = max_chars or int(os.getenv("DOCUMENT_CHUNK_CHARS", str(DEFAULT_MAX_CHARS)))
+    if context_chars is None:
+        context_chars = int(os.getenv("DOCUMENT_CONTEXT_CHARS", "200"))
+    max_workers = max_workers or int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+    chunks = split_text(text, max_chars)
+    if not chunks:
+        return text
+    # 조각이 아닌 문서 전체 길이로 모델 선택 (긴 문서용 모델)
+    model = model or llm.route_model("translate", len(text))
+
+    cache = get_chunk_cache()
+    resolved_model = llm.resolve_model(model)
+
+    def work(i: int) -> str:
+        chunk = chunks[i]
+        key = make_key(resolved_model, None, [
+            {"role": "chunk", "content": f"{source_language}>{target_language}>{prompt_key or ''}"},
+            {"role": "user", "content": chunk.text},
+        ])
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        context = chunks[i - 1].text[-context_chars:] if i > 0 and context_chars > 0 else ""
+        output = _translate_chunk(chunk.text, context, source_language, target_language, prompt_key, model)
+        if cache is not None:
+            cache.set(key, output)
+        return output
+
+    started = time.perf_counter()
+    outputs = [""] * len(chunks)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="document") as pool:
+        futures = {pool.submit(work, i): i for i in range(len(chunks))}
+        try:
+            for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                outputs[futures[future]] = future.result()
+                if on_progress is not None:
+                    on_progress(done, len(chunks))
+        except BaseException:
+            # 실패/취소(on_progress에서 예외) 시 아직 시작하지 않은 조각은 호출하지 않음
+            for pending in futures:
+                pending.cancel()
+            raise
+    logger.info(
+        "document %s->%s: %d chunks, %d chars, %.3fs",
+        source_language, target_language, len(chunks), len(text), time.perf_counter() - started,
+    )
+    return join_chunks(chunks, outputs)
 
 def translate(text: str, target_language: str, model: str | None = None) -> str:
     """한국어에서 타깃 언어로 번역 (하위 호환성)"""
@@ -0,0 +1,60 @@
+"""📊관리: 단계별 지연/토큰/캐시/보호 장치 통계 페이지 (KONNECT_ADMIN_PANEL=1)"""
+import streamlit as st
+
+from services import telemetry  # 단계별 추적
+from services.cache import get_ocr_cache, get_response_cache  # 캐시 통계
+from services.clients import pool_stats  # 연결 풀 통계
+from services.llm import coalesce_stats  # 요청 병합 통계
+from services.resilience import get_circuit_breaker, get_rate_limiter  # 속도 제한/서킷 브레이커 통계
+from services.api_client import api_url, get_pipeline  # 원격 파이프라인 서비스
+from views.common import translation_memory
+
+
+def render():
+    """관리 페이지 렌더링."""
+    st.title("성능 모니터링")
+    windows = {"최근 5분": 300, "최근 15분": 900, "최근 1시간": 3600}
+    window_label = st.radio("구간", list(windows), horizontal=True)
+    recorder = telemetry.get_recorder()
+    rows = recorder.summarize(windows[window_label])
+    st.markdown("### 단계/호출별 지연")
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("해당 구간에 기록된 요청이 없습니다.")
+    st.markdown("### 모델별 토큰 사용량")
+    by_model = recorder.tokens_by_model(windows[window_label])
+    if by_model:
+        st.dataframe(
+            [{"model": model, **totals} for model, totals in sorted(by_model.items())],
+            use_container_width=True, hide_index=True,
+        )
+    st.markdown("### 캐시 / 보호 장치")
+    response_cache = get_response_cache()
+    ocr_cache = get_ocr_cache()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**응답 캐시**")
+        st.json(response_cache.stats() if response_cache is not None else {"enabled": False})
+        st.markdown("**OCR 캐시**")
+        st.json(ocr_cache.stats() if ocr_cache is not None else {"enabled": False})
+        st.markdown("**번역 메모리**")
+        st.json(translation_memory.stats() if translation_memory is not None else {"enabled": False})
+    with col2:
+        st.markdown("**요청 병합**")
+        st.json(coalesce_stats())
+        st.markdown("**속도 제한**")
+        st.json(get_rate_limiter().stats())
+        st.markdown("**서킷 브레이커**")
+        st.json(get_circuit_breaker().stats())
+        st.markdown("**연결 풀**")
+        st.json(pool_stats())
+    if api_url():
+        # 번역/OCR/학습은 API 서비스에서 실행되므로 서버 쪽 통계를 함께 표시 (요청을 받은 워커 기준)
+        st.markdown(f"### API 서비스 ({api_url()})")
+        try:
+            remote = get_pipeline().stats(windows[window_label])
+            st.dataframe(remote["spans"], use_container_width=True, hide_index=True)
+            st.json(remote["tokens_by_model"])
+        except Exception as e:
+            st.warning(f"API 서비스 통계를 가져오지 못했습니다: {e}")
@@ -0,0 +1,199 @@
+"""페이지 공통 상수/리소스
+
+프로세스에서 한 번만 만들어지고 모든 세션·재실행이 공유한다 (모듈 import 캐시 + st.cache_resource/st.cache_data).
+OpenAI SDK를 불러오지 않는 모듈만 import 한다 (홈 화면 첫 렌더링 시간 단축).
+"""
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from services.history import get_history_repository  # 기록 저장소
+from services.jobs import ACTIVE_STATUSES, get_job_queue  # 백그라운드 작업 큐
+from services.memory import get_translation_memory  # 번역 메모리
+
+# 작업 목록에 표시할 최근 작업 수 / 진행 중인 작업이 있을 때 목록 갱신 주기(초)
+JOB_LIST_LIMIT = 10
+JOB_POLL_SECONDS = float(os.getenv("KONNECT_JOB_POLL_SECONDS", "2"))
+JOB_STATUS_LABELS = {"queued": "대기 중", "running": "진행 중", "done": "완료", "failed": "실패", "cancelled": "취소됨"}
+
+# 관리 패널(단계별 지연/토큰/캐시 통계) 표시 여부
+ADMIN_PANEL = os.getenv("KONNECT_ADMIN_PANEL", "0") == "1"
+
+# 사이드바 페이지 → 렌더링 모듈 (선택된 페이지의 모듈만 import)
+PAGES = {
+    "🏠홈": "views.home",
+    "🔎번역": "views.translate",
+    "📄기록": "views.history",
+    "📝학습": "views.learning",
+}
+if ADMIN_PANEL:
+    PAGES["📊관리"] = "views.admin"
+
+LANG_MAP = {"한국어": "Korean", "영어": "English", "일본어": "Japanese", "중국어": "Chinese", "베트남어": "Vietnamese"}
+STYLE_MAP = {
+    "문어체": {
+        "label": "Formal",
+        "desc": "격식을 갖춘 공식 문장체. 논문·보고서 등에 적합"
+    },
+    "구어체": {
+        "label": "Informal",
+        "desc": "일상 대화체. 블로그·채팅 등에 자연스러운 문장"
+    },
+    "쉬운문장": {
+        "label": "Basic_Vocabulary",
+        "desc": "어린이·외국인도 이해하기 쉬운 기본 단어 위주"
+    },
+    "한자어": {
+        "label": "Hanja",
+        "desc": "한자 기반 어휘를 많이 사용하는 문장"
+    },
+    "서술체": {
+        "label": "Narrative",
+        "desc": "서술형 문장. 사건이나 이야기등을 서술할 때 적합"
+    },
+    "묘사체": {
+        "label": "Descriptive",
+        "desc": "묘사형 문장. 대상이나 장면을 상세하게 묘사할 때 적합"
+    }
+}
+
+# 기록 저장소: 각 항목 dict(id, created_at, timestamp, source_lang, target_lang, input, output, style(optional))
+history_repo = get_history_repository()
+translation_memory = get_translation_memory()
+
+
+@st.cache_data(show_spinner=False)
+def load_css(path: str = "style.css") -> str:
+    """스타일시트 내용 (프로세스당 한 번 읽음)."""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def current_user() -> str:
+    """현재 세션의 사용자 ID (app.py에서 URL 쿼리 파라미터 uid로 초기화)."""
+    return st.session_state.user_id
+
+
+def memory_key(src_label: str, tgt_label: str, style_label: str | None):
+    """기록 라벨(한국어 표기) → 번역 메모리 키 (언어명, 언어명, 문체 프롬프트 키). 번역이 없던 기록은 None."""
+    src, tgt = LANG_MAP.get(src_label), LANG_MAP.get(tgt_label)
+    if src is None or tgt is None or (src == tgt and not style_label):
+        return None
+    return src, tgt, STYLE_MAP[style_label]["label"] if style_label in STYLE_MAP else None
+
+
+def save_history(user_id: str, input_text: str, output_text: str, src_label: str, tgt_label: str,
+                 applied_style: str | None, model: str | None = None):
+    """히스토리 + 번역 메모리 저장 (session_state를 쓰지 않으므로 백그라운드 작업 스레드에서도 호출 가능)."""
+    record_id = history_repo.add(user_id, {
+        "timestamp": datetime.now().strftime("%Y-%m-%d"),
+        "source_lang": src_label,
+        "target_lang": tgt_label,
+        "input": input_text,
+        "output": output_text,
+        "style": applied_style,
+        "model": model,
+    })
+    key = memory_key(src_label, tgt_label, applied_style)
+    if translation_memory is not None and key is not None:
+        translation_memory.add(key[0], key[1], input_text, output_text, style=key[2], record_id=record_id)
+
+
+def delete_history(user_id: str, record_ids) -> int:
+    """기록 삭제 + 그 기록에서 나온 번역 메모리 세그먼트 정리 (메모리는 사용자 간 공유되므로). 삭제한 기록 수 반환."""
+    owned = [record["id"] for record in history_repo.get_many(user_id, list(record_ids))]
+    deleted = history_repo.delete_many(user_id, owned)
+    if translation_memory is not None:
+        translation_memory.forget(owned)
+    return deleted
+
+
+def clear_history(user_id: str) -> None:
+    """사용자의 기록 전체 삭제 + 번역 메모리 정리."""
+    record_ids = history_repo.clear(user_id)
+    if translation_memory is not None:
+        translation_memory.forget(record_ids)
+
+
+@st.cache_resource(show_spinner=False)
+def sync_translation_memory() -> int:
+    """프로세스당 한 번, 아직 반영되지 않은 기록을 번역 메모리에 반영."""
+    if translation_memory is None:
+        return 0
+    return translation_memory.sync_from_history(
+        history_repo.iter_since(translation_memory.last_synced_id()),
+        lambda record: memory_key(record["source_lang"], record["target_lang"], record["style"]),
+    )
+
+
+def _render_job(job: dict, queue, user_id: str):
+    """작업 하나: 진행 중이면 진행률/취소, 끝났으면 결과/오류.
+
+    결과 dict의 pages(title/caption/output/warning 목록)는 결과 본문으로, summary는 완료 안내로 표시한다.
+    """
+    active = job["status"] in ACTIVE_STATUSES
+    label = f"{job['title']} · {JOB_STATUS_LABELS.get(job['status'], job['status'])} · {datetime.fromtimestamp(job['created_at']):%m-%d %H:%M}"
+    with st.expander(label, expanded=active):
+        if active:
+            st.progress(job["progress"], text=job["message"] or JOB_STATUS_LABELS[job["status"]])
+            st.button("취소", key=f"job_cancel_{job['id']}", on_click=queue.cancel, args=(job["id"],))
+            return
+        if job["status"] == "done":
+            result = job["result"] or {}
+            if result.get("summary"):
+                st.success(result["summary"])
+            pages = result.get("pages", [])
+            for page in pages:
+                if len(pages) > 1 or page["caption"]:
+                    st.markdown(f"**{page['title']}**")
+                if page["caption"]:
+                    st.caption(page["caption"])
+                if page.get("warning"):
+                    st.warning(page["warning"])
+                elif page["output"]:
+                    st.write(page["output"])
+            outputs = [page["output"] for page in pages if page["output"]]
+            if outputs:
+                st.download_button(
+                    "결과 다운로드", "\n\n".join(outputs), file_name="translation.txt",
+                    key=f"job_dl_{job['id']}", on_click="ignore",
+                )
+        elif job["status"] == "failed":
+            st.error(f"오류: {job['error']}")
+        st.button("목록에서 삭제", key=f"job_delete_{job['id']}", on_click=queue.delete, args=(user_id, job["id"]))
+
+
+def _render_jobs(kinds: tuple, live: bool):
+    """최근 작업 목록. 진행 중인 작업이 모두 끝나면 전체 재실행으로 자동 갱신을 멈춘다."""
+    queue = get_job_queue()
+    user_id = current_user()
+    jobs = queue.list(user_id, JOB_LIST_LIMIT, kinds)
+    active = any(job["status"] in ACTIVE_STATUSES for job in jobs)
+    if live and not active:
+        st.rerun()
+    if not jobs:
+        return
+    st.subheader("백그라운드 작업")
+    st.caption("작업은 다른 페이지로 이동해도 계속되며, 완료되면 결과가 기록에 저장됩니다.")
+    for job in jobs:
+        _render_job(job, queue, user_id)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _render_jobs_live(kinds: tuple):
+    """진행 중인 작업이 있을 때: 이 조각만 주기적으로 다시 그린다 (페이지 전체 재실행/입력을 막지 않음)."""
+    _render_jobs(kinds, live=True)
+
+
+@st.fragment
+def _render_jobs_idle(kinds: tuple):
+    _render_jobs(kinds, live=False)
+
+
+def render_jobs(kinds: tuple):
+    """현재 사용자의 백그라운드 작업 목록 (kinds: 표시할 작업 종류)."""
+    if any(job["status"] in ACTIVE_STATUSES for job in get_job_queue().list(current_user(), JOB_LIST_LIMIT, kinds)):
+        _render_jobs_live(kinds)
+    else:
+        _render_jobs_idle(kinds)
@@ -0,0 +1,141 @@
+"""📄기록: 저장된 번역 기록 조회/선택/내보내기/삭제 페이지"""
+import os
+
+import streamlit as st
+
+from views.common import LANG_MAP, STYLE_MAP, clear_history, current_user, delete_history, history_repo
+
+# 기록 페이지 한 쪽에 표시할 항목 수
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+
+
+def _toggle_history_selection(record_id: int):
+    """기록 선택 체크박스 변경 시 선택 집합 갱신."""
+    selected = st.session_state.setdefault("history_selected", set())
+    if st.session_state.get(f"sel_{record_id}"):
+        selected.add(record_id)
+    else:
+        selected.discard(record_id)
+
+
+def _format_history_export(records: list[dict]) -> str:
+    """기록 여러 건을 텍스트 파일 하나로 묶는다."""
+    blocks = []
+    for item in records:
+        header = f"[{item['timestamp']}] {item['source_lang']} → {item['target_lang']}" + (f" | 스타일:{item['style']}" if item['style'] else "") + (f" | 모델:{item['model']}" if item.get('model') else "")
+        blocks.append(f"{header}\n[입력]\n{item['input']}\n[출력]\n{item['output']}")
+    return "\n\n".join(blocks)
+
+
+@st.fragment
+def _render_page(lang_filter: list, style_filter: list, search_query: str):
+    """기록 목록 한 쪽만 렌더링.
+
+    - 페이지 단위 조회(HISTORY_PAGE_SIZE건)라 전체 기록 수와 무관하게 일정한 시간에 그려진다.
+    - 각 항목은 요약 한 줄만 그리고, 펼친 항목만 본문/버튼을 생성한다.
+    - fragment 안에서 실행되므로 선택/펼치기/삭제 시 이 영역만 다시 그린다.
+    - 선택은 현재 보이는 쪽 안에서만 유지한다 (필터/쪽 이동 시 해제).
+    """
+    user_id = current_user()
+    selected = st.session_state.setdefault("history_selected", set())
+    opened = st.session_state.setdefault("history_opened", set())
+
+    total = history_repo.count(user_id, lang_filter, style_filter, search_query)
+    total_pages = max(1, (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE)
+    # 필터가 바뀌어 페이지 수가 줄면 마지막 페이지로 보정
+    if st.session_state.get("history_page", 1) > total_pages:
+        st.session_state.history_page = total_pages
+    page_no = st.number_input(f"페이지 (전체 {total}건 / {total_pages}쪽)", min_value=1, max_value=total_pages, step=1, key="history_page")
+    items = history_repo.list(
+        user_id, lang_filter, style_filter, search_query,
+        limit=HISTORY_PAGE_SIZE, offset=(page_no - 1) * HISTORY_PAGE_SIZE,
+    )
+    # 필터/쪽이 바뀌면 선택 해제 (보이지 않는 기록이 일괄 삭제/내보내기에 포함되지 않도록)
+    view = (tuple(lang_filter), tuple(style_filter), search_query, page_no)
+    if st.session_state.get("history_view", view) != view:
+        for record_id in selected:
+            st.session_state[f"sel_{record_id}"] = False
+        selected.clear()
+    st.session_state.history_view = view
+
+    # 일괄 작업
+    col_all, col_del, col_export = st.columns([1, 1, 1])
+    with col_all:
+        if st.button("이 쪽 전체 선택", key="select_page"):
+            for item in items:
+                selected.add(item['id'])
+                st.session_state[f"sel_{item['id']}"] = True
+    with col_del:
+        if st.button(f"선택 삭제 ({len(selected)})", disabled=not selected, key="bulk_delete"):
+            delete_history(user_id, selected)
+            selected.clear()
+            st.rerun(scope="fragment")
+    with col_export:
+        if selected:
+            st.download_button(
+                f"선택 내보내기 ({len(selected)})",
+                _format_history_export(history_repo.get_many(user_id, selected)),
+                file_name="translations.txt",
+                key="bulk_export",
+            )
+
+    for item in items:
+        idx = item['id']
+        # 다른 페이지를 다녀오면 위젯 상태가 사라지므로 선택/펼침 집합에서 복원
+        st.session_state.setdefault(f"sel_{idx}", idx in selected)
+        st.session_state.setdefault(f"open_{idx}", idx in opened)
+        col_sel, col_title, col_open = st.columns([0.06, 0.8, 0.14])
+        with col_sel:
+            st.checkbox("선택", key=f"sel_{idx}", label_visibility="collapsed",
+                        on_change=_toggle_history_selection, args=(idx,))
+        with col_title:
+            st.markdown(f"[{item['timestamp']}] : {item['input'][:20]} | {item['source_lang']} → {item['target_lang']}" + (f" | 스타일:{item['style']}" if item['style'] else ""))
+        with col_open:
+            is_open = st.toggle("펼치기", key=f"open_{idx}")
+        if not is_open:
+            opened.discard(idx)
+            continue
+        opened.add(idx)
+        with st.container(border=True):
+            st.markdown("**입력**")
+            st.write(item['input'])
+            st.markdown("**출력**")
+            st.write(item['output'])
+            if item.get('model'):
+                st.caption(f"모델: {item['model']}")
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.download_button("출력 저장", item['output'], file_name=f"translation_{idx}.txt", key=f"dl_{idx}")
+            with col_b:
+                if st.button("재사용(편집창으로 보내기)", key=f"reuse_{idx}"):
+                    # 재사용 시 번역 페이지로 이동 & 입력 프리필 (페이지 전환이므로 전체 재실행)
+                    st.session_state.page = "🔎번역"
+                    st.session_state.prefill_text = item['input']
+                    st.rerun()
+            with col_c:
+                if st.button("삭제", key=f"del_{idx}"):
+                    delete_history(user_id, [idx])
+                    selected.discard(idx)
+                    opened.discard(idx)
+                    st.rerun(scope="fragment")
+
+
+def render():
+    """기록 페이지 렌더링."""
+    st.title("저장된 번역 기록")
+    user_id = current_user()
+    if history_repo.count(user_id) == 0:
+        st.info("아직 저장된 기록이 없습니다. '번역' 페이지에서 새 결과를 생성하세요.")
+    else:
+        # 필터 (DB 인덱스/전문 검색으로 처리)
+        with st.expander("필터 / 정렬", expanded=False):
+            lang_filter = st.multiselect("타깃 언어 필터", options=list(LANG_MAP.keys()))
+            style_filter = st.multiselect("스타일 필터", options=list(STYLE_MAP.keys()))
+            search_query = st.text_input("검색 (입력/출력 내용)", key="history_query")
+        _render_page(lang_filter, style_filter, search_query)
+
+        # 전체 삭제
+        if st.button("전체 기록 초기화", type="secondary"):
+            clear_history(user_id)
+            st.session_state.history_selected = set()
+            st.rerun()
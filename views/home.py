@@ -0,0 +1,68 @@
+"""🏠홈: 소개 페이지 (LLM/OCR 모듈을 불러오지 않는다)"""
+import streamlit as st
+
+# 홈페이지 타이틀 아래에 표시할 이미지
+FIRST_IMAGE = "images/translate-translation-vector-logo-design-template_1141934-3723.jpg"
+
+HOME_INTRO = """### 개요
+학습자 친화적인 한↔다국어 번역과 한국어 문체(스타일) 재작성 기능을 통합 제공하는 도구입니다. 결과는 자동으로 기록되어 재사용·학습 분석에 활용할 수 있습니다.
+
+### 지원 언어
+- 한국어 ↔ **영어 / 일본어 / 중국어(간체) / 베트남어**
+
+### 번역 품질 원칙
+- 의미/뉘앙스 보존, 과도한 의역·설명 제거
+- 고유명사·형식 유지 / 줄바꿈 구조 반영
+- 학습·교육 맥락에 자연스러운 문장 지향
+
+### 한국어 문체 변환
+| 문체 | 특징 |
+| ---- | ----- |
+| 문어체 | 격식 있고 정제된 공식체 (보고서/논문) |
+| 구어체 | 자연스러운 일상 대화체 (블로그/채팅) |
+| 쉬운문장 | 초급 학습자도 쉽게 읽는 기본 어휘 중심 |
+| 한자어 | 적절한 한자어 활용으로 격식·전문성 강화 |
+| 서술체 | 사건 전개 중심, 시간/흐름 명확 |
+| 묘사체 | 감각·형용 표현 강화로 장면 묘사 강조 |
+
+### 이미지 OCR
+- 이미지 업로드 → 텍스트 추출 → 번역/문체 변환 가능
+- 현재 기본 추출 로직
+
+### 학습 도구 (📝학습 페이지)
+- 교정 전/후 차이 요약 (형태·어미·어휘 변화)
+- 변화된 표현 의미/문법/유의어 정리
+- 학습용 예문 3개 자동 생성
+
+### 기록 & 재사용
+- 모든 결과 자동 저장(세션 종료 후에도 유지) / 필터링·검색 / 삭제 / txt 다운로드
+- 기록 항목을 다시 불러와 편집·추가 변환 가능
+
+### 빠른 시작
+1. 사이드바에서 **🔎번역** 선택
+2. 입력 언어 / 타깃 언어 / (한국어 타깃 시) 문체 고르기
+3. 텍스트 입력 또는 이미지 업로드
+4. 실행 → 결과 확인 후 필요 시 **📄기록** / **📝학습** 활용
+
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _load_image(path: str) -> bytes:
+    """이미지 파일 내용 (프로세스당 한 번 읽음)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def render():
+    """홈 페이지 렌더링."""
+    st.title("Konnect")
+    st.markdown("#### 한국어 학습을 위한 스마트 번역 & 학습 도구")
+    # 홈페이지 타이틀 아래: 우선 images 폴더의 특정 이미지를 먼저 표시하고 충분한 간격을 둔 뒤 다른 이미지를 표시
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        st.image(_load_image(FIRST_IMAGE), use_container_width=True)
+
+    st.markdown("---")
+    st.header("다국어 번역 & 한국어 문체 변환")
+    st.markdown(HOME_INTRO)
@@ -0,0 +1,161 @@
+"""📝학습: 기록(교정 전/후)을 분석하는 학습 페이지
+
+차이점(바뀐 어절/조사/어미/높임)은 core.korean_diff로 로컬에서 즉시 계산해 강조 표시한다.
+차이점 설명/수정 단어 의미/예문은 한 번의 구조화 출력 호출로 받은 학습 카드로 표시한다.
+카드는 기록별로 저장되어 다시 열 때 호출하지 않으며, 백그라운드 작업으로 모든 한국어→한국어 기록의 카드를 미리 만들 수 있다.
+"""
+import concurrent.futures
+import logging
+import os
+import re
+
+import streamlit as st
+
+from core.korean_diff import CHANGE_LABELS, KoreanDiff, compare, describe  # 로컬 차이 분석 (LLM 호출 없음)
+from services.api_client import get_pipeline  # 학습 분석 파이프라인 (같은 프로세스 또는 KONNECT_API_URL 서비스)
+from services.jobs import ACTIVE_STATUSES, JobContext, get_job_queue  # 백그라운드 작업 큐
+from services.resilience import CircuitOpenError  # LLM API 장애 차단
+from views.common import current_user, history_repo, render_jobs
+
+logger = logging.getLogger(__name__)
+
+# 학습 페이지 기록 선택 목록에 불러올 최근 항목 수
+LEARNING_RECENT_LIMIT = int(os.getenv("LEARNING_RECENT_LIMIT", "200"))
+# 학습 카드 일괄 생성 시 동시 호출 수
+LEARNING_BULK_WORKERS = int(os.getenv("LEARNING_BULK_WORKERS", "4"))
+# 학습 카드 대상: 교정(한국어→한국어) 기록
+KOREAN = "한국어"
+
+_MARKDOWN_SPECIAL_RE = re.compile(r"([\\`*_\[\]~#<>$|])")
+
+
+def _create_card(user_id: str, record: dict) -> dict:
+    """학습 카드를 만들어 기록에 저장."""
+    card, model = get_pipeline().learning_card(record["input"], record["output"])
+    history_repo.set_learning_card(user_id, record["id"], card, model)
+    return card
+
+
+def _precompute_job(user_id: str):
+    """학습 카드가 없는 한국어→한국어 기록 전체의 카드를 만드는 작업 함수."""
+    def work(ctx: JobContext) -> dict:
+        records = history_repo.list_without_learning_card(user_id, [KOREAN], [KOREAN])
+        if not records:
+            return {"summary": "새로 만들 학습 카드가 없습니다."}
+        total = len(records)
+        failed = 0
+        ctx.progress(0.0, f"학습 카드 생성 중... (0/{total})")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=LEARNING_BULK_WORKERS, thread_name_prefix="learning-cards") as pool:
+            futures = [pool.submit(_create_card, user_id, record) for record in records]
+            try:
+                for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed += 1
+                        logger.warning("learning card failed: %s", e)
+                    ctx.progress(done / total, f"학습 카드 생성 중... ({done}/{total})")
+            except BaseException:
+                # 취소 시 아직 시작하지 않은 기록은 호출하지 않음
+                for future in futures:
+                    future.cancel()
+                raise
+        return {"summary": f"학습 카드 {total - failed}개 생성" + (f", {failed}개 실패" if failed else "")}
+    return work
+
+
+def _escape(text: str) -> str:
+    return _MARKDOWN_SPECIAL_RE.sub(r"\\\1", text)
+
+
+def _diff_markdown(diff: KoreanDiff) -> str:
+    """수정문 기준 강조 표시: 지운 부분은 빨간 취소선, 넣은 부분은 초록 굵은 글씨."""
+    parts = []
+    for segment in diff.segments:
+        if segment.op == "equal":
+            parts.append(_escape(segment.after))
+        else:
+            if segment.before:
+                parts.append(f":red[~~{_escape(segment.before)}~~]")
+            if segment.after:
+                parts.append(f":green[**{_escape(segment.after)}**]")
+        if segment.sep:
+            parts.append("  \n" if "\n" in segment.sep else " ")
+    return "".join(parts)
+
+
+def _render_diff(original: str, revised: str):
+    """로컬 차이 분석 결과 (강조 표시 + 변경 목록)."""
+    diff = compare(original, revised)
+    st.subheader("차이점")
+    if not diff.changes:
+        st.caption("바뀐 부분이 없습니다.")
+        return
+    st.markdown(_diff_markdown(diff))
+    st.markdown("\n".join(f"- **{CHANGE_LABELS[change.kind]}** {_escape(describe(change))}" for change in diff.changes))
+
+
+def _render_card(card: dict):
+    """학습 카드의 세 영역 (차이점 설명 / 수정 단어 의미·구조 / 공부 예문)."""
+    st.subheader("차이점 설명")
+    if card["diff"]:
+        st.markdown("\n".join(f"- {item}" for item in card["diff"]))
+    else:
+        st.caption("바뀐 부분이 없습니다.")
+    st.subheader("수정 단어 의미/구조")
+    for item in card["meanings"]:
+        synonyms = f" / 유의어: {', '.join(item['synonyms'])}" if item.get("synonyms") else ""
+        st.markdown(f"**{item['expression']}** : {item['meaning']} / {item['grammar']}{synonyms}")
+    st.subheader("공부 예문")
+    st.markdown("\n".join(f"{i}) {example}" for i, example in enumerate(card["examples"], start=1)))
+
+
+def render():
+    """학습 페이지 렌더링."""
+    st.title("수정 단어 & 예문 학습")
+    user_id = current_user()
+    recent = history_repo.list(user_id, limit=LEARNING_RECENT_LIMIT)
+    if not recent:
+        st.info("저장된 번역 기록이 없습니다.")
+        return
+
+    # 옵션 문자열 구성 (타임스탬프는 날짜만 존재하므로 잘려도 안전)
+    options = [
+        f"[{i+1:02}]  {h['timestamp'][:16]}  "
+        f"({h['source_lang']}→{h['target_lang']})" + (f"  –  {h['style']}" if h['style'] else "")
+        for i, h in enumerate(recent)
+    ]
+    choice = st.selectbox("기록 선택", options)
+    record = recent[options.index(choice)]
+
+    # 선택한 기록 표시
+    st.markdown("### 선택한 기록")
+    st.markdown("**입력**")
+    st.write(record['input'])
+    st.markdown("**출력**")
+    st.write(record['output'])
+    st.markdown("---")
+
+    if record["source_lang"] == KOREAN and record["target_lang"] == KOREAN:
+        _render_diff(record["input"], record["output"])
+        st.markdown("### LLM 학습 카드")
+        card = history_repo.get_learning_card(user_id, record["id"])
+        if card is None and st.button("학습 카드 만들기", type="primary", key="learning_card_create"):
+            try:
+                with st.spinner("차이점/의미/예문 분석 중..."):
+                    card = _create_card(user_id, record)
+            except CircuitOpenError as e:
+                st.warning(str(e))
+            except (ValueError, RuntimeError) as e:
+                st.error(f"오류: {e}")
+        if card is not None:
+            _render_card(card)
+
+    # --- 학습 카드 일괄 생성 ---
+    missing = history_repo.count_without_learning_card(user_id, [KOREAN], [KOREAN])
+    running = any(job["status"] in ACTIVE_STATUSES for job in get_job_queue().list(user_id, 1, ("learning_cards",)))
+    if missing and not running:
+        st.markdown("---")
+        if st.button(f"학습 카드 미리 만들기 (교정 기록 {missing}개)", key="learning_card_bulk"):
+            get_job_queue().submit(user_id, "learning_cards", f"학습 카드 일괄 생성 ({missing}개)", _precompute_job(user_id))
+    render_jobs(("learning_cards",))
@@ -0,0 +1,260 @@
+"""🔎번역: 텍스트/이미지/일괄 번역 및 문체 변환 페이지"""
+import csv
+import io
+import os
+
+import streamlit as st
+
+from services.api_client import get_pipeline  # 번역/OCR 파이프라인 (같은 프로세스 또는 KONNECT_API_URL 서비스)
+from services.jobs import JobContext, get_job_queue  # 백그라운드 작업 큐
+from services.resilience import CircuitOpenError  # LLM API 장애 차단
+from views.common import LANG_MAP, STYLE_MAP, current_user, render_jobs, save_history, translation_memory
+
+# 이 길이를 넘는 텍스트는 백그라운드 작업으로 번역 (기본: 긴 문서 분할 기준과 같음)
+JOB_MIN_CHARS = int(os.getenv("KONNECT_JOB_MIN_CHARS", os.getenv("DOCUMENT_CHUNK_CHARS", "1500")))
+
+
+def _start_translation(input_text: str, src_label: str, tgt_label: str, style_label: str | None, on_progress=None):
+    return get_pipeline().start_translation(
+        input_text, LANG_MAP[src_label], LANG_MAP[tgt_label],
+        style=STYLE_MAP[style_label]["label"] if style_label else None,
+        on_progress=on_progress,
+    )
+
+
+def _do_translation(input_text: str, src_label: str, tgt_label: str, style_label: str | None):
+    """번역(+문체 변환)을 수행하고 최종 결과를 화면에 스트리밍 출력한 뒤 기록에 저장."""
+    run = _start_translation(input_text, src_label, tgt_label, style_label)
+    output_text = st.write_stream(run.stream())
+    applied_style = style_label if run.style else None
+    save_history(current_user(), input_text, output_text, src_label, tgt_label, applied_style, model=run.model)
+    return output_text
+
+
+def _translate_in_job(ctx: JobContext, user_id: str, input_text: str, src_label: str, tgt_label: str,
+                      style_label: str | None, base: float = 0.0, share: float = 1.0) -> str:
+    """작업 스레드에서 번역하고 기록에 저장. 진행률은 [base, base+share] 구간에 보고하고 조각마다 취소를 확인."""
+    run = _start_translation(
+        input_text, src_label, tgt_label, style_label,
+        on_progress=lambda done, total: ctx.progress(base + share * done / total, f"번역 중... ({done}/{total})"),
+    )
+    for _ in run.stream():
+        ctx.check()
+    save_history(user_id, input_text, run.output, src_label, tgt_label, style_label if run.style else None, model=run.model)
+    return run.output
+
+
+def _translation_job(user_id: str, input_text: str, src_label: str, tgt_label: str, style_label: str | None):
+    """긴 텍스트 번역 작업 함수."""
+    def work(ctx: JobContext) -> dict:
+        ctx.progress(0.0, "번역 중...")
+        output = _translate_in_job(ctx, user_id, input_text, src_label, tgt_label, style_label)
+        return {"pages": [{"title": "결과", "caption": "", "output": output}]}
+    return work
+
+
+def _image_job(user_id: str, uploads: list, src_label: str, tgt_label: str, style_label: str | None):
+    """이미지 OCR → 번역 작업 함수. 페이지는 병렬로 OCR 하되, 순서대로 도착하는 즉시 번역까지 진행."""
+    def work(ctx: JobContext) -> dict:
+        ctx.progress(0.0, "텍스트 추출 중...")
+        pages = []
+        for index, total, ocr_result in get_pipeline().iter_ocr(uploads):
+            ctx.progress(index / total, f"페이지 {index + 1}/{total} 처리 중...")
+            ocr_stats = ocr_result.stats
+            page = {
+                "title": f"결과 {index + 1}/{total} · {ocr_stats['source']} p.{ocr_stats['source_page']}" if total > 1 else "결과",
+                "caption": _format_ocr_stats(ocr_stats),
+                "output": "",
+            }
+            if ocr_result.text:
+                page["output"] = _translate_in_job(
+                    ctx, user_id, ocr_result.text, src_label, tgt_label, style_label, base=index / total, share=1 / total,
+                )
+            else:
+                page["warning"] = "이미지에서 텍스트를 추출하지 못했습니다."
+            pages.append(page)
+        return {"pages": pages}
+    return work
+
+
+def _copy_uploads(uploaded_files) -> list:
+    """업로드 파일을 작업 스레드용 메모리 파일로 복사 (재실행 후에도 내용이 유지되도록)."""
+    uploads = []
+    for uploaded in uploaded_files:
+        upload = io.BytesIO(uploaded.getvalue())
+        upload.name = uploaded.name
+        uploads.append(upload)
+    return uploads
+
+
+def _format_ocr_stats(stats: dict) -> str:
+    """OCR 처리 통계 한 줄 요약 (백엔드, 전송 크기 절감, 소요 시간)."""
+    parts = [f"OCR {stats.get('backend', '')}".strip()]
+    cache_labels = {"hit": "캐시 적중", "near_hit": "캐시 적중(유사 이미지)", "miss": "캐시 미스"}
+    if stats.get("cache") in cache_labels:
+        parts.append(cache_labels[stats["cache"]])
+    if stats.get("escalated"):
+        parts.append(f"비전 보완: {stats['escalated']}")
+    if "payload_bytes" in stats:
+        original = max(stats["original_payload_bytes"], 1)
+        parts.append(
+            f"이미지 전송 {original / 1024:,.0f}KB → {stats['payload_bytes'] / 1024:,.0f}KB"
+            f" ({100 * (1 - stats['payload_bytes'] / original):.0f}% 절감)"
+        )
+    parts.append(f"{stats.get('ocr_seconds', 0.0):.2f}초")
+    return " · ".join(parts)
+
+
+def _read_batch_lines(uploaded, has_header: bool) -> list[str]:
+    """일괄 번역용 업로드 파일(txt: 줄 단위, csv: 첫 번째 열)에서 입력 목록을 읽는다."""
+    content = uploaded.getvalue().decode("utf-8-sig")
+    if uploaded.name.lower().endswith(".csv"):
+        rows = [row[0] for row in csv.reader(io.StringIO(content)) if row]
+    else:
+        rows = content.splitlines()
+    if has_header:
+        rows = rows[1:]
+    return [row.strip() for row in rows if row.strip()]
+
+
+def render():
+    """번역 페이지 렌더링."""
+    st.title("번역 및 문체 변환")
+    if translation_memory is not None:
+        tm_stats = translation_memory.stats()
+        if tm_stats["lookups"]:
+            st.caption(
+                f"번역 메모리: 문장 {tm_stats['segments']}개 · 완전 일치 {tm_stats['exact_hit_rate']:.0%} · "
+                f"유사 일치 {tm_stats['fuzzy_hit_rate']:.0%} · 절약 토큰 약 {tm_stats['saved_tokens']:,}"
+            )
+    tab_text, tab_image, tab_batch = st.tabs(["텍스트 입력", "이미지 업로드", "일괄 번역"])
+
+    # --- 텍스트 탭 ---
+    with tab_text:
+        col1, col2 = st.columns(2)
+        with col1:
+            src_label = st.selectbox("입력 언어", list(LANG_MAP.keys()), index=0, key="text_src")
+        with col2:
+            tgt_label = st.selectbox("타깃 언어", list(LANG_MAP.keys()), index=1, key="text_tgt")
+        text_input = st.text_area("번역 또는 문체 변환할 텍스트 입력", key="text_input_area")
+        style_label = None
+        if tgt_label == "한국어":
+            style_label = st.selectbox(
+                "한국어 문체 선택",
+                list(STYLE_MAP.keys()),
+                format_func=lambda k: f"{k} ： {STYLE_MAP[k]['desc']}",
+                key="text_style"
+            )
+        if st.button("텍스트 실행", type="primary", key="run_text"):
+            if not text_input.strip():
+                st.warning("텍스트를 입력하세요.")
+            else:
+                try:
+                    input_text = text_input.strip()
+                    if len(input_text) > JOB_MIN_CHARS:
+                        # 긴 텍스트: 백그라운드 작업으로 등록하고 아래 작업 목록에서 진행률 확인
+                        user_id = current_user()
+                        get_job_queue().submit(
+                            user_id, "translate", f"텍스트 번역 ({len(input_text):,}자)",
+                            _translation_job(user_id, input_text, src_label, tgt_label, style_label),
+                        )
+                        st.info("긴 텍스트는 백그라운드에서 번역합니다. 아래 작업 목록에서 진행 상황을 확인하세요.")
+                    else:
+                        st.subheader("결과")
+                        result = _do_translation(input_text, src_label, tgt_label, style_label)
+                        st.success("완료")
+                        st.download_button("결과 다운로드", result, file_name="translation.txt", key="dl_text_result")
+                except ValueError as e:
+                    st.error(f"오류: {e}")
+                except CircuitOpenError as e:
+                    st.warning(str(e))
+
+    # --- 이미지 탭 ---
+    with tab_image:
+        uploaded_files = st.file_uploader(
+            "이미지 업로드 (여러 장 / PDF·TIFF 여러 페이지 가능)",
+            type=["jpg", "jpeg", "png", "tif", "tiff", "pdf"],
+            accept_multiple_files=True,
+            key="img_uploader",
+        )
+        if uploaded_files:
+            col1, col2 = st.columns(2)
+            with col1:
+                src_label_img = st.selectbox("입력 언어", list(LANG_MAP.keys()), index=0, key="img_src")
+            with col2:
+                tgt_label_img = st.selectbox("타깃 언어", list(LANG_MAP.keys()), index=1, key="img_tgt")
+            style_label_img = None
+            if tgt_label_img == "한국어":
+                style_label_img = st.selectbox(
+                    "한국어 문체 선택",
+                    list(STYLE_MAP.keys()),
+                    format_func=lambda k: f"{k} ： {STYLE_MAP[k]['desc']}",
+                    key="img_style"
+                )
+            if st.button("이미지 실행", type="primary", key="run_image"):
+                # OCR → 번역은 백그라운드 작업으로 실행 (다른 페이지로 이동해도 계속됨)
+                user_id = current_user()
+                get_job_queue().submit(
+                    user_id, "image", f"이미지 번역 ({len(uploaded_files)}개 파일)",
+                    _image_job(user_id, _copy_uploads(uploaded_files), src_label_img, tgt_label_img, style_label_img),
+                )
+                st.info("이미지 번역 작업을 등록했습니다. 아래 작업 목록에서 진행 상황을 확인하세요.")
+        else:
+            st.info("이미지를 업로드하세요.")
+
+    # --- 일괄 번역 탭 ---
+    with tab_batch:
+        batch_file = st.file_uploader("텍스트 파일 업로드 (txt: 한 줄에 한 문장 / csv: 첫 번째 열)", type=["txt", "csv"], key="batch_uploader")
+        if batch_file is not None:
+            col1, col2 = st.columns(2)
+            with col1:
+                src_label_batch = st.selectbox("입력 언어", list(LANG_MAP.keys()), index=0, key="batch_src")
+            with col2:
+                tgt_label_batch = st.selectbox("타깃 언어", list(LANG_MAP.keys()), index=1, key="batch_tgt")
+            style_label_batch = None
+            if tgt_label_batch == "한국어":
+                style_label_batch = st.selectbox(
+                    "한국어 문체 선택",
+                    list(STYLE_MAP.keys()),
+                    format_func=lambda k: f"{k} ： {STYLE_MAP[k]['desc']}",
+                    key="batch_style"
+                )
+            has_header = st.checkbox("첫 줄은 머리글(제외)", value=False, key="batch_header")
+            lines = _read_batch_lines(batch_file, has_header)
+            st.caption(f"입력 {len(lines)}개")
+            if st.button("일괄 실행", type="primary", key="run_batch"):
+                if not lines:
+                    st.warning("번역할 문장이 없습니다.")
+                else:
+                    try:
+                        progress = st.progress(0.0, text="번역 중...")
+                        results = [""] * len(lines)
+                        run = get_pipeline().start_batch(
+                            lines, LANG_MAP[src_label_batch], LANG_MAP[tgt_label_batch],
+                            style=STYLE_MAP[style_label_batch]["label"] if style_label_batch else None,
+                        )
+                        # 묶음이 끝나는 대로 기록에 저장하고 진행률 갱신
+                        for done, (i, output) in enumerate(run, start=1):
+                            results[i] = output
+                            save_history(current_user(), lines[i], output, src_label_batch, tgt_label_batch, style_label_batch, model=run.model)
+                            progress.progress(done / len(lines), text=f"번역 중... ({done}/{len(lines)})")
+                        progress.empty()
+                        st.success("완료")
+                        st.dataframe({"입력": lines, "결과": results}, use_container_width=True)
+                        st.download_button("결과 다운로드", "\n".join(results), file_name="translation_batch.txt", key="dl_batch_result")
+                    except ValueError as e:
+                        st.error(f"오류: {e}")
+                    except CircuitOpenError as e:
+                        st.warning(str(e))
+        else:
+            st.info("txt 또는 csv 파일을 업로드하세요.")
+
+    # --- 백그라운드 작업 목록 ---
+    render_jobs(("translate", "image"))
+
+    # -------------------- 번역 페이지 프리필 처리 (재사용 기능) --------------------
+    if 'prefill_text' in st.session_state:
+        # 프리필 텍스트를 페이지 상단 안내로 출력 (사용자가 다시 입력하도록 유도)
+        with st.expander("이전 기록에서 불러온 텍스트"):
+            st.code(st.session_state.prefill_text)
+        # 필요시 자동 입력 적용 로직 추가 가능